@@ -1,17 +1,18 @@
+import os
+import sys
+
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 
+# Shared models live at the repository root.
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from case_data import load_case_data
+from projection import project_income_statement
+
 # ---- Baseline 2018 values ----
-baseline_2018 = {
-    'Sales': 26260000.00,          # in dollars
-    'COGS': 12342200.00,
-    'Sales_Commissions': 1313000.00,
-    'G_and_A': 6039800.00,
-    'EBITDA': 6565000.00,
-    'unit_sales': 101000,
-    'avg_unit_price': 260
-}
+# (Sales, COGS, Sales_Commissions, G_and_A, EBITDA in dollars; unit_sales; avg_unit_price)
+baseline_2018 = load_case_data().baseline(2018)
 
 # ---- Base Assumptions for Each Alternative ----
 assumptions_gen = {
@@ -73,36 +74,7 @@ assumptions_alt3 = {
 }
 
 # ---- Projection Function ----
-def project_income_statement(baseline, assumptions, years=3):
-    """
-    Project an income statement over a given number of years.
-    
-    Uses baseline 2018 values and grows unit sales and average price based on provided assumptions.
-    """
-    projections = []
-    last_year = baseline.copy()
-    
-    for i in range(1, years + 1):
-        projection = {}
-        projection['Year'] = 2018 + i
-        # Update unit sales and average price if present:
-        if 'unit_sales' in last_year and 'avg_unit_price' in last_year:
-            projection['unit_sales'] = last_year['unit_sales'] * (1 + assumptions.get('unit_sales_growth', assumptions['sales_growth']))
-            projection['avg_unit_price'] = last_year['avg_unit_price'] * (1 + assumptions.get('price_growth', 0))
-            projection['Sales'] = projection['unit_sales'] * projection['avg_unit_price']
-        else:
-            projection['Sales'] = last_year['Sales'] * (1 + assumptions['sales_growth'])
-        
-        # Calculate COGS, Gross Profit and other expenses as percentages of Sales
-        projection['COGS'] = projection['Sales'] * assumptions.get('COGS_percent', last_year['COGS'] / last_year['Sales'])
-        projection['Gross_Profit'] = projection['Sales'] - projection['COGS']
-        projection['Sales_Commissions'] = projection['Sales'] * assumptions.get('sales_comm_rate', last_year['Sales_Commissions'] / last_year['Sales'])
-        projection['G_and_A'] = projection['Sales'] * assumptions.get('G_A_percent', last_year['G_and_A'] / last_year['Sales'])
-        projection['EBITDA'] = projection['Gross_Profit'] - projection['Sales_Commissions'] - projection['G_and_A']
-        
-        projections.append(projection)
-        last_year = projection.copy()  # Chain projections to next year
-    return pd.DataFrame(projections)
+# (project_income_statement is shared by all models and lives in projection.py)
 
 # ---- Monte Carlo Simulation Function ----
 def monte_carlo_simulation(baseline, base_assumptions, iterations=10000):
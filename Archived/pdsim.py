@@ -1,12 +1,14 @@
+import os
+import sys
+
 import numpy as np
 import matplotlib.pyplot as plt
 
-# ------- Demand Model -------
-def predicted_demand(Q0, P0, P, elasticity):
-    """
-    Q = Q0 * (P0 / P)^elasticity
-    """
-    return Q0 * (P0 / P)**(elasticity)
+# Shared models live at the repository root.
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from case_data import load_case_data
+from demand import predicted_demand
+from price_optimizer import optimal_price
 
 # ------- ALTERNATIVE 1: Titaluk Premium -------
 Q0_titaluk = 7000         # baseline units
@@ -20,11 +22,11 @@ demand_titaluk = predicted_demand(Q0_titaluk, P0_titaluk, price_range_titaluk, e
 profit_per_unit_titaluk = 0.95 * price_range_titaluk - 400
 profit_titaluk = profit_per_unit_titaluk * demand_titaluk
 
-# Find optimum for Alternative 1
-opt_idx_titaluk = np.argmax(profit_titaluk)
-opt_price_titaluk = price_range_titaluk[opt_idx_titaluk]
-opt_profit_titaluk = profit_titaluk[opt_idx_titaluk]
-opt_quantity_titaluk = demand_titaluk[opt_idx_titaluk]
+# Find exact optimum for Alternative 1 (markup e/(e-1) over unit cost, clipped to the price range)
+opt_price_titaluk, opt_quantity_titaluk = optimal_price(Q0_titaluk, P0_titaluk, elasticity_titaluk,
+                                                        unit_cost=400, commission=0.05,
+                                                        bounds=(price_range_titaluk[0], price_range_titaluk[-1]))
+opt_profit_titaluk = (0.95 * opt_price_titaluk - 400) * opt_quantity_titaluk
 
 # ------- ALTERNATIVE 2: Walmart Rods -------
 Q0_walmart = 72000        # baseline units
@@ -39,17 +41,18 @@ profit_per_unit_walmart = price_range_walmart - 32.5
 profit_walmart = profit_per_unit_walmart * demand_walmart
 
 # Find optimum for Alternative 2
-opt_idx_walmart = np.argmax(profit_walmart)
-opt_price_walmart = price_range_walmart[opt_idx_walmart]
-opt_profit_walmart = profit_walmart[opt_idx_walmart]
-opt_quantity_walmart = demand_walmart[opt_idx_walmart]
+opt_price_walmart, opt_quantity_walmart = optimal_price(Q0_walmart, P0_walmart, elasticity_walmart,
+                                                        unit_cost=32.5,
+                                                        bounds=(price_range_walmart[0], price_range_walmart[-1]))
+opt_profit_walmart = (opt_price_walmart - 32.5) * opt_quantity_walmart
 
 # ------- ALTERNATIVE 3: Direct Expansion (Occasional) -------
-Q0_occasional = 101000 * 0.20   # about 20,000 units
-P0_occasional = 260
+case_2018 = load_case_data().baseline(2018)
+Q0_occasional = case_2018['unit_sales'] * 0.20   # about 20,000 units
+P0_occasional = case_2018['avg_unit_price']
 elasticity_occasional = 1.5
-COGS_total_2018 = 12342200.00
-unit_sales_2018 = 101000
+COGS_total_2018 = case_2018['COGS']
+unit_sales_2018 = case_2018['unit_sales']
 cost_per_unit = COGS_total_2018 / unit_sales_2018  # baseline cost per unit
 
 price_range_occasional = np.linspace(200, 600, 100)
@@ -61,10 +64,10 @@ profit_per_unit_occasional = price_range_occasional - 122.2
 profit_occasional = profit_per_unit_occasional * demand_occasional
 
 # Find optimum for Alternative 3
-opt_idx_occasional = np.argmax(profit_occasional)
-opt_price_occasional = price_range_occasional[opt_idx_occasional]
-opt_profit_occasional = profit_occasional[opt_idx_occasional]
-opt_quantity_occasional = demand_occasional[opt_idx_occasional]
+opt_price_occasional, opt_quantity_occasional = optimal_price(Q0_occasional, P0_occasional, elasticity_occasional,
+                                                              unit_cost=122.2,
+                                                              bounds=(price_range_occasional[0], price_range_occasional[-1]))
+opt_profit_occasional = (opt_price_occasional - 122.2) * opt_quantity_occasional
 
 # ------- CREATE SUBPLOTS -------
 fig, axs = plt.subplots(1, 3, figsize=(18, 6), sharey=False)
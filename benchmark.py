@@ -0,0 +1,245 @@
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import queue as queues
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+try:
+    import resource
+except ImportError:   # Windows: no getrusage, peak RSS is reported as NaN
+    resource = None
+
+# -------------------------------
+# 1. Settings
+# (Every case runs in a fresh process with a pinned seed, so peak RSS belongs to that case alone)
+# -------------------------------
+BENCHMARK_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.benchmarks')
+HISTORY_FILE = os.path.join(BENCHMARK_DIR, 'history.json')
+BASELINE_FILE = os.path.join(BENCHMARK_DIR, 'baseline.json')
+DEFAULT_THRESHOLD = 0.20   # flag a case more than 20% slower than the baseline
+SEED = 2018
+
+BASELINE = {'unit_sales': 12112, 'avg_unit_price': 365.66}
+ASSUMPTIONS = {
+    'sales_growth': 0.13,
+    'unit_sales_growth': 0.10,
+    'price_growth': 0.03,
+    'COGS_percent': 0.45,
+    'sales_comm_rate': 0.00,
+    'G_A_percent': 0.22
+}
+
+def suite(quick=False):
+    """
+    The benchmark cases as (name, parameters) pairs: Monte Carlo over iterations 10^3..10^7 and
+    years 3..20, the year-by-year simulator (long table), the projection function and the price grid.
+    'quick' trims the largest sizes for a fast smoke run.
+    """
+    max_power = 5 if quick else 7
+    cases = [('monte_carlo_simulation', {'iterations': 10 ** p, 'years': 3}) for p in range(3, max_power + 1)]
+    cases += [('monte_carlo_simulation', {'iterations': 100000, 'years': years}) for years in (5, 10, 20)]
+    cases += [('monte_carlo_simulation_by_year', {'iterations': n, 'years': 3})
+              for n in ((1000, 10000) if quick else (1000, 10000, 100000))]
+    cases += [('project_income_statement', {'iterations': 1000, 'years': years}) for years in (3, 10, 20)]
+    cases += [('price_grid', {'iterations': 10000, 'grid': grid, 'method': method})
+              for grid in (100, 1000, 10000) for method in ('envelope', 'tiles')]
+    return cases
+
+def case_id(name, params):
+    return name + '[' + ','.join(f'{k}={v}' for k, v in sorted(params.items())) + ']'
+
+# -------------------------------
+# 2. Cases
+# (Each returns the number of paths it simulated, so throughput is comparable across cases)
+# -------------------------------
+def _monte_carlo_simulation(iterations, years):
+    # The public entry point, unseeded so the on-disk result cache never serves the run.
+    from monte_carlo_EBITDA_simulation import monte_carlo_simulation
+    np.random.seed(SEED)
+    monte_carlo_simulation(BASELINE, ASSUMPTIONS, years=years, iterations=iterations)
+    return iterations
+
+def _monte_carlo_simulation_by_year(iterations, years):
+    from monte_carlo_template import monte_carlo_simulation_by_year
+    np.random.seed(SEED)
+    monte_carlo_simulation_by_year(BASELINE, ASSUMPTIONS, iterations=iterations, years=years)
+    return iterations
+
+def _project_income_statement(iterations, years):
+    from projection import project_income_statement
+    for _ in range(iterations):
+        project_income_statement(BASELINE, ASSUMPTIONS, years=years)
+    return iterations
+
+def _price_grid(iterations, grid, method):
+    from price_optimizer import optimal_prices_grid
+    elasticities = np.maximum(0.1, np.random.default_rng(SEED).normal(1.5, 0.2, size=iterations))
+    optimal_prices_grid(20200, 260, np.linspace(200, 600, grid), elasticities, unit_cost=122.2, method=method)
+    return iterations
+
+CASES = {
+    'monte_carlo_simulation': _monte_carlo_simulation,
+    'monte_carlo_simulation_by_year': _monte_carlo_simulation_by_year,
+    'project_income_statement': _project_income_statement,
+    'price_grid': _price_grid
+}
+
+# -------------------------------
+# 3. Runner
+# -------------------------------
+def _peak_rss_mb():
+    if resource is None:
+        return float('nan')
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS.
+    return peak / 1024 ** 2 if sys.platform == 'darwin' else peak / 1024
+
+MIN_REPEAT_SECONDS = 0.05   # fast cases are looped until one timed repeat lasts this long
+POLL_SECONDS = 1.0          # how often run_case checks that the case process is still alive
+
+def _child(name, params, repeats, queue):
+    try:
+        func = CASES[name]
+        func(**dict(params, iterations=min(params['iterations'], 1000)))   # warm-up: imports, caches
+        start = time.perf_counter()
+        paths = func(**params)
+        first = time.perf_counter() - start
+
+        # Like timeit.autorange: the best per-call time over 'repeats' timed loops of 'number' calls.
+        number = max(1, int(MIN_REPEAT_SECONDS / max(first, 1e-9)))
+        times = [first] if number == 1 else []
+        while len(times) < repeats:
+            start = time.perf_counter()
+            for _ in range(number):
+                func(**params)
+            times.append((time.perf_counter() - start) / number)
+        queue.put({'seconds': min(times), 'calls': number, 'paths': paths, 'peak_rss_mb': _peak_rss_mb()})
+    except BaseException as exc:
+        queue.put({'error': f'{type(exc).__name__}: {exc}'})
+
+def run_case(name, params, repeats=3):
+    """
+    Runs one case in a fresh process and returns its wall time (best of 'repeats'),
+    paths per second and peak RSS.
+    """
+    context = multiprocessing.get_context('spawn')
+    queue = context.Queue()
+    process = context.Process(target=_child, args=(name, params, repeats, queue))
+    process.start()
+    # Poll, so a child that dies without reporting (OOM kill, segfault) fails the case instead of
+    # hanging the harness.
+    while True:
+        try:
+            result = queue.get(timeout=POLL_SECONDS)
+            break
+        except queues.Empty:
+            if not process.is_alive():
+                try:
+                    result = queue.get(timeout=POLL_SECONDS)   # reported just before exiting
+                    break
+                except queues.Empty:
+                    raise RuntimeError(f"{case_id(name, params)} failed: worker exited with code "
+                                       f"{process.exitcode} without a result") from None
+    process.join()
+    if 'error' in result:
+        raise RuntimeError(f"{case_id(name, params)} failed: {result['error']}")
+    result['paths_per_second'] = result['paths'] / result['seconds'] if result['seconds'] > 0 else float('inf')
+    return result
+
+def environment():
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except OSError:
+        commit = ''
+    return {'python': platform.python_version(), 'numpy': np.__version__, 'machine': platform.machine(),
+            'platform': platform.platform(), 'cpus': os.cpu_count(), 'commit': commit}
+
+def run_suite(quick=False, repeats=3, only=None, verbose=True):
+    """
+    Runs every case of the suite (or those whose name contains 'only').
+    Returns a run record: timestamp, environment and {case id: measurements}.
+    """
+    results = {}
+    for name, params in suite(quick):
+        if only and only not in name:
+            continue
+        key = case_id(name, params)
+        results[key] = run_case(name, params, repeats=repeats)
+        if verbose:
+            r = results[key]
+            print(f"{key:<70} {r['seconds']:9.4f} s {r['paths_per_second']:14,.0f} paths/s {r['peak_rss_mb']:8.1f} MB")
+    return {'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'), 'environment': environment(), 'results': results}
+
+# -------------------------------
+# 4. History and Regressions
+# -------------------------------
+def _load(path, default):
+    if not os.path.exists(path):
+        return default
+    with open(path) as f:
+        return json.load(f)
+
+def _save(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + '.tmp'
+    with open(tmp, 'w') as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp, path)
+
+def append_history(run, path=HISTORY_FILE):
+    history = _load(path, [])
+    history.append(run)
+    _save(path, history)
+
+def compare(run, baseline, threshold=DEFAULT_THRESHOLD):
+    """
+    Cases whose wall time grew by more than 'threshold' (a fraction) against the baseline run.
+    Returns a list of (case id, baseline seconds, current seconds, relative change).
+    """
+    regressions = []
+    for key, result in run['results'].items():
+        reference = baseline.get('results', {}).get(key)
+        if reference is None:
+            continue
+        change = result['seconds'] / reference['seconds'] - 1
+        if change > threshold:
+            regressions.append((key, reference['seconds'], result['seconds'], change))
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmarks for the projection, Monte Carlo and pricing hot paths.')
+    parser.add_argument('--quick', action='store_true', help='skip the largest sizes')
+    parser.add_argument('--repeats', type=int, default=3)
+    parser.add_argument('--only', help='run only cases whose name contains this text')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument('--save-baseline', action='store_true', help='store this run as the new baseline')
+    args = parser.parse_args(argv)
+
+    run = run_suite(quick=args.quick, repeats=args.repeats, only=args.only)
+    append_history(run)
+
+    if args.save_baseline:
+        _save(BASELINE_FILE, run)
+        print(f"Saved baseline to {BASELINE_FILE}")
+        return 0
+
+    baseline = _load(BASELINE_FILE, None)
+    if baseline is None:
+        print("No baseline yet (run with --save-baseline to store one).")
+        return 0
+    regressions = compare(run, baseline, threshold=args.threshold)
+    for key, before, after, change in regressions:
+        print(f"REGRESSION {key}: {before:.4f} s -> {after:.4f} s ({change:+.0%})")
+    if not regressions:
+        print(f"No regressions beyond {args.threshold:.0%} against the baseline from {baseline['timestamp']}.")
+    return 1 if regressions else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,184 @@
+import warnings
+
+import numpy as np
+
+from case_data import load_case_data
+from instrumentation import phase
+
+# -------------------------------
+# 1. Price / Volume History
+# -------------------------------
+DEFAULT_TILE_ELEMENTS = 2 ** 22   # resample rows are processed in tiles of at most this many cells
+ELASTICITY_FLOOR = 0.1            # as in price_elasticity_simulation.py
+
+def price_volume_history(case=None):
+    """
+    Average Unit Price and Fly rod Unit Sales for every year reported in casefacts.csv.
+    Returns (years, prices, units) as arrays in year order.
+    """
+    if case is None:
+        case = load_case_data()
+    prices = case.series('Income Statement', 'Average Unit Price')
+    units = case.series('Income Statement', 'Fly rod Unit Sales')
+    years = sorted(set(prices) & set(units))
+    return (np.array(years), np.array([prices[y] for y in years], dtype=float),
+            np.array([units[y] for y in years], dtype=float))
+
+# -------------------------------
+# 2. Vectorized Log-Log Regression
+# (log Q = a - elasticity * log P, fitted by weighted least squares on every row at once)
+# -------------------------------
+def loglog_elasticities(log_prices, log_units, weights=None):
+    """
+    Fits log_units = intercept - elasticity * log_prices separately on every row of the
+    (resamples, observations) arrays, with optional non-negative 'weights' of the same shape.
+    Rows whose prices do not vary get NaN.
+    Returns (elasticities, intercepts), each of shape (resamples,).
+    """
+    log_prices = np.atleast_2d(log_prices)
+    log_units = np.atleast_2d(log_units)
+    if weights is None:
+        weights = np.ones(np.broadcast_shapes(log_prices.shape, log_units.shape))
+    total = weights.sum(axis=-1)
+    x_mean = (weights * log_prices).sum(axis=-1) / total
+    y_mean = (weights * log_units).sum(axis=-1) / total
+    dx = log_prices - x_mean[:, None]
+    sxx = (weights * dx * dx).sum(axis=-1)
+    sxy = (weights * dx * (log_units - y_mean[:, None])).sum(axis=-1)
+    # Relative threshold: a resample that repeats one year has sxx at rounding level, not exactly 0.
+    degenerate = sxx <= 1e-12 * (weights * log_prices * log_prices).sum(axis=-1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        slopes = np.where(degenerate, np.nan, sxy / sxx)
+    return -slopes, y_mean - slopes * x_mean
+
+def bootstrap_elasticity(prices, units, resamples=100000, method='bayesian', rng=None,
+                         tile_elements=DEFAULT_TILE_ELEMENTS):
+    """
+    Bootstrap distribution of the constant elasticity fitted to (prices, units).
+
+      method='bayesian': Bayesian bootstrap, every resample reweights the observations with
+                         Dirichlet(1, ..., 1) weights (normalized exponentials); never degenerate.
+      method='pairs':    classic pairs bootstrap, observations drawn with replacement; resamples
+                         that drew a single price are dropped, so fewer than 'resamples' may return.
+
+    All resamples of a tile are fitted in one loglog_elasticities call.
+    Returns the array of elasticity samples.
+    """
+    if method not in ('bayesian', 'pairs'):
+        raise ValueError(f"Unknown bootstrap method: {method!r} (choose 'bayesian' or 'pairs')")
+    if rng is None:
+        rng = np.random
+    log_prices = np.log(np.asarray(prices, dtype=float))
+    log_units = np.log(np.asarray(units, dtype=float))
+    m = log_prices.size
+    if m < 2:
+        raise ValueError("Need at least two years of prices and unit sales to fit an elasticity")
+
+    samples = []
+    rows = max(1, tile_elements // m)
+    with phase('calibration', resamples=resamples, observations=m):
+        for start in range(0, resamples, rows):
+            size = min(rows, resamples - start)
+            if method == 'bayesian':
+                weights = rng.standard_exponential(size=(size, m))
+                elasticities, _ = loglog_elasticities(log_prices, log_units, weights)
+            else:
+                index = (rng.random((size, m)) * m).astype(np.int64)
+                elasticities, _ = loglog_elasticities(log_prices[index], log_units[index])
+            samples.append(elasticities[np.isfinite(elasticities)])
+    return np.concatenate(samples)
+
+# -------------------------------
+# 3. Posterior Samples
+# (The history is short, so the bootstrap is usually combined with the analysts' prior belief by
+#  sampling-importance-resampling: bootstrap draws are resampled in proportion to the prior density)
+# -------------------------------
+WEAK_INELASTIC_SHARE = 0.25   # more bootstrap draws than this at or below 1 and the history barely identifies the elasticity
+WEAK_ESS_SHARE = 0.1          # an ESS below this share of the draws means the prior, not the history, sets the answer
+
+def identification_warnings(draws, weights=None):
+    """
+    Plain-language warnings when the bootstrap 'draws' (and the prior 'weights' resampling them)
+    pin the elasticity down poorly: too many inelastic or wrong-signed draws, or a prior that
+    discards most of them. Returns a list of messages, empty when the calibration looks sound.
+    """
+    messages = []
+    inelastic = float(np.mean(draws <= 1))
+    if inelastic > WEAK_INELASTIC_SHARE:
+        messages.append(f"{inelastic:.0%} of the bootstrap draws are inelastic (<= 1), "
+                        f"{np.mean(draws <= 0):.0%} have the wrong sign: the history barely identifies "
+                        "the elasticity" + (", give a prior" if weights is None else ""))
+    if weights is not None:
+        ess = _kish(weights)
+        if ess < WEAK_ESS_SHARE * draws.size:
+            messages.append(f"the prior keeps an effective {ess:,.0f} of {draws.size:,} bootstrap draws: "
+                            "the prior, not the history, sets the answer")
+    return messages
+
+def _prior_weights(draws, prior_mean, prior_std):
+    log_weights = -0.5 * ((draws - prior_mean) / prior_std) ** 2
+    return np.exp(log_weights - log_weights.max())
+
+def posterior_elasticity(prices=None, units=None, samples=100000, prior_mean=None, prior_std=None,
+                         method='bayesian', floor=ELASTICITY_FLOOR, rng=None, diagnostics=False):
+    """
+    Elasticity samples calibrated on the price / volume history (casefacts.csv by default).
+    Without a prior the bootstrap distribution is returned as is. With 'prior_mean' and
+    'prior_std' the bootstrap draws are importance-resampled under a N(prior_mean, prior_std^2)
+    prior. 'floor' clips the samples from below (ELASTICITY_FLOOR by default, None to keep them).
+    Warns (UserWarning) when identification_warnings finds the calibration weakly identified.
+    Returns an array of 'samples' elasticities, ready for price_optimizer.optimal_prices_grid.
+    With 'diagnostics' returns (samples, info): the bootstrap 'draws', the prior importance
+    'weights' the samples were resampled with (None without a prior), their 'ess' and the
+    'warnings' issued.
+    """
+    if rng is None:
+        rng = np.random
+    if prices is None or units is None:
+        _, prices, units = price_volume_history()
+
+    draws = bootstrap_elasticity(prices, units, resamples=samples, method=method, rng=rng)
+    weights = None
+    if prior_mean is not None:
+        weights = _prior_weights(draws, prior_mean, prior_std)
+        cumulative = np.cumsum(weights)
+        posterior = draws[np.searchsorted(cumulative, rng.random(samples) * cumulative[-1], side='right')]
+    elif draws.size != samples:
+        posterior = draws[(rng.random(samples) * draws.size).astype(np.int64)]
+    else:
+        posterior = draws
+    if floor is not None:
+        posterior = np.maximum(floor, posterior)
+    messages = identification_warnings(draws, weights)
+    for message in messages:
+        warnings.warn(f"Elasticity calibration: {message}", stacklevel=2)
+    if not diagnostics:
+        return posterior
+    ess = float(draws.size) if weights is None else _kish(weights)
+    return posterior, {'draws': draws, 'weights': weights, 'ess': ess, 'warnings': messages}
+
+def _kish(weights):
+    return weights.sum() ** 2 / (weights ** 2).sum()
+
+def effective_sample_size(draws, prior_mean, prior_std):
+    """
+    Kish effective sample size of the prior importance weights on bootstrap 'draws': how many
+    of them the posterior really rests on. Small values mean the prior and the history disagree.
+    """
+    return _kish(_prior_weights(draws, prior_mean, prior_std))
+
+def calibration_summary(samples, quantiles=(0.05, 0.5, 0.95), draws=None):
+    """
+    Mean, standard deviation, share of inelastic samples (elasticity <= 1, where profit keeps
+    rising with price) and quantiles (keys 'P5', 'P50', ...) of elasticity samples.
+    With the raw bootstrap 'draws' (info['draws'] of posterior_elasticity) also their inelastic
+    and wrong-signed shares, 'draws_prob_inelastic' and 'draws_prob_negative', which the floor hides.
+    """
+    summary = {'mean': float(np.mean(samples)), 'std': float(np.std(samples)),
+               'prob_inelastic': float(np.mean(samples <= 1))}
+    if draws is not None:
+        summary['draws_prob_inelastic'] = float(np.mean(draws <= 1))
+        summary['draws_prob_negative'] = float(np.mean(draws <= 0))
+    for q, value in zip(quantiles, np.quantile(samples, quantiles)):
+        summary[f'P{100 * q:g}'] = float(value)
+    return summary
@@ -0,0 +1,180 @@
+import csv
+import hashlib
+import json
+import os
+import tempfile
+
+# -------------------------------
+# 1. Locations
+# (Snapshots share the simulation result cache directory; see result_cache.py. They are plain JSON,
+#  so loading one never runs code from that directory)
+# -------------------------------
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'Data')
+SNAPSHOT_DIR = os.environ.get(
+    'HUNLEY_CACHE_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), '.mc_cache'))
+
+# Income Statement items in casefacts.csv and the baseline keys the projection functions use
+BASELINE_ITEMS = {
+    'Sales (fly rods)': 'Sales',
+    'COGS': 'COGS',
+    'Sales Commissions': 'Sales_Commissions',
+    'General and Administrative': 'G_and_A',
+    'EBITDA': 'EBITDA',
+    'Fly rod Unit Sales': 'unit_sales',
+    'Average Unit Price': 'avg_unit_price'
+}
+
+# -------------------------------
+# 2. Parsing
+# -------------------------------
+def _typed(value):
+    """
+    Numbers become floats; anything else (e.g. 'Walmart', 'Weak') stays a string.
+    """
+    try:
+        return float(value)
+    except ValueError:
+        return value
+
+def parse_casefacts(path):
+    """
+    Parses casefacts.csv (Category, Item, Year, Value, Notes; blank separator lines allowed).
+    Returns (values, notes): dicts keyed by (Category, Item, Year), with Year an int or None.
+    """
+    values, notes = {}, {}
+    with open(path, newline='', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            if not row['Category']:
+                continue
+            key = (row['Category'], row['Item'], int(row['Year']) if row['Year'] else None)
+            values[key] = _typed(row['Value'])
+            notes[key] = row['Notes']
+    return values, notes
+
+def parse_market(path):
+    """
+    Parses market.csv into {alternative: {'TAM': .., 'TOM': .., 'SOM': .., 'Actual Customers': ..}}.
+    """
+    with open(path, newline='', encoding='utf-8') as f:
+        return {
+            row['Alternative']: {column: float(value) for column, value in row.items() if column != 'Alternative'}
+            for row in csv.DictReader(f)
+        }
+
+# -------------------------------
+# 3. JSON Snapshot
+# (Re-parsed only when a source file's mtime changes and its content hash no longer matches)
+# -------------------------------
+def _fingerprint(path, previous=None):
+    stat = os.stat(path)
+    if previous is not None and previous['mtime_ns'] == stat.st_mtime_ns and previous['size'] == stat.st_size:
+        return previous
+    with open(path, 'rb') as f:
+        digest = hashlib.sha256(f.read()).hexdigest()
+    return {'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size, 'sha256': digest}
+
+def _load_snapshot(sources, snapshot_path, parse):
+    """
+    Returns parse() of the source files, reusing the JSON snapshot when the sources are unchanged.
+    parse() must return JSON-serializable data.
+    """
+    snapshot = None
+    if os.path.exists(snapshot_path):
+        try:
+            with open(snapshot_path, encoding='utf-8') as f:
+                snapshot = json.load(f)
+        except (OSError, ValueError):
+            snapshot = None
+
+    previous = snapshot['fingerprints'] if snapshot else {}
+    fingerprints = {path: _fingerprint(path, previous.get(path)) for path in sources}
+    if snapshot and all(fingerprints[p]['sha256'] == previous.get(p, {}).get('sha256') for p in sources):
+        if fingerprints != previous:
+            # Touched but identical: refresh the mtimes so the next load skips hashing.
+            _write_snapshot(snapshot_path, fingerprints, snapshot['data'])
+        return snapshot['data']
+
+    data = parse()
+    _write_snapshot(snapshot_path, fingerprints, data)
+    return data
+
+def _write_snapshot(snapshot_path, fingerprints, data):
+    os.makedirs(os.path.dirname(snapshot_path), exist_ok=True)
+    # A private temp file per writer, so processes refreshing the snapshot at once never interleave.
+    f = tempfile.NamedTemporaryFile('w', encoding='utf-8', dir=os.path.dirname(snapshot_path), suffix='.tmp',
+                                    delete=False)
+    try:
+        with f:
+            json.dump({'fingerprints': fingerprints, 'data': data}, f)
+        os.replace(f.name, snapshot_path)
+    except BaseException:
+        os.unlink(f.name)
+        raise
+
+# -------------------------------
+# 4. Case Data
+# -------------------------------
+class CaseData:
+    """
+    Indexed, typed view of Data/casefacts.csv and Data/market.csv.
+    """
+
+    def __init__(self, facts, notes, market):
+        self.facts = facts
+        self.notes = notes
+        self.market = market
+
+    def get(self, category, item, year=None):
+        return self.facts[(category, item, year)]
+
+    def series(self, category, item):
+        """
+        Returns {year: value} for one item across the years it is reported.
+        """
+        points = [(year, value) for (c, i, year), value in self.facts.items() if c == category and i == item]
+        return dict(sorted(points, key=lambda point: point[0] or 0))
+
+    def baseline(self, year=2018):
+        """
+        Income statement baseline for 'year' with the keys project_income_statement expects
+        (Sales, COGS, Sales_Commissions, G_and_A, EBITDA, unit_sales, avg_unit_price).
+        """
+        return {key: self.get('Income Statement', item, year) for item, key in BASELINE_ITEMS.items()}
+
+    def segment_share(self, *segments):
+        """
+        Combined (share of current sales, share of the market) of the given fly-fishing segments,
+        as decimals, e.g. segment_share('Occasional') -> (0.18, 0.525).
+        """
+        sales = sum(self.get('Fly-Fishing Segments', f'{s} - % of Sales') for s in segments)
+        market = sum(self.get('Fly-Fishing Segments', f'{s} - % of Market') for s in segments)
+        return sales / 100, market / 100
+
+_case_data = {}
+
+def load_case_data(data_dir=DATA_DIR, cache_dir=SNAPSHOT_DIR):
+    """
+    Loads the case data once per process (per data and cache directory), from the JSON snapshot
+    when the CSVs are unchanged.
+    """
+    key = (os.path.abspath(data_dir), os.path.abspath(cache_dir))
+    if key in _case_data:
+        return _case_data[key]
+
+    casefacts = os.path.join(data_dir, 'casefacts.csv')
+    market = os.path.join(data_dir, 'market.csv')
+
+    def parse():
+        # JSON has no tuple keys, so facts and notes are stored as [category, item, year, value] rows.
+        facts, notes = parse_casefacts(casefacts)
+        return {'facts': [list(key) + [value] for key, value in facts.items()],
+                'notes': [list(key) + [note] for key, note in notes.items()],
+                'market': parse_market(market)}
+
+    snapshot_name = 'case_data_' + hashlib.sha256(data_dir.encode()).hexdigest()[:12] + '.json'
+    snapshot_path = os.path.join(cache_dir, snapshot_name)
+    data = _load_snapshot([casefacts, market], snapshot_path, parse)
+    case_data = CaseData({tuple(row[:3]): row[3] for row in data['facts']},
+                         {tuple(row[:3]): row[3] for row in data['notes']}, data['market'])
+    _case_data[key] = case_data
+    return case_data
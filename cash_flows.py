@@ -0,0 +1,165 @@
+import numpy as np
+
+from projection_engine import draw_noise, project_line_items_batch
+
+# -------------------------------
+# 1. Schedules
+# (Cash flow matrices have one row per path and one column per year, column 0 being today)
+# -------------------------------
+def investment_schedule(amounts, years):
+    """
+    Capex or investment outflows as an array of length years + 1, e.g. {0: 500000} or [500000].
+    A scalar is spent up front (year 0).
+    """
+    schedule = np.zeros(years + 1)
+    if np.isscalar(amounts):
+        schedule[0] = amounts
+    elif isinstance(amounts, dict):
+        for year, amount in amounts.items():
+            if not 0 <= year <= years:
+                raise ValueError(f"Investment in year {year} falls outside the 0..{years} year horizon")
+            schedule[year] += amount
+    else:
+        amounts = np.asarray(amounts, dtype=float)
+        if amounts.size > years + 1:
+            raise ValueError(f"{amounts.size} yearly investments do not fit the 0..{years} year horizon")
+        schedule[:amounts.size] = amounts
+    return schedule
+
+def straight_line_depreciation(amount, life, years):
+    """
+    Depreciation of 'amount' spread evenly over 'life' years, for projection years 1..years.
+    """
+    per_year = np.zeros(years)
+    per_year[:min(life, years)] = amount / life
+    return per_year
+
+# -------------------------------
+# 2. Free Cash Flows
+# -------------------------------
+def free_cash_flows(EBITDA, investment=0, tax_rate=0.0, depreciation=0.0, sales=None, initial_sales=None,
+                    working_capital_rate=0.0):
+    """
+    Turns an (iterations, years) EBITDA matrix into an (iterations, years + 1) free cash flow matrix:
+    FCF_t = EBITDA_t - tax_rate * max(EBITDA_t - depreciation_t, 0) - capex_t - change in working capital,
+    with year 0 holding the upfront outflow. 'investment' is anything investment_schedule accepts.
+    Working capital is 'working_capital_rate' times Sales, so it needs the (iterations, years)
+    'sales' matrix and the year-0 'initial_sales'.
+    """
+    EBITDA = np.asarray(EBITDA, dtype=float)
+    years = EBITDA.shape[-1]
+    capex = investment_schedule(investment, years)
+
+    flows = np.empty(EBITDA.shape[:-1] + (years + 1,))
+    flows[..., 0] = 0.0
+    taxes = tax_rate * np.maximum(EBITDA - depreciation, 0.0)
+    flows[..., 1:] = EBITDA - taxes
+    flows -= capex
+
+    if working_capital_rate:
+        if sales is None or initial_sales is None:
+            raise ValueError("working capital drag needs 'sales' and 'initial_sales'")
+        working_capital = working_capital_rate * np.asarray(sales, dtype=float)
+        flows[..., 1] -= working_capital[..., 0] - working_capital_rate * initial_sales
+        flows[..., 2:] -= np.diff(working_capital, axis=-1)
+    return flows
+
+# -------------------------------
+# 3. NPV, IRR and Payback (vectorized over paths)
+# -------------------------------
+def discount_factors(rate, years):
+    """
+    (1 + rate)^-t for t = 0..years. A scalar rate gives shape (years + 1,), an (iterations,)
+    array of per-path rates gives (iterations, years + 1).
+    """
+    rate = np.asarray(rate, dtype=float)
+    return (1 + rate[..., None]) ** -np.arange(years + 1)
+
+def npv(cash_flows, rate):
+    """
+    Net present value of each row of 'cash_flows' at a fixed or per-path discount rate.
+    """
+    cash_flows = np.asarray(cash_flows, dtype=float)
+    return (cash_flows * discount_factors(rate, cash_flows.shape[-1] - 1)).sum(axis=-1)
+
+def irr(cash_flows, guess=0.1, tol=1e-10, max_iter=100):
+    """
+    Internal rate of return of each row, by Newton's method run on all paths at once.
+    Rows without both an outflow and an inflow have no IRR and give NaN, as do rows that
+    have not converged after 'max_iter' steps.
+    """
+    cash_flows = np.asarray(cash_flows, dtype=float)
+    t = np.arange(cash_flows.shape[-1])
+    rate = np.full(cash_flows.shape[:-1], float(guess))
+    active = (cash_flows < 0).any(axis=-1) & (cash_flows > 0).any(axis=-1)
+    converged = np.zeros_like(active)
+
+    for _ in range(max_iter):
+        if not active.any():
+            break
+        r = rate[active]
+        cf = cash_flows[active]
+        discount = (1 + r[:, None]) ** -t
+        value = (cf * discount).sum(axis=-1)
+        slope = -(t * cf * discount).sum(axis=-1) / (1 + r)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            step = value / slope
+        # Keep the rate above -100%, where the discount factors stay finite.
+        new = np.maximum(r - np.nan_to_num(step), (r - 1) / 2)
+        rate[active] = new
+
+        done = np.abs(new - r) <= tol * np.maximum(1.0, np.abs(new))
+        index = np.flatnonzero(active)
+        converged[index[done]] = True
+        active[index[done]] = False
+
+    return np.where(converged, rate, np.nan)
+
+def payback_period(cash_flows):
+    """
+    Years until cumulative cash flow turns non-negative, interpolated linearly within the year
+    it happens. NaN for paths that do not pay back within the horizon.
+    """
+    cash_flows = np.asarray(cash_flows, dtype=float)
+    cumulative = np.cumsum(cash_flows, axis=-1)
+    paid = cumulative >= 0
+    year = np.argmax(paid, axis=-1)
+    reached = paid.any(axis=-1)
+
+    before = np.take_along_axis(cumulative, np.maximum(year - 1, 0)[..., None], axis=-1)[..., 0]
+    flow = np.take_along_axis(cash_flows, year[..., None], axis=-1)[..., 0]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        fraction = np.where(year > 0, -before / flow, 0.0)
+    period = np.where(year > 0, year - 1 + fraction, 0.0)
+    return np.where(reached, period, np.nan)
+
+# -------------------------------
+# 4. Discounted Cash Flow Simulation
+# -------------------------------
+def dcf_simulation(baseline, base_assumptions, years=3, iterations=100000, investment=0, discount_rate=0.10,
+                   discount_rate_std=0.0, tax_rate=0.0, working_capital_rate=0.0, depreciation=0.0,
+                   noise_scales=None, rng=None, sampler=None, drivers=None):
+    """
+    Simulates the income statement paths and returns a dict of per-path distributions:
+    'NPV', 'IRR' and 'payback' (years), plus the 'cash_flows' matrix they were computed from.
+    With 'discount_rate_std' > 0 each path draws its own discount rate ~ N(discount_rate, std^2).
+    """
+    if rng is None:
+        rng = np.random
+    params = draw_noise(base_assumptions, iterations, noise_scales=noise_scales, rng=rng, sampler=sampler,
+                        drivers=drivers)
+    items = project_line_items_batch(baseline, params, years=years)
+
+    flows = free_cash_flows(items['EBITDA'], investment=investment, tax_rate=tax_rate, depreciation=depreciation,
+                            sales=items['Sales'], initial_sales=baseline['unit_sales'] * baseline['avg_unit_price'],
+                            working_capital_rate=working_capital_rate)
+    rate = discount_rate
+    if discount_rate_std:
+        rate = discount_rate + discount_rate_std * rng.standard_normal(iterations)
+
+    return {
+        'NPV': npv(flows, rate),
+        'IRR': irr(flows),
+        'payback': payback_period(flows),
+        'cash_flows': flows
+    }
@@ -0,0 +1,280 @@
+import argparse
+import os
+import sys
+
+# Command line entry point for the Hunley models, e.g.
+#   python cli.py simulate --iterations 100000 --years 4 --plot ebitda.pdf
+#   python cli.py simulate --iterations 10000000 --workers 4
+#   python cli.py simulate --years 20 --capacity SOM --capacity-mode logistic --capture-rate 0.3
+#   python cli.py optimize-price --q0 20200 --p0 260 --elasticity 1.5 --unit-cost 122.2
+#   python cli.py project --set unit_sales_growth=-0.02 --years 5
+#   python cli.py price-simulate --alternative 3 --risk-aversion 0.5
+#   python cli.py calibrate --prior-mean 1.5 --prior-std 0.2 --output elasticities.npy
+#   python cli.py --profile trace.json --profile-memory simulate --iterations 100000
+
+# -------------------------------
+# 1. Commands
+# (Model modules are imported inside each command, so a command only pays for what it uses)
+# -------------------------------
+def simulate(args):
+    import monte_carlo_EBITDA_simulation as model
+    from streaming_stats import StreamingSummary
+
+    names = list(model.alternatives)
+    chosen = names if args.alternative == 'all' else [names[int(args.alternative) - 1]]
+    if args.workers and (args.capacity or args.capture_rate is not None or args.sampler):
+        raise SystemExit("--workers runs the plain model on pseudo-random draws; "
+                         "drop --capacity, --capture-rate and --sampler")
+
+    summaries = {}
+    for name in chosen:
+        k = names.index(name)
+        baseline, assumptions = model.alternatives[name]
+        seed = None if args.seed is None else args.seed + k
+        if args.workers:
+            from parallel_runner import summarize_alternatives
+
+            # Shards are summarized in the workers; only their summaries come back.
+            summaries.update(summarize_alternatives({name: (baseline, assumptions)}, years=args.years,
+                                                    iterations=args.iterations, seed=seed, workers=args.workers,
+                                                    noise_scales=model.NOISE_SCALES))
+            continue
+        if args.capacity or args.capture_rate is not None:
+            values = _simulate_capped(model, name, args, seed)
+        else:
+            values = model.monte_carlo_simulation(baseline, assumptions, years=args.years,
+                                                  iterations=args.iterations, sampler=args.sampler, seed=seed)
+        # Same 400 bins over the sample range as plt.hist(values, bins=400)
+        summaries[name] = StreamingSummary(hist_range=(values.min(), values.max()))
+        summaries[name].update(values)
+
+    print(f"Cumulative {args.years}-Year EBITDA ({args.iterations:,} paths):")
+    for name, stats in summaries.items():
+        summary = stats.summary(quantiles=(0.05, 0.5, 0.95))
+        print(f"{name}: Mean = ${summary['mean']:,.0f}, Std = ${summary['std']:,.0f}, "
+              f"P5 = ${summary['P5']:,.0f}, P50 = ${summary['P50']:,.0f}, P95 = ${summary['P95']:,.0f}")
+
+    if args.plot:
+        from instrumentation import phase
+
+        with phase('plotting'):
+            _plot_histograms(summaries, args.years, args.plot)
+        print(f"Saved {args.plot}")
+
+def _plot_histograms(summaries, years, path):
+    import matplotlib.pyplot as plt
+
+    plt.figure(figsize=(12, 8))
+    for name, stats in summaries.items():
+        plt.stairs(stats.histogram.counts, stats.histogram.edges, fill=True, alpha=0.5, label=name)
+    plt.xlabel(f'Cumulative EBITDA over {years} Years ($)')
+    plt.ylabel('Frequency')
+    plt.legend()
+    plt.grid(True)
+    plt.savefig(path)
+
+def _simulate_capped(model, name, args, seed):
+    """
+    Cumulative EBITDA of one alternative with unit sales capped at its market size and / or
+    the baseline moved by segment share capture (demand.monte_carlo_capped).
+    """
+    import numpy as np
+
+    from case_data import load_case_data
+    from demand import market_capacity, monte_carlo_capped
+
+    case = load_case_data()
+    baseline, assumptions = model.alternatives[name]
+    market, segments = model.market_alternatives[name]
+    capacity = market_capacity(case, market, level=args.capacity) if args.capacity else np.inf
+    current_share, target_share = case.segment_share(*segments)
+    EBITDA = monte_carlo_capped(baseline, assumptions, capacity, years=args.years, iterations=args.iterations,
+                                mode=args.capacity_mode, capture_rate=args.capture_rate,
+                                current_share=current_share, target_share=target_share,
+                                capture_std=args.capture_std, noise_scales=model.NOISE_SCALES,
+                                rng=np.random.default_rng(seed), sampler=args.sampler)
+    return EBITDA.sum(axis=1)
+
+def optimize_price(args):
+    from price_optimizer import optimal_price
+
+    try:
+        price, quantity = optimal_price(args.q0, args.p0, args.elasticity, unit_cost=args.unit_cost,
+                                        commission=args.commission, bounds=(args.min_price, args.max_price))
+    except ValueError as exc:
+        raise SystemExit(str(exc))
+    profit = (price * (1 - args.commission) - args.unit_cost) * quantity
+    print(f"Optimal Price = ${price:,.2f}, Quantity = {quantity:,.0f} units, Profit = ${profit:,.0f}")
+
+def price_simulate(args):
+    import numpy as np
+
+    import monte_carlo_EBITDA_simulation as model
+    from price_monte_carlo import optimize_price_monte_carlo
+
+    names = list(model.alternatives)
+    chosen = names if args.alternative == 'all' else [names[int(args.alternative) - 1]]
+    print(f"Cumulative {args.years}-Year EBITDA with the price optimized per path ({args.iterations:,} paths):")
+    for name in chosen:
+        k = names.index(name)
+        market = model.pricing_markets[name]
+        elasticities = None
+        if args.calibrated:
+            from calibration import posterior_elasticity
+
+            elasticities = posterior_elasticity(samples=args.iterations, prior_mean=market['elasticity'],
+                                                prior_std=market['elasticity_std'],
+                                                rng=np.random.default_rng(args.seed))
+        priced = optimize_price_monte_carlo(market, model.alternatives[name][1], years=args.years,
+                                            iterations=args.iterations, risk_aversion=args.risk_aversion,
+                                            alpha=args.alpha, noise_scales=model.NOISE_SCALES,
+                                            rng=np.random.default_rng(args.seed + k), elasticities=elasticities)
+        robust = priced['robust_EBITDA'].sum(axis=1)
+        flexible = priced['optimal_EBITDA'].sum(axis=1)
+        print(f"{name}: Robust Price = ${priced['robust_price']:,.2f} (Mean = ${robust.mean():,.0f}, "
+              f"P5 = ${np.percentile(robust, 5):,.0f}); Per-Path Price P5-P95 = "
+              f"${np.percentile(priced['optimal_prices'], 5):,.2f}-${np.percentile(priced['optimal_prices'], 95):,.2f} "
+              f"(Mean = ${flexible.mean():,.0f}, P5 = ${np.percentile(flexible, 5):,.0f})")
+
+def calibrate(args):
+    import warnings
+
+    import numpy as np
+
+    from calibration import calibration_summary, posterior_elasticity, price_volume_history
+
+    years, prices, units = price_volume_history()
+    print(f"History {years[0]}-{years[-1]}: prices {', '.join(f'${p:,.0f}' for p in prices)}; "
+          f"units {', '.join(f'{u:,.0f}' for u in units)}")
+    if (args.prior_mean is None) != (args.prior_std is None):
+        raise SystemExit("Give both --prior-mean and --prior-std, or neither")
+    rng = np.random.default_rng(args.seed)
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')   # printed below, from info['warnings']
+        samples, info = posterior_elasticity(prices, units, samples=args.samples, prior_mean=args.prior_mean,
+                                             prior_std=args.prior_std, method=args.method, floor=args.floor,
+                                             rng=rng, diagnostics=True)
+    summary = calibration_summary(samples, draws=info['draws'])
+    print(f"Bootstrap ({info['draws'].size:,} draws): P(elasticity <= 1) = {summary['draws_prob_inelastic']:.1%}, "
+          f"P(elasticity <= 0) = {summary['draws_prob_negative']:.1%}")
+    print(f"Elasticity ({args.samples:,} samples): Mean = {summary['mean']:.3f}, Std = {summary['std']:.3f}, "
+          f"P5 = {summary['P5']:.3f}, P50 = {summary['P50']:.3f}, P95 = {summary['P95']:.3f}, "
+          f"P(elasticity <= 1) = {summary['prob_inelastic']:.1%}")
+    if args.prior_mean is not None:
+        print(f"Effective sample size of the prior weights: {info['ess']:,.0f} of {info['draws'].size:,} draws")
+    for message in info['warnings']:
+        print(f"Warning: {message}")
+    if args.output:
+        np.save(args.output, samples)
+        print(f"Saved {args.output}")
+
+def project(args):
+    import klamath_projections as klamath
+    from projection import project_income_statement
+
+    baseline = klamath.klamath_baseline()
+    if args.unit_sales is not None:
+        baseline['unit_sales'] = args.unit_sales
+    if args.price is not None:
+        baseline['avg_unit_price'] = args.price
+    assumptions = dict(klamath.assumptions_klamath)
+    for setting in args.set:
+        key, _, value = setting.partition('=')
+        if key not in assumptions:
+            raise SystemExit(f"Unknown assumption {key!r} (choose from {', '.join(assumptions)})")
+        assumptions[key] = float(value)
+
+    table = project_income_statement(baseline, assumptions, years=args.years).to_frame()
+    print(table[['Year', 'unit_sales', 'avg_unit_price', 'Sales', 'COGS', 'Gross_Profit', 'EBITDA']].to_string(index=False))
+
+# -------------------------------
+# 2. Argument Parsing
+# -------------------------------
+def build_parser():
+    parser = argparse.ArgumentParser(prog='cli.py', description='Hunley, Inc. projection, simulation and pricing models.')
+    parser.add_argument('--profile', metavar='PATH',
+                        help='time the run by phase, print a report and write a Chrome trace JSON to PATH')
+    parser.add_argument('--profile-memory', action='store_true', help='with --profile, also track allocations')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    sim = commands.add_parser('simulate', help='Monte Carlo of cumulative EBITDA for the alternatives')
+    sim.add_argument('--alternative', choices=('1', '2', '3', 'all'), default='all')
+    sim.add_argument('--iterations', type=int, default=100000)
+    sim.add_argument('--years', type=int, default=4)
+    sim.add_argument('--seed', type=int, default=2018, help='base seed (alternative k uses seed + k)')
+    sim.add_argument('--sampler', choices=('pseudo', 'antithetic', 'lhs', 'sobol'), default=None)
+    sim.add_argument('--plot', metavar='PATH', help='save the EBITDA histograms to PATH')
+    sim.add_argument('--workers', type=int,
+                     help='run on this many processes (parallel_runner; seeded per shard, so the draws '
+                          'differ from a single-process run but not between worker counts)')
+    sim.add_argument('--capacity', choices=('SOM', 'TOM', 'TAM'),
+                     help='limit unit sales to this market size from Data/market.csv')
+    sim.add_argument('--capacity-mode', choices=('cap', 'logistic'), default='cap',
+                     help='stop at the capacity or grow logistically towards it')
+    sim.add_argument('--capture-rate', type=float,
+                     help="share of the segments' untapped potential captured in the baseline unit sales")
+    sim.add_argument('--capture-std', type=float, default=0.0, help='spread of the capture rate across paths')
+    sim.set_defaults(func=simulate)
+
+    price = commands.add_parser('optimize-price', help='profit-maximizing price under constant elasticity')
+    price.add_argument('--q0', type=float, required=True, help='baseline quantity')
+    price.add_argument('--p0', type=float, required=True, help='baseline price')
+    price.add_argument('--elasticity', type=float, required=True)
+    price.add_argument('--unit-cost', type=float, required=True,
+                       help='cost per unit (0 maximizes revenue, which then needs --min-price)')
+    price.add_argument('--commission', type=float, default=0.0, help='commission as a fraction of price')
+    price.add_argument('--min-price', type=float, default=0.0)
+    price.add_argument('--max-price', type=float, default=float('inf'),
+                       help='needed when the elasticity is at most 1')
+    price.set_defaults(func=optimize_price)
+
+    psim = commands.add_parser('price-simulate', help='Monte Carlo with the price re-optimized per path, plus a robust price')
+    psim.add_argument('--alternative', choices=('1', '2', '3', 'all'), default='all')
+    psim.add_argument('--iterations', type=int, default=100000)
+    psim.add_argument('--years', type=int, default=4)
+    psim.add_argument('--seed', type=int, default=2018, help='base seed (alternative k uses seed + k)')
+    psim.add_argument('--risk-aversion', type=float, default=0.0,
+                      help='weight of CVaR against the mean in the robust price objective (0 = expected EBITDA)')
+    psim.add_argument('--alpha', type=float, default=0.05, help='CVaR tail share')
+    psim.add_argument('--calibrated', action='store_true',
+                      help='elasticities from the casefacts history, with the hand-set elasticity as the prior')
+    psim.set_defaults(func=price_simulate)
+
+    cal = commands.add_parser('calibrate', help='elasticity samples bootstrapped from the casefacts price / unit sales history')
+    cal.add_argument('--samples', type=int, default=100000)
+    cal.add_argument('--method', choices=('bayesian', 'pairs'), default='bayesian')
+    cal.add_argument('--prior-mean', type=float, help='normal prior on the elasticity (with --prior-std)')
+    cal.add_argument('--prior-std', type=float)
+    cal.add_argument('--floor', type=float, default=0.1,
+                     help='clip the samples from below (default 0.1, the elasticity floor used across the models)')
+    cal.add_argument('--seed', type=int, default=2018)
+    cal.add_argument('--output', metavar='PATH', help='save the samples to PATH (.npy)')
+    cal.set_defaults(func=calibrate)
+
+    proj = commands.add_parser('project', help='deterministic income statement projection (Klamath line by default)')
+    proj.add_argument('--years', type=int, default=3)
+    proj.add_argument('--unit-sales', type=float)
+    proj.add_argument('--price', type=float, help='average unit price')
+    proj.add_argument('--set', action='append', default=[], metavar='KEY=VALUE', help='override an assumption')
+    proj.set_defaults(func=project)
+    return parser
+
+def main(argv=None):
+    # Headless: never open a GUI window, whatever the local matplotlib configuration says.
+    os.environ['MPLBACKEND'] = 'Agg'
+    args = build_parser().parse_args(argv)
+    if not args.profile:
+        args.func(args)
+        return 0
+
+    from instrumentation import instrument, phase
+
+    with instrument(track_allocations=args.profile_memory) as inst, phase(args.command):
+        args.func(args)
+    inst.print_report()
+    inst.export_chrome_trace(args.profile)
+    print(f"Saved {args.profile}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,68 @@
+from statistics import NormalDist
+
+import numpy as np
+
+from projection_engine import NOISE_PARAMETERS, noise_from_normals, project_ebitda_batch
+from samplers import get_sampler
+
+# -------------------------------
+# 1. Joint Simulation on Shared Draws
+# -------------------------------
+def simulate_alternatives_crn(alternatives, years=3, iterations=100000, noise_scales=None, rng=None,
+                              sampler=None):
+    """
+    Simulates every alternative on the same standard normal draws (common random numbers).
+    Path i of every alternative sees the same shocks, so differences between alternatives
+    carry only the variance of the alternatives themselves, not of independent sampling.
+
+    'alternatives' maps a name to a (baseline, assumptions) pair.
+    Returns a dict of name -> array of cumulative EBITDA, shape (iterations,).
+    """
+    z = get_sampler(sampler)(iterations, len(NOISE_PARAMETERS), rng)
+    return {
+        name: project_ebitda_batch(baseline, noise_from_normals(assumptions, z, noise_scales), years=years).sum(axis=1)
+        for name, (baseline, assumptions) in alternatives.items()
+    }
+
+# -------------------------------
+# 2. Paired-Difference Statistics
+# -------------------------------
+def paired_difference(first, second, confidence=0.95):
+    """
+    Compares two alternatives simulated path-by-path on the same draws.
+    Returns a dict with the mean of (second - first), its confidence interval, the standard
+    error, P(second > first) with its standard error, and the correlation between the two.
+    """
+    diff = np.asarray(second) - np.asarray(first)
+    n = diff.size
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+
+    mean = diff.mean()
+    se = diff.std(ddof=1) / np.sqrt(n)
+    p_better = (diff > 0).mean()
+    return {
+        'mean_diff': mean,
+        'se': se,
+        'ci_low': mean - z * se,
+        'ci_high': mean + z * se,
+        'p_better': p_better,
+        'p_better_se': np.sqrt(p_better * (1 - p_better) / n),
+        'correlation': np.corrcoef(first, second)[0, 1]
+    }
+
+def compare_alternatives(results, confidence=0.95):
+    """
+    Paired-difference statistics for every ordered pair of alternatives in 'results'
+    (as returned by simulate_alternatives_crn).
+    Returns a DataFrame with one row per (first, second) pair.
+    """
+    import pandas as pd
+
+    names = list(results)
+    rows = []
+    for i, first in enumerate(names):
+        for second in names[i + 1:]:
+            row = {'first': first, 'second': second}
+            row.update(paired_difference(results[first], results[second], confidence=confidence))
+            rows.append(row)
+    return pd.DataFrame(rows)
@@ -0,0 +1,100 @@
+import numpy as np
+
+from projection_engine import _batch_rates, draw_noise
+
+# -------------------------------
+# 1. Demand Curve and Share Capture
+# -------------------------------
+def predicted_demand(Q0, P0, P, elasticity):
+    """
+    Compute predicted demand using: Q = Q0 * (P0 / P)^elasticity
+    """
+    return Q0 * (P0 / P)**(elasticity)
+
+def adjust_baseline(current_demand, current_share, target_share, capture_rate):
+    """
+    Adjust the baseline demand given market data.
+
+    Parameters:
+      current_demand: current units sold for a segment.
+      current_share: current % share of that segment in total purchases (decimal).
+      target_share: potential/target % share of that segment in the market (decimal).
+      capture_rate: assumed fraction of the untapped potential that can be captured (decimal).
+
+    Returns:
+      Adjusted demand value. Works element-wise on arrays (e.g. one capture rate per path).
+    """
+    f = target_share / current_share  # the full factor by which demand could increase.
+    return current_demand * (1 + capture_rate * (f - 1))
+
+def market_capacity(case, alternative, level='SOM'):
+    """
+    Market capacity in units per year for an alternative in Data/market.csv
+    ('Titaluk Premium', 'Walmart Rods', 'Direct Expansion'), one unit per customer.
+    'level' is 'SOM' (serviceable obtainable), 'TOM' or 'TAM'. 'case' is a case_data.CaseData.
+    """
+    return case.market[alternative][level]
+
+# -------------------------------
+# 2. Capacity-Constrained Projection
+# (Unit sales either stop at the capacity ('cap') or grow logistically towards it ('logistic'):
+#  U_t = U_(t-1) * (1 + g * (1 - U_(t-1) / K)))
+# -------------------------------
+def project_ebitda_capped(baseline, params, capacity, years=3, mode='cap'):
+    """
+    project_ebitda_batch with unit sales limited by 'capacity' (a scalar or one value per path).
+    The baseline unit sales and price may also be arrays with one value per path.
+    Returns (EBITDA, unit_sales), both of shape (iterations, years).
+    """
+    if mode not in ('cap', 'logistic'):
+        raise ValueError(f"Unknown capacity mode: {mode!r} (choose 'cap' or 'logistic')")
+    (unit_sales_growth, price_growth, COGS_percent, sales_comm_rate, G_A_percent), shape = _batch_rates(params)
+    capacity = np.asarray(capacity, dtype=float)
+    shape = np.broadcast_shapes(shape, capacity.shape, np.shape(baseline['unit_sales']),
+                                np.shape(baseline['avg_unit_price']))
+    EBITDA = np.empty(shape + (years,))
+    units = np.empty(shape + (years,))
+
+    unit_sales = np.minimum(baseline['unit_sales'], capacity)
+    avg_unit_price = baseline['avg_unit_price']
+    for i in range(years):
+        if mode == 'cap':
+            unit_sales = np.minimum(unit_sales * (1 + unit_sales_growth), capacity)
+        else:
+            unit_sales = unit_sales * (1 + unit_sales_growth * (1 - unit_sales / capacity))
+        avg_unit_price = avg_unit_price * (1 + price_growth)
+        sales = unit_sales * avg_unit_price
+        gross_profit = sales - sales * COGS_percent
+        EBITDA[..., i] = gross_profit - sales * sales_comm_rate - sales * G_A_percent
+        units[..., i] = unit_sales
+
+    return EBITDA, units
+
+def monte_carlo_capped(baseline, base_assumptions, capacity, years=3, iterations=100000, mode='cap',
+                       capacity_std=0.0, capture_rate=None, current_share=None, target_share=None,
+                       capture_std=0.0, noise_scales=None, rng=None, sampler=None, drivers=None):
+    """
+    Monte Carlo of EBITDA with capacity-constrained unit sales. With 'capacity_std' > 0 the
+    capacity itself is uncertain: each path draws K ~ N(capacity, capacity_std^2), floored at 1 unit.
+
+    With a 'capture_rate' the baseline unit sales are first moved by share capture, as in
+    adjust_baseline: U0 * (1 + capture_rate * (target_share / current_share - 1)). With
+    'capture_std' > 0 each path draws its own capture rate ~ N(capture_rate, capture_std^2),
+    clipped to [0, 1].
+    Returns the (iterations, years) EBITDA matrix.
+    """
+    if rng is None:
+        rng = np.random
+    params = draw_noise(base_assumptions, iterations, noise_scales=noise_scales, rng=rng, sampler=sampler,
+                        drivers=drivers)
+    if capacity_std:
+        capacity = np.maximum(capacity + capacity_std * rng.standard_normal(iterations), 1.0)
+    if capture_rate is not None:
+        if current_share is None or target_share is None:
+            raise ValueError("Share capture needs both 'current_share' and 'target_share'")
+        if capture_std:
+            capture_rate = np.clip(capture_rate + capture_std * rng.standard_normal(iterations), 0.0, 1.0)
+        baseline = dict(baseline, unit_sales=adjust_baseline(baseline['unit_sales'], current_share,
+                                                             target_share, capture_rate))
+    EBITDA, _ = project_ebitda_capped(baseline, params, capacity, years=years, mode=mode)
+    return EBITDA
@@ -0,0 +1,104 @@
+import numpy as np
+
+from projection_engine import DEFAULT_NOISE_SCALES, NOISE_PARAMETERS
+from samplers import norm_cdf, norm_ppf
+
+# -------------------------------
+# 1. Correlation Matrices
+# -------------------------------
+def correlation_matrix(pairs, parameters=NOISE_PARAMETERS):
+    """
+    Builds a correlation matrix over 'parameters' from {(name, name): rho}; unlisted pairs are 0.
+    e.g. correlation_matrix({('unit_sales_growth', 'price_growth'): -0.5})
+    """
+    index = {name: k for k, name in enumerate(parameters)}
+    matrix = np.eye(len(parameters))
+    for (first, second), rho in pairs.items():
+        matrix[index[first], index[second]] = matrix[index[second], index[first]] = rho
+    return matrix
+
+# Percentages of Sales kept inside [0, 1]. A base value at a bound shifts the mean: sales_comm_rate
+# with base 0 and scale 0.005 becomes a half-normal with mean 0.005 * sqrt(2 / pi) = 0.0040.
+PERCENT_MARGINALS = {
+    'COGS_percent': ('truncated', 0.0, 1.0),
+    'sales_comm_rate': ('truncated', 0.0, 1.0),
+    'G_A_percent': ('truncated', 0.0, 1.0)
+}
+
+# -------------------------------
+# 2. Driver Model
+# (Gaussian copula: correlated standard normals from one (paths, k) matmul, then per-parameter marginals)
+# -------------------------------
+class DriverModel:
+    """
+    Correlated noise for the assumption parameters. The correlation matrix (in NOISE_PARAMETERS
+    order, or built with correlation_matrix) is Cholesky-factored once, here.
+
+    'marginals' maps a parameter to how its noise is shaped (the default is 'normal'):
+      'normal'                   base + scale * z
+      'lognormal'                positive, with mean base and standard deviation scale
+      ('truncated', low, high)   normal(base, scale) truncated to [low, high]
+    Pass the model as 'drivers' to draw_noise / monte_carlo_ebitda_paths.
+
+    Truncation is not centred on 'base' once a bound is near: with a = (low - base) / scale and
+    b = (high - base) / scale the mean is base + scale * (phi(a) - phi(b)) / (Phi(b) - Phi(a))
+    (e.g. +0.80 * scale when base sits on 'low'). The inverse-CDF mapping uses samplers.norm_cdf
+    (absolute error below 1e-7) and norm_ppf (relative error about 1e-9), so the truncated
+    probabilities are accurate to about 1e-7; draws are clipped to [low, high] so the
+    approximation never leaves the bounds.
+    """
+
+    def __init__(self, correlation=None, marginals=None):
+        k = len(NOISE_PARAMETERS)
+        self.correlation = np.eye(k) if correlation is None else np.asarray(correlation, dtype=float)
+        if self.correlation.shape != (k, k):
+            raise ValueError(f"correlation must be {k}x{k}, ordered like NOISE_PARAMETERS")
+        try:
+            self.cholesky = np.linalg.cholesky(self.correlation)
+        except np.linalg.LinAlgError:
+            raise ValueError("correlation matrix is not positive definite") from None
+        self.marginals = dict(marginals or {})
+        for name, marginal in self.marginals.items():
+            kind = marginal if isinstance(marginal, str) else marginal[0]
+            if name not in NOISE_PARAMETERS or kind not in ('normal', 'lognormal', 'truncated'):
+                raise ValueError(f"Unknown marginal {marginal!r} for {name!r}")
+
+    def spec(self):
+        """
+        Plain description of the model, used in cache keys and run metadata.
+        """
+        return {'correlation': self.correlation.tolist(),
+                'marginals': {name: marginal if isinstance(marginal, str) else list(marginal)
+                              for name, marginal in sorted(self.marginals.items())}}
+
+    def correlate(self, z):
+        """
+        Maps an (iterations, k) block of independent standard normals to correlated ones.
+        """
+        return z @ self.cholesky.T
+
+    def noise_from_normals(self, base_assumptions, z, noise_scales=None):
+        """
+        Same contract as projection_engine.noise_from_normals, with correlation and marginals applied.
+        """
+        if noise_scales is None:
+            noise_scales = DEFAULT_NOISE_SCALES
+        z = self.correlate(z)
+        params = {}
+        for k, name in enumerate(NOISE_PARAMETERS):
+            base, scale = base_assumptions[name], noise_scales[name]
+            marginal = self.marginals.get(name, 'normal')
+            kind = marginal if isinstance(marginal, str) else marginal[0]
+            if kind == 'normal' or scale == 0:
+                params[name] = base + scale * z[:, k]
+            elif kind == 'lognormal':
+                if base <= 0:
+                    raise ValueError(f"lognormal {name} needs a positive base value, got {base}")
+                sigma2 = np.log1p((scale / base) ** 2)
+                params[name] = np.exp(np.log(base) - sigma2 / 2 + np.sqrt(sigma2) * z[:, k])
+            else:
+                # Inverse-CDF truncation keeps the copula (and so the rank correlation) intact.
+                _, low, high = marginal
+                lo, hi = norm_cdf((low - base) / scale), norm_cdf((high - base) / scale)
+                params[name] = np.clip(base + scale * norm_ppf(lo + (hi - lo) * norm_cdf(z[:, k])), low, high)
+        return params
@@ -1,6 +1,6 @@
-import pandas as pd
-import numpy as np
-import matplotlib.pyplot as plt
+from projection import project_income_statement
+from projection_engine import monte_carlo_ebitda_paths
+from result_cache import cached_ebitda_paths
 
 # --- Demand Model Function ---
 baseline_opt1 = {
@@ -58,94 +58,75 @@ assumptions_alt3 = {
 }
 
 # -------------------------------
-# 3. Update the Projection Function
-# (This function uses baseline unit_sales and avg_unit_price, then projects Sales and EBITDA over 3 years)
+# 3. Projection Function
+# (project_income_statement is shared by all models and lives in projection.py)
 # -------------------------------
-def project_income_statement(baseline, assumptions, years=3):
-    """
-    Projects an income statement over a given number of years.
-    Uses the baseline unit_sales and avg_unit_price as starting points.
-    Returns a DataFrame of yearly projections.
-    """
-    projections = []
-    last_year = baseline.copy()
-    
-    for i in range(1, years + 1):
-        projection = {}
-        projection['Year'] = 2018 + i
-        
-        # Evolve unit_sales; avg_unit_price remains constant since price_growth = 0.
-        projection['unit_sales'] = last_year['unit_sales'] * (1 + assumptions.get('unit_sales_growth', 0))
-        projection['avg_unit_price'] = last_year['avg_unit_price'] * (1 + assumptions.get('price_growth', 0))
-        projection['Sales'] = projection['unit_sales'] * projection['avg_unit_price']
-        
-        # Compute expenses based on given percentages.
-        projection['COGS'] = projection['Sales'] * assumptions.get('COGS_percent', 0)
-        projection['Gross_Profit'] = projection['Sales'] - projection['COGS']
-        projection['Sales_Commissions'] = projection['Sales'] * assumptions.get('sales_comm_rate', 0)
-        projection['G_and_A'] = projection['Sales'] * assumptions.get('G_A_percent', 0)
-        projection['EBITDA'] = projection['Gross_Profit'] - projection['Sales_Commissions'] - projection['G_and_A']
-        
-        projections.append(projection)
-        last_year = projection.copy()  # Set the current projection as the new baseline.
-    
-    return pd.DataFrame(projections)
 
 # -------------------------------
-# 4. Monte Carlo Simulation Function (Using the above projection function)
+# 4. Monte Carlo Simulation Function (Vectorized batch engine, same draws as the per-path loop)
 # -------------------------------
-def monte_carlo_simulation(baseline, base_assumptions, years=3, iterations=10000):
+# Standard deviation of the noise applied to each assumption in the simulation
+NOISE_SCALES = {
+    'sales_growth': 0.005,
+    'unit_sales_growth': 0.005,
+    'price_growth': 0.005,
+    'COGS_percent': 0.005,
+    'sales_comm_rate': 0.002,
+    'G_A_percent': 0.005
+}
+
+def monte_carlo_simulation(baseline, base_assumptions, years=3, iterations=10000, seed=None):
     """
     Runs a Monte Carlo simulation to project cumulative EBITDA over 'years'.
     Applies random noise (using normal distribution) to the assumption parameters.
+    With a 'seed' the run is reproducible and reused from the on-disk cache (see result_cache.py);
+    without one it draws from the global np.random state.
     Returns an array of cumulative EBITDA values over the projection period.
     """
-    cumulative_EBITDA = []
-    for j in range(iterations):
-        # Random noise on key assumption parameters.
-        noise = {
-            'sales_growth': np.random.normal(loc=base_assumptions['sales_growth'], scale=0.005),
-            'unit_sales_growth': np.random.normal(loc=base_assumptions['unit_sales_growth'], scale=0.005),
-            'price_growth': np.random.normal(loc=base_assumptions['price_growth'], scale=0.005),
-            'COGS_percent': np.random.normal(loc=base_assumptions['COGS_percent'], scale=0.005),
-            'sales_comm_rate': np.random.normal(loc=base_assumptions['sales_comm_rate'], scale=0.002),
-            'G_A_percent': np.random.normal(loc=base_assumptions['G_A_percent'], scale=0.005)
-        }
-        proj = project_income_statement(baseline, noise, years=years)
-        cum_EBITDA = proj['EBITDA'].sum()
-        cumulative_EBITDA.append(cum_EBITDA)
-    return np.array(cumulative_EBITDA)
+    if seed is None:
+        EBITDA = monte_carlo_ebitda_paths(baseline, base_assumptions, years=years, iterations=iterations,
+                                          noise_scales=NOISE_SCALES)
+    else:
+        EBITDA = cached_ebitda_paths(baseline, base_assumptions, years=years, iterations=iterations, seed=seed,
+                                     noise_scales=NOISE_SCALES)
+    return EBITDA.sum(axis=1)
 
 # -------------------------------
 # 5. Run Monte Carlo Simulations for Each Alternative Using Their Optimal Baselines
+# (matplotlib is only imported when plotting, so importing this module stays cheap)
 # -------------------------------
-iterations = 10000
-
-results_alt1 = monte_carlo_simulation(baseline_opt1, assumptions_alt1, years=3, iterations=iterations)
-results_alt2 = monte_carlo_simulation(baseline_opt2, assumptions_alt2, years=3, iterations=iterations)
-results_alt3 = monte_carlo_simulation(baseline_opt3, assumptions_alt3, years=3, iterations=iterations)
-
-# -------------------------------
-# 6. Plot the EBITDA Distributions & Save the Graph as a PDF
-# -------------------------------
-plt.figure(figsize=(12, 8))
-plt.hist(results_alt1, bins=200, alpha=0.5, label='Alt 1: Titaluk Premium')
-plt.hist(results_alt2, bins=200, alpha=0.5, label='Alt 2: Walmart Entry-Level')
-plt.hist(results_alt3, bins=200, alpha=0.5, label='Alt 3: Direct Expansion')
-plt.xlabel('Cumulative EBITDA over 3 Years ($)')
-plt.ylabel('Frequency')
-plt.title('Monte Carlo Simulation: 3-Year Cumulative EBITDA Distribution')
-plt.legend()
-plt.grid(True)
-
-# Save the plot as a PDF file
-plt.savefig('projected_EBITDA_distribution.pdf')
-plt.show()
-
-# -------------------------------
-# 7. Print Summary Statistics for Each Alternative
-# -------------------------------
-print("Cumulative 3-Year EBITDA (Monte Carlo Simulation):")
-print(f"Alternative 1 (Titaluk Premium): Mean = ${results_alt1.mean():,.0f}, Std = ${results_alt1.std():,.0f}")
-print(f"Alternative 2 (Walmart): Mean = ${results_alt2.mean():,.0f}, Std = ${results_alt2.std():,.0f}")
-print(f"Alternative 3 (Direct Expansion): Mean = ${results_alt3.mean():,.0f}, Std = ${results_alt3.std():,.0f}")
+def main(iterations=10000, seed=2018, show=True):
+    """
+    Simulates each alternative, saves the EBITDA distributions to a PDF and prints their summary.
+    A fixed seed means re-runs with unchanged inputs are read back from the result cache.
+    """
+    import matplotlib.pyplot as plt
+
+    results_alt1 = monte_carlo_simulation(baseline_opt1, assumptions_alt1, years=3, iterations=iterations, seed=seed)
+    results_alt2 = monte_carlo_simulation(baseline_opt2, assumptions_alt2, years=3, iterations=iterations, seed=seed + 1)
+    results_alt3 = monte_carlo_simulation(baseline_opt3, assumptions_alt3, years=3, iterations=iterations, seed=seed + 2)
+
+    # Plot the EBITDA distributions & save the graph as a PDF
+    plt.figure(figsize=(12, 8))
+    plt.hist(results_alt1, bins=200, alpha=0.5, label='Alt 1: Titaluk Premium')
+    plt.hist(results_alt2, bins=200, alpha=0.5, label='Alt 2: Walmart Entry-Level')
+    plt.hist(results_alt3, bins=200, alpha=0.5, label='Alt 3: Direct Expansion')
+    plt.xlabel('Cumulative EBITDA over 3 Years ($)')
+    plt.ylabel('Frequency')
+    plt.title('Monte Carlo Simulation: 3-Year Cumulative EBITDA Distribution')
+    plt.legend()
+    plt.grid(True)
+
+    # Save the plot as a PDF file
+    plt.savefig('projected_EBITDA_distribution.pdf')
+    if show:
+        plt.show()
+
+    # Summary statistics for each alternative
+    print("Cumulative 3-Year EBITDA (Monte Carlo Simulation):")
+    print(f"Alternative 1 (Titaluk Premium): Mean = ${results_alt1.mean():,.0f}, Std = ${results_alt1.std():,.0f}")
+    print(f"Alternative 2 (Walmart): Mean = ${results_alt2.mean():,.0f}, Std = ${results_alt2.std():,.0f}")
+    print(f"Alternative 3 (Direct Expansion): Mean = ${results_alt3.mean():,.0f}, Std = ${results_alt3.std():,.0f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,198 @@
+import json
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+# -------------------------------
+# 1. Disabled Fast Path
+# (The simulators call phase()/count() unconditionally; with no active Instrument these cost one
+#  global lookup and return a shared do-nothing context manager)
+# -------------------------------
+class _NullPhase:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+_NULL_PHASE = _NullPhase()
+_active = None
+
+def phase(name, **attrs):
+    """
+    Context manager timing one phase ('sampling', 'projection', 'reduction', 'io', 'plotting', ...)
+    on the active Instrument; a no-op when instrumentation is off.
+    """
+    if _active is None:
+        return _NULL_PHASE
+    return _Phase(_active, name, attrs)
+
+def count(name, n=1):
+    """
+    Adds 'n' to a counter (e.g. 'paths') on the active Instrument; a no-op when instrumentation is off.
+    """
+    if _active is not None:
+        _active.counters[name] = _active.counters.get(name, 0) + n
+
+def active():
+    return _active
+
+# -------------------------------
+# 2. Phases and Events
+# -------------------------------
+class _Phase:
+    __slots__ = ('instrument', 'name', 'attrs', 'start', 'memory_start', 'memory_peak')
+
+    def __init__(self, instrument, name, attrs):
+        self.instrument = instrument
+        self.name = name
+        self.attrs = attrs
+
+    def __enter__(self):
+        stack = self.instrument._stack()
+        if self.instrument.track_allocations:
+            # tracemalloc keeps one peak; fold it into the enclosing phase before resetting it for this one.
+            current, peak = tracemalloc.get_traced_memory()
+            if stack:
+                stack[-1].memory_peak = max(stack[-1].memory_peak, peak)
+            tracemalloc.reset_peak()
+            self.memory_start = self.memory_peak = current
+        stack.append(self)
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        end = time.perf_counter_ns()
+        stack = self.instrument._stack()
+        stack.pop()
+        event = {
+            'name': self.name,
+            'start_ns': self.start - self.instrument.origin_ns,
+            'duration_ns': end - self.start,
+            'depth': len(stack),
+            'thread': threading.get_ident(),
+            'args': self.attrs
+        }
+        if self.instrument.track_allocations:
+            current, peak = tracemalloc.get_traced_memory()
+            self.memory_peak = max(self.memory_peak, peak)
+            if stack:
+                stack[-1].memory_peak = max(stack[-1].memory_peak, self.memory_peak)
+            tracemalloc.reset_peak()
+            event['alloc_peak_bytes'] = self.memory_peak - self.memory_start
+            event['alloc_net_bytes'] = current - self.memory_start
+        self.instrument._record(event)
+        return False
+
+class Instrument:
+    """
+    Collects phase timings, counters and (optionally) tracemalloc allocation peaks while active.
+    Activate it with the instrument() context manager. 'callback' is called with every finished
+    phase event (a dict), e.g. to stream a structured log. Worker processes of a pool are not covered.
+    """
+
+    def __init__(self, track_allocations=False, callback=None, max_events=1000000):
+        self.track_allocations = track_allocations
+        self.callback = callback
+        self.max_events = max_events
+        self.events = []
+        self.counters = {}
+        self.totals = {}
+        self.origin_ns = time.perf_counter_ns()
+        self.wall_ns = 0
+        self._local = threading.local()
+
+    def _stack(self):
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _record(self, event):
+        calls, total, peak = self.totals.get(event['name'], (0, 0, 0))
+        self.totals[event['name']] = (calls + 1, total + event['duration_ns'],
+                                      max(peak, event.get('alloc_peak_bytes', 0)))
+        if len(self.events) < self.max_events:
+            self.events.append(event)
+        if self.callback is not None:
+            self.callback(event)
+
+    def report(self):
+        """
+        One row per phase: calls, total and mean time, share of the instrumented wall time and,
+        with allocation tracking, the largest allocation peak. Counters get a per-second rate.
+        Returns a DataFrame.
+        """
+        import pandas as pd
+
+        wall = self.wall_ns or (time.perf_counter_ns() - self.origin_ns)
+        rows = []
+        for name, (calls, total, peak) in sorted(self.totals.items(), key=lambda item: -item[1][1]):
+            row = {'phase': name, 'calls': calls, 'total_s': total / 1e9, 'mean_ms': total / calls / 1e6,
+                   'share': total / wall if wall else 0.0}
+            if self.track_allocations:
+                row['peak_alloc_mb'] = peak / 1024 ** 2
+            rows.append(row)
+        table = pd.DataFrame(rows)
+        for name, value in self.counters.items():
+            table.attrs[f'{name}_per_second'] = value / (wall / 1e9) if wall else 0.0
+        table.attrs['wall_s'] = wall / 1e9
+        return table
+
+    def print_report(self):
+        table = self.report()
+        print(f"Instrumented wall time: {table.attrs['wall_s']:.3f} s")
+        for name, value in self.counters.items():
+            print(f"{name}: {value:,} ({table.attrs[f'{name}_per_second']:,.0f}/s)")
+        if len(table):
+            print(table.to_string(index=False))
+
+    def export_chrome_trace(self, path):
+        """
+        Writes the events as Chrome trace JSON (open in chrome://tracing or https://ui.perfetto.dev).
+        """
+        pid = os.getpid()
+        trace = [
+            {'name': event['name'], 'cat': 'phase', 'ph': 'X', 'pid': pid, 'tid': event['thread'],
+             'ts': event['start_ns'] / 1000, 'dur': event['duration_ns'] / 1000,
+             'args': dict(event['args'], **{k: event[k] for k in ('alloc_peak_bytes', 'alloc_net_bytes') if k in event})}
+            for event in self.events
+        ]
+        trace += [
+            {'name': name, 'ph': 'C', 'pid': pid, 'ts': self.wall_ns / 1000, 'args': {name: value}}
+            for name, value in self.counters.items()
+        ]
+        with open(path, 'w') as f:
+            json.dump({'traceEvents': trace, 'displayTimeUnit': 'ms'}, f, default=str)
+
+# -------------------------------
+# 3. Activation
+# -------------------------------
+@contextmanager
+def instrument(track_allocations=False, callback=None, max_events=1000000):
+    """
+    Turns instrumentation on for a block and yields the Instrument:
+
+        with instrument(track_allocations=True) as inst:
+            monte_carlo_simulation(...)
+        inst.print_report()
+        inst.export_chrome_trace('trace.json')
+    """
+    global _active
+    inst = Instrument(track_allocations=track_allocations, callback=callback, max_events=max_events)
+    started_tracing = track_allocations and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    previous, _active = _active, inst
+    inst.origin_ns = time.perf_counter_ns()
+    try:
+        yield inst
+    finally:
+        inst.wall_ns = time.perf_counter_ns() - inst.origin_ns
+        _active = previous
+        if started_tracing:
+            tracemalloc.stop()
@@ -1,6 +1,14 @@
-import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
+
+from cash_flows import free_cash_flows, irr, npv, payback_period
+from common_random_numbers import compare_alternatives, simulate_alternatives_crn
+from instrumentation import phase
+import price_demand_simulation as demand_curves
+from price_monte_carlo import optimize_price_monte_carlo
+from projection import project_income_statement
+from projection_engine import monte_carlo_ebitda_paths
+from result_cache import cached_ebitda_paths
+from sensitivity import sensitivity_report
 
 # --- Demand Model Function ---
 baseline_opt1 = {
@@ -57,119 +65,186 @@ assumptions_alt3 = {
     'G_A_percent': 0.22            # 22% of Sales for G&A expenses
 }
 
+# Standard deviation of the noise applied to each assumption in the simulation
+NOISE_SCALES = {
+    'sales_growth': 0.01,
+    'unit_sales_growth': 0.01,
+    'price_growth': 0.01,
+    'COGS_percent': 0.01,
+    'sales_comm_rate': 0.005,
+    'G_A_percent': 0.01
+}
+
 # -------------------------------
-# 3. Update the Projection Function
-# (This function uses baseline unit_sales and avg_unit_price, then projects Sales and EBITDA over 3 years)
+# 3. Projection Function
+# (project_income_statement is shared by all models and lives in projection.py)
 # -------------------------------
-def project_income_statement(baseline, assumptions, years=3):
-    """
-    Projects an income statement over a given number of years.
-    Uses the baseline unit_sales and avg_unit_price as starting points.
-    Returns a DataFrame of yearly projections.
-    """
-    projections = []
-    last_year = baseline.copy()
-    
-    for i in range(1, years + 1):
-        projection = {}
-        projection['Year'] = 2018 + i
-        
-        # Evolve unit_sales; avg_unit_price remains constant since price_growth = 0.
-        projection['unit_sales'] = last_year['unit_sales'] * (1 + assumptions.get('unit_sales_growth', 0))
-        projection['avg_unit_price'] = last_year['avg_unit_price'] * (1 + assumptions.get('price_growth', 0))
-        projection['Sales'] = projection['unit_sales'] * projection['avg_unit_price']
-        
-        # Compute expenses based on given percentages.
-        projection['COGS'] = projection['Sales'] * assumptions.get('COGS_percent', 0)
-        projection['Gross_Profit'] = projection['Sales'] - projection['COGS']
-        projection['Sales_Commissions'] = projection['Sales'] * assumptions.get('sales_comm_rate', 0)
-        projection['G_and_A'] = projection['Sales'] * assumptions.get('G_A_percent', 0)
-        projection['EBITDA'] = projection['Gross_Profit'] - projection['Sales_Commissions'] - projection['G_and_A']
-        
-        projections.append(projection)
-        last_year = projection.copy()  # Set the current projection as the new baseline.
-    
-    return pd.DataFrame(projections)
 
 # -------------------------------
-# 4. Monte Carlo Simulation Function (Using the above projection function)
+# 4. Monte Carlo Simulation Function (Vectorized batch engine, same draws as the per-path loop)
 # -------------------------------
-def monte_carlo_simulation(baseline, base_assumptions, years=3, iterations=100000):
+def monte_carlo_simulation(baseline, base_assumptions, years=3, iterations=100000, sampler=None, seed=None):
     """
     Runs a Monte Carlo simulation to project cumulative EBITDA over 'years'.
     Applies random noise (using normal distribution) to the assumption parameters.
+    All paths are drawn and rolled forward as arrays by projection_engine.
+    'sampler' selects a variance reduction scheme ('antithetic', 'lhs', 'sobol'; see samplers.py).
+    With a 'seed' the run is reproducible and reused from the on-disk cache (see result_cache.py);
+    without one it draws from the global np.random state.
     Returns an array of cumulative EBITDA values over the projection period.
     """
-    cumulative_EBITDA = []
-    for j in range(iterations):
-        # Random noise on key assumption parameters.
-        noise = {
-            'sales_growth': np.random.normal(loc=base_assumptions['sales_growth'], scale=0.01),
-            'unit_sales_growth': np.random.normal(loc=base_assumptions['unit_sales_growth'], scale=0.01),
-            'price_growth': np.random.normal(loc=base_assumptions['price_growth'], scale=0.01),
-            'COGS_percent': np.random.normal(loc=base_assumptions['COGS_percent'], scale=0.01),
-            'sales_comm_rate': np.random.normal(loc=base_assumptions['sales_comm_rate'], scale=0.005),
-            'G_A_percent': np.random.normal(loc=base_assumptions['G_A_percent'], scale=0.01)
-        }
-        proj = project_income_statement(baseline, noise, years=years)
-        cum_EBITDA = proj['EBITDA'].sum()
-        cumulative_EBITDA.append(cum_EBITDA)
-    return np.array(cumulative_EBITDA)
-
-def monte_carlo_simulation3(baseline, base_assumptions, years=3, iterations=100000):
+    if seed is None:
+        EBITDA = monte_carlo_ebitda_paths(baseline, base_assumptions, years=years, iterations=iterations,
+                                          noise_scales=NOISE_SCALES, sampler=sampler)
+    else:
+        EBITDA = cached_ebitda_paths(baseline, base_assumptions, years=years, iterations=iterations, seed=seed,
+                                     noise_scales=NOISE_SCALES, sampler=sampler)
+    with phase('reduction'):
+        return EBITDA.sum(axis=1)
+
+UPFRONT_INVESTMENT_ALT3 = 500000   # Direct expansion set-up cost, spent in year 0
+
+def monte_carlo_simulation3(baseline, base_assumptions, years=3, iterations=100000, sampler=None, seed=None):
     """
     Runs a Monte Carlo simulation to project cumulative EBITDA over 'years'.
     Applies random noise (using normal distribution) to the assumption parameters.
-    Returns an array of cumulative EBITDA values over the projection period.
+    Returns an array of cumulative EBITDA values over the projection period, net of the upfront investment.
     """
-    cumulative_EBITDA = []
-    for j in range(iterations):
-        # Random noise on key assumption parameters.
-        noise = {
-            'sales_growth': np.random.normal(loc=base_assumptions['sales_growth'], scale=0.01),
-            'unit_sales_growth': np.random.normal(loc=base_assumptions['unit_sales_growth'], scale=0.01),
-            'price_growth': np.random.normal(loc=base_assumptions['price_growth'], scale=0.01),
-            'COGS_percent': np.random.normal(loc=base_assumptions['COGS_percent'], scale=0.01),
-            'sales_comm_rate': np.random.normal(loc=base_assumptions['sales_comm_rate'], scale=0.005),
-            'G_A_percent': np.random.normal(loc=base_assumptions['G_A_percent'], scale=0.01)
-        }
-        proj = project_income_statement(baseline, noise, years=years)
-        cum_EBITDA = proj['EBITDA'].sum()-500000
-        cumulative_EBITDA.append(cum_EBITDA)
-    return np.array(cumulative_EBITDA)
+    return monte_carlo_simulation(baseline, base_assumptions, years=years, iterations=iterations,
+                                  sampler=sampler, seed=seed) - UPFRONT_INVESTMENT_ALT3
+
+# Alternatives keyed by name, each a (baseline, assumptions) pair
+alternatives = {
+    'Alt 1 (Titaluk Premium)': (baseline_opt1, assumptions_alt1),
+    'Alt 2 (Walmart)': (baseline_opt2, assumptions_alt2),
+    'Alt 3 (Direct Expansion)': (baseline_opt3, assumptions_alt3)
+}
 
-# -------------------------------
-# 5. Run Monte Carlo Simulations for Each Alternative Using Their Optimal Baselines
-# -------------------------------
-iterations = 100000
+# Market sizing row (Data/market.csv) and fly-fishing segments (Data/casefacts.csv) of each alternative,
+# for the capacity-constrained, share-capturing model in demand.py
+market_alternatives = {
+    'Alt 1 (Titaluk Premium)': ('Titaluk Premium', ('Avid', 'Competitive')),
+    'Alt 2 (Walmart)': ('Walmart Rods', ('Beginners', 'Occasional')),
+    'Alt 3 (Direct Expansion)': ('Direct Expansion', ('Occasional',))
+}
 
-results_alt1 = monte_carlo_simulation(baseline_opt1, assumptions_alt1, years=4, iterations=iterations)
-results_alt2 = monte_carlo_simulation(baseline_opt2, assumptions_alt2, years=4, iterations=iterations)
-results_alt3 = monte_carlo_simulation(baseline_opt3, assumptions_alt3, years=4, iterations=iterations)
+# Demand curves for pricing inside the simulation (price_demand_simulation.py), with the
+# elasticity uncertain across paths as in price_elasticity_simulation.py and a 5% unit cost spread.
+# Unit cost defaults to COGS_percent at the reference price.
+pricing_markets = {
+    'Alt 1 (Titaluk Premium)': {
+        'Q0': demand_curves.Q0_titaluk, 'P0': demand_curves.P0_titaluk,
+        'elasticity': demand_curves.elasticity_titaluk, 'elasticity_std': 0.2, 'unit_cost_std': 0.05,
+        'price_bounds': (demand_curves.price_range_titaluk[0], demand_curves.price_range_titaluk[-1])
+    },
+    'Alt 2 (Walmart)': {
+        'Q0': demand_curves.Q0_walmart, 'P0': demand_curves.P0_walmart,
+        'elasticity': demand_curves.elasticity_walmart, 'elasticity_std': 0.2, 'unit_cost_std': 0.05,
+        'price_bounds': (demand_curves.price_range_walmart[0], demand_curves.price_range_walmart[-1])
+    },
+    'Alt 3 (Direct Expansion)': {
+        'Q0': demand_curves.Q0_occasional, 'P0': demand_curves.P0_occasional,
+        'elasticity': demand_curves.elasticity_occasional, 'elasticity_std': 0.2, 'unit_cost_std': 0.05,
+        'price_bounds': (demand_curves.price_range_occasional[0], demand_curves.price_range_occasional[-1])
+    }
+}
 
 # -------------------------------
-# 6. Plot the EBITDA Distributions & Save the Graph as a PDF
+# 5. Plot the EBITDA Distributions & Save the Graph as a PDF
+# (matplotlib is imported here, not at module level, so importing this module stays cheap)
 # -------------------------------
-
-plt.figure(figsize=(12, 8))
-plt.xlim(4000000, 9900000)  # Set the x-axis range from 200 to 800
-plt.hist(results_alt1, bins=400, alpha=0.5, label='Alt 1: Titaluk Premium')
-plt.hist(results_alt2, bins=400, alpha=0.5, label='Alt 2: Walmart Entry-Level')
-plt.hist(results_alt3, bins=400, alpha=0.5, label='Alt 3: Direct Expansion')
-plt.xlabel('Cumulative EBITDA over 3 Years ($)')
-plt.ylabel('Frequency')
-plt.title('Monte Carlo Simulation: 3-Year Cumulative EBITDA Distribution of Hunley Inc\'s Alternatives (From 2018E Baseline)')
-plt.legend()
-plt.grid(True)
-
-# Save the plot as a PDF file
-plt.savefig('projected_EBITDA_distribution.pdf')
-plt.show()
+def plot_ebitda_distributions(results_alt1, results_alt2, results_alt3, path='projected_EBITDA_distribution.pdf',
+                              show=True):
+    with phase('plotting'):
+        _plot_ebitda_distributions(results_alt1, results_alt2, results_alt3, path, show)
+
+def _plot_ebitda_distributions(results_alt1, results_alt2, results_alt3, path, show):
+    import matplotlib.pyplot as plt
+
+    plt.figure(figsize=(12, 8))
+    plt.xlim(4000000, 9900000)  # Set the x-axis range from 200 to 800
+    plt.hist(results_alt1, bins=400, alpha=0.5, label='Alt 1: Titaluk Premium')
+    plt.hist(results_alt2, bins=400, alpha=0.5, label='Alt 2: Walmart Entry-Level')
+    plt.hist(results_alt3, bins=400, alpha=0.5, label='Alt 3: Direct Expansion')
+    plt.xlabel('Cumulative EBITDA over 3 Years ($)')
+    plt.ylabel('Frequency')
+    plt.title('Monte Carlo Simulation: 3-Year Cumulative EBITDA Distribution of Hunley Inc\'s Alternatives (From 2018E Baseline)')
+    plt.legend()
+    plt.grid(True)
+
+    # Save the plot as a PDF file
+    plt.savefig(path)
+    if show:
+        plt.show()
 
 # -------------------------------
-# 7. Print Summary Statistics for Each Alternative
+# 6. Run the Full Analysis
 # -------------------------------
-print("Cumulative 3-Year EBITDA (Monte Carlo Simulation):")
-print(f"Alternative 1 (Titaluk Premium): Mean = ${results_alt1.mean():,.0f}, Std = ${results_alt1.std():,.0f}")
-print(f"Alternative 2 (Walmart): Mean = ${results_alt2.mean():,.0f}, Std = ${results_alt2.std():,.0f}")
-print(f"Alternative 3 (Direct Expansion): Mean = ${results_alt3.mean():,.0f}, Std = ${results_alt3.std():,.0f}")
+def main(iterations=100000, seed=2018, show=True):
+    """
+    Runs the simulations for each alternative using their optimal baselines, plots them and
+    prints the summary, paired differences, Sobol indices and NPVs.
+    A fixed seed means re-runs with unchanged inputs are read back from the result cache.
+    """
+    results_alt1 = monte_carlo_simulation(baseline_opt1, assumptions_alt1, years=4, iterations=iterations, seed=seed)
+    results_alt2 = monte_carlo_simulation(baseline_opt2, assumptions_alt2, years=4, iterations=iterations, seed=seed + 1)
+    results_alt3 = monte_carlo_simulation(baseline_opt3, assumptions_alt3, years=4, iterations=iterations, seed=seed + 2)
+
+    plot_ebitda_distributions(results_alt1, results_alt2, results_alt3, show=show)
+
+    # Summary statistics for each alternative
+    print("Cumulative 3-Year EBITDA (Monte Carlo Simulation):")
+    print(f"Alternative 1 (Titaluk Premium): Mean = ${results_alt1.mean():,.0f}, Std = ${results_alt1.std():,.0f}")
+    print(f"Alternative 2 (Walmart): Mean = ${results_alt2.mean():,.0f}, Std = ${results_alt2.std():,.0f}")
+    print(f"Alternative 3 (Direct Expansion): Mean = ${results_alt3.mean():,.0f}, Std = ${results_alt3.std():,.0f}")
+
+    # Rank the alternatives on common random numbers
+    # (All alternatives share the same draws, so paired differences need far fewer paths)
+    results_crn = simulate_alternatives_crn(alternatives, years=4, iterations=iterations, noise_scales=NOISE_SCALES,
+                                            rng=np.random.default_rng(seed))
+
+    print("\nPaired Differences in Cumulative EBITDA (second - first, common random numbers):")
+    for _, row in compare_alternatives(results_crn).iterrows():
+        print(f"{row['second']} vs {row['first']}: Mean Diff = ${row['mean_diff']:,.0f} "
+              f"(95% CI ${row['ci_low']:,.0f} to ${row['ci_high']:,.0f}), P(better) = {row['p_better']:.3f}")
+
+    # Which assumptions drive the EBITDA variance? (Sobol indices)
+    sensitivity = sensitivity_report(alternatives, years=4, noise_scales=NOISE_SCALES,
+                                     rng=np.random.default_rng(seed))
+    print("\nSobol Indices of Cumulative EBITDA (S1 = first order, ST = total):")
+    for _, row in sensitivity.iterrows():
+        print(f"{row['alternative']} - {row['parameter']}: S1 = {row['S1']:.3f}, ST = {row['ST']:.3f}")
+
+    # Discounted cash flows (NPV, IRR, payback)
+    # (EBITDA treated as cash flow; only Alternative 3 carries an upfront investment)
+    discount_rate = 0.10
+    print(f"\n4-Year NPV at a {discount_rate:.0%} Discount Rate:")
+    for k, (name, (baseline, assumptions)) in enumerate(alternatives.items()):
+        investment = UPFRONT_INVESTMENT_ALT3 if k == 2 else 0
+        EBITDA = cached_ebitda_paths(baseline, assumptions, years=4, iterations=iterations, seed=seed + k,
+                                     noise_scales=NOISE_SCALES)
+        flows = free_cash_flows(EBITDA, investment=investment)
+        NPV = npv(flows, discount_rate)
+        line = f"{name}: Mean NPV = ${NPV.mean():,.0f}, P5 = ${np.percentile(NPV, 5):,.0f}"
+        if investment:
+            line += f", Median IRR = {np.nanmedian(irr(flows)):.1%}, Mean Payback = {np.nanmean(payback_period(flows)):.2f} years"
+        print(line)
+
+    # Price chosen inside the simulation instead of fixed in the baselines
+    # (Per path = price set knowing that path's elasticity and cost; robust = one price for all paths)
+    print("\nPrice Optimized Inside the Simulation (4-Year Cumulative EBITDA):")
+    for k, (name, (_, assumptions)) in enumerate(alternatives.items()):
+        for risk_aversion in (0.0, 0.5):
+            priced = optimize_price_monte_carlo(pricing_markets[name], assumptions, years=4, iterations=iterations,
+                                                risk_aversion=risk_aversion, noise_scales=NOISE_SCALES,
+                                                rng=np.random.default_rng(seed + k))
+            robust = priced['robust_EBITDA'].sum(axis=1)
+            label = 'expected EBITDA' if not risk_aversion else f'mean / 5% CVaR blend ({risk_aversion:.0%} CVaR)'
+            print(f"{name}, {label}: Robust Price = ${priced['robust_price']:,.2f}, Mean = ${robust.mean():,.0f}, "
+                  f"P5 = ${np.percentile(robust, 5):,.0f}")
+        flexible = priced['optimal_EBITDA'].sum(axis=1)
+        print(f"{name}, price set per path: Mean Price = ${priced['optimal_prices'].mean():,.2f}, "
+              f"Mean = ${flexible.mean():,.0f}, P5 = ${np.percentile(flexible, 5):,.0f}")
+
+if __name__ == '__main__':
+    main()
@@ -1,69 +1,104 @@
-import pandas as pd
 import numpy as np
 
-def project_income_statement(baseline, assumptions, years=3):
-    """
-    Projects an income statement over a given number of years.
-    Returns a DataFrame of yearly metrics.
-    """
-    projections = []
-    last_year = baseline.copy()
-    
-    for i in range(1, years + 1):
-        projection = {}
-        projection['Year'] = 2018 + i
-        # Update unit sales and average price if present:
-        if 'unit_sales' in last_year and 'avg_unit_price' in last_year:
-            projection['unit_sales'] = last_year['unit_sales'] * (1 + assumptions.get('unit_sales_growth', assumptions['sales_growth']))
-            projection['avg_unit_price'] = last_year['avg_unit_price'] * (1 + assumptions.get('price_growth', 0))
-            projection['Sales'] = projection['unit_sales'] * projection['avg_unit_price']
-        else:
-            projection['Sales'] = last_year['Sales'] * (1 + assumptions['sales_growth'])
-        
-        # Compute expenses and EBITDA
-        projection['COGS'] = projection['Sales'] * assumptions.get('COGS_percent', last_year['COGS'] / last_year['Sales'])
-        projection['Gross_Profit'] = projection['Sales'] - projection['COGS']
-        projection['Sales_Commissions'] = projection['Sales'] * assumptions.get('sales_comm_rate', last_year['Sales_Commissions'] / last_year['Sales'])
-        projection['G_and_A'] = projection['Sales'] * assumptions.get('G_A_percent', last_year['G_and_A'] / last_year['Sales'])
-        projection['EBITDA'] = projection['Gross_Profit'] - projection['Sales_Commissions'] - projection['G_and_A']
-        
-        projections.append(projection)
-        last_year = projection.copy()  # For chaining the projections into the next year
-    
-    return pd.DataFrame(projections)
+from instrumentation import phase
+from parallel_runner import shard_sizes
+from path_store import simulate_to_store
+from projection_engine import draw_noise, monte_carlo_ebitda_paths, project_line_items_batch, LINE_ITEMS
+from streaming_stats import RunningMoments, StreamingSummary
 
-def monte_carlo_simulation_by_year(baseline, base_assumptions, iterations=100000, years=3):
+# Standard deviation of the noise applied to each assumption in the simulation
+NOISE_SCALES = {
+    'sales_growth': 0.005,
+    'unit_sales_growth': 0.005,
+    'price_growth': 0.005,
+    'COGS_percent': 0.005,
+    'sales_comm_rate': 0.002,
+    'G_A_percent': 0.005
+}
+
+def monte_carlo_simulation_by_year(baseline, base_assumptions, iterations=100000, years=3, sampler=None):
     """
     Runs a Monte Carlo simulation for a given number of iterations.
     Instead of returning a cumulative total, this function stores the projected metrics for each year of each iteration.
+    'sampler' selects a variance reduction scheme ('antithetic', 'lhs', 'sobol'; see samplers.py).
     
     Returns:
         A DataFrame with one row per simulation iteration per year, with columns for Year and the income statement metrics.
     """
-    # List to collect simulation results for every iteration and every year
-    simulation_results = []
-    
-    # Loop over iterations
-    for _ in range(iterations):
-        # Apply random variation to the assumptions:
-        noise = {
-            'sales_growth': np.random.normal(loc=base_assumptions['sales_growth'], scale=0.005),
-            'unit_sales_growth': np.random.normal(loc=base_assumptions['unit_sales_growth'], scale=0.005),
-            'price_growth': np.random.normal(loc=base_assumptions['price_growth'], scale=0.005),
-            'COGS_percent': np.random.normal(loc=base_assumptions['COGS_percent'], scale=0.005),
-            'sales_comm_rate': np.random.normal(loc=base_assumptions['sales_comm_rate'], scale=0.002),
-            'G_A_percent': np.random.normal(loc=base_assumptions['G_A_percent'], scale=0.005)
-        }
-        # Get the projected income statement for this iteration
-        proj = project_income_statement(baseline, noise, years=years)
-        # Add an iteration identifier (if needed)
-        proj['Iteration'] = _
-        simulation_results.append(proj)
-        
-    # Combine all iterations into one DataFrame
-    all_results = pd.concat(simulation_results, ignore_index=True)
+    import pandas as pd
+
+    # Apply random variation to the assumptions (drawn for all iterations up front):
+    noise = draw_noise(base_assumptions, iterations, noise_scales=NOISE_SCALES, sampler=sampler)
+
+    # Project every iteration at once: each line item is an (iterations, years) array
+    items = project_line_items_batch(baseline, noise, years=years)
+
+    # Flatten to the long table, iteration-major like stacked project_income_statement results
+    with phase('tabulation', iterations=iterations):
+        table = {'Year': np.tile(np.arange(2019, 2019 + years), iterations)}
+        for name in LINE_ITEMS:
+            table[name] = items[name].ravel()
+        table['Iteration'] = np.repeat(np.arange(iterations), years)
+        all_results = pd.DataFrame(table)
     return all_results
 
+def monte_carlo_simulation_streaming(baseline, base_assumptions, years=3, iterations=100000,
+                                     chunk_size=100000, bins=400, hist_range=None, rng=None, sampler=None):
+    """
+    Streaming version of the cumulative EBITDA simulation.
+    Paths are simulated 'chunk_size' at a time and folded into running accumulators
+    (Welford mean/variance, t-digest quantiles, fixed-bin histogram), so peak memory is
+    set by the chunk size rather than by 'iterations'.
+    
+    Returns:
+        A StreamingSummary; call .summary() for the table and read .histogram for the plot.
+    """
+    stats = StreamingSummary(bins=bins, hist_range=hist_range)
+    for size in shard_sizes(iterations, chunk_size):
+        EBITDA = monte_carlo_ebitda_paths(baseline, base_assumptions, years=years, iterations=size,
+                                          noise_scales=NOISE_SCALES, rng=rng, sampler=sampler)
+        stats.update(EBITDA.sum(axis=1))
+    return stats
+
+def monte_carlo_simulation_by_year_streaming(baseline, base_assumptions, iterations=100000, years=3,
+                                             chunk_size=100000, rng=None, sampler=None):
+    """
+    Streaming version of monte_carlo_simulation_by_year.
+    Keeps a running mean and variance per year for every line item instead of the long table.
+    
+    Returns:
+        A DataFrame with one row per Year holding the expected value of each metric
+        (the same table as results.groupby('Year').mean()).
+    """
+    import pandas as pd
+
+    moments = {name: RunningMoments() for name in LINE_ITEMS}
+    for size in shard_sizes(iterations, chunk_size):
+        params = draw_noise(base_assumptions, size, noise_scales=NOISE_SCALES, rng=rng, sampler=sampler)
+        items = project_line_items_batch(baseline, params, years=years)
+        for name, accumulator in moments.items():
+            accumulator.update(items[name])
+    
+    expected = {'Year': np.arange(2019, 2019 + years)}
+    for name, accumulator in moments.items():
+        expected[name] = accumulator.mean
+    return pd.DataFrame(expected)
+
+def monte_carlo_simulation_by_year_store(path, baseline, base_assumptions, iterations=100000, years=3,
+                                         chunk_size=100000, rng=None, sampler=None, overwrite=False):
+    """
+    Runs the year-by-year simulation into a memory-mapped store at 'path' instead of a long DataFrame.
+    Every line item of every path is kept, in an (iterations, years, items) array on disk;
+    an existing store at 'path' is only replaced with 'overwrite'.
+    
+    Returns:
+        A PathStore; store.mean_by_year() gives the groupby('Year').mean() table, and
+        PathStore.open(path) reopens the results later without re-running the simulation.
+    """
+    return simulate_to_store(path, baseline, base_assumptions, iterations=iterations, years=years,
+                             chunk_size=chunk_size, noise_scales=NOISE_SCALES, rng=rng, sampler=sampler,
+                             overwrite=overwrite)
+
 baseline_alt1 = {
     'Sales': None,  # Not used directly; we focus on unit_sales and avg_unit_price
     'COGS': None,   # We'll calculate Sales from unit_sales * avg_unit_price
@@ -84,11 +119,17 @@ assumptions_alt1 = {
     'sales_comm_rate': 0.05,       # 5% sales commissions
     'G_A_percent': 0.23            # G&A remains 23% of Sales
 }
-# Run the simulation with 10,000 iterations (returns a long DataFrame with year-by-year results)
-results = monte_carlo_simulation_by_year(baseline_2018, assumptions_gen, iterations=100000, years=3)
+def main(iterations=100000, years=3):
+    """
+    Runs the year-by-year simulation for the sample alternative and prints the expected metrics per year.
+    """
+    # Stream the simulation chunk by chunk: only the running mean per year and line item is kept,
+    # the same table as monte_carlo_simulation_by_year(...).groupby('Year').mean()
+    expected_metrics_by_year = monte_carlo_simulation_by_year_streaming(baseline_alt1, assumptions_alt1,
+                                                                        iterations=iterations, years=years)
 
-# To get the expected (mean) metrics for each specific year, group by Year and calculate the average.
-expected_metrics_by_year = results.groupby('Year').mean().reset_index()
+    print(f"Expected Metrics for Each Year (based on {iterations:,} iterations):")
+    print(expected_metrics_by_year[['Year', 'Sales', 'COGS', 'Gross_Profit', 'Sales_Commissions', 'G_and_A', 'EBITDA','unit_sales','avg_unit_price']])
 
-print("Expected Metrics for Each Year (based on 10,000 iterations):")
-print(expected_metrics_by_year[['Year', 'Sales', 'COGS', 'Gross_Profit', 'Sales_Commissions', 'G_and_A', 'EBITDA','unit_sales','avg_unit_price']])
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,134 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from projection_engine import analytic_moments, monte_carlo_ebitda_paths
+from streaming_stats import StreamingSummary
+
+# -------------------------------
+# 1. Shard Layout
+# (Shard boundaries depend only on iterations and shard_size, never on the number of workers,
+#  so every shard always gets the same generator and the merged output is bit-for-bit reproducible)
+# -------------------------------
+DEFAULT_SHARD_SIZE = 250000
+
+def shard_sizes(iterations, shard_size=DEFAULT_SHARD_SIZE):
+    """
+    Splits 'iterations' into consecutive shards of at most 'shard_size' paths.
+    Returns a list of shard lengths.
+    """
+    if shard_size <= 0:
+        raise ValueError("shard_size must be positive")
+    full, rest = divmod(iterations, shard_size)
+    return [shard_size] * full + ([rest] if rest else [])
+
+# -------------------------------
+# 2. Worker
+# -------------------------------
+def _run_shard(args):
+    """
+    Runs one shard with its own generator. Module-level so the process pool can pickle it.
+    With 'reduce' set to 'sum' the shard returns cumulative EBITDA per path; with a
+    (bins, hist_range, compression) tuple, a StreamingSummary of it, so only the summary
+    state travels back to the parent.
+    """
+    baseline, base_assumptions, years, size, seed_seq, noise_scales, reduce = args
+    rng = np.random.default_rng(seed_seq)
+    EBITDA = monte_carlo_ebitda_paths(baseline, base_assumptions, years=years, iterations=size,
+                                      noise_scales=noise_scales, rng=rng)
+    if reduce is None:
+        return EBITDA
+    if reduce == 'sum':
+        return EBITDA.sum(axis=1)
+    bins, hist_range, compression = reduce
+    stats = StreamingSummary(bins=bins, hist_range=hist_range, compression=compression)
+    stats.update(EBITDA.sum(axis=1))
+    return stats
+
+# -------------------------------
+# 3. Sharded Runner
+# -------------------------------
+def _run_shards(alternatives, years, iterations, seed, workers, shard_size, noise_scales, reduce):
+    """
+    Runs every shard of every alternative and returns the shard results grouped per alternative.
+    'reduce' is one value, or a dict with one value per alternative name.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    sizes = shard_sizes(iterations, shard_size)
+    root = np.random.SeedSequence(seed)
+
+    tasks = []
+    for (name, (baseline, assumptions)), alt_seq in zip(alternatives.items(), root.spawn(len(alternatives))):
+        alt_reduce = reduce[name] if isinstance(reduce, dict) else reduce
+        for size, shard_seq in zip(sizes, alt_seq.spawn(len(sizes))):
+            tasks.append((baseline, assumptions, years, size, shard_seq, noise_scales, alt_reduce))
+
+    if workers == 1 or len(tasks) == 1:
+        shards = [_run_shard(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            # map() yields in submission order, which keeps the merge deterministic.
+            shards = list(pool.map(_run_shard, tasks))
+    return {name: shards[k * len(sizes):(k + 1) * len(sizes)] for k, name in enumerate(alternatives)}
+
+def simulate_alternatives(alternatives, years=3, iterations=100000, seed=None,
+                          workers=None, shard_size=DEFAULT_SHARD_SIZE, noise_scales=None, cumulative=False):
+    """
+    Runs the Monte Carlo simulation for several alternatives on a process pool.
+
+    'alternatives' maps a name to a (baseline, assumptions) pair. Each alternative gets its own
+    child of SeedSequence(seed), and each of its shards a grandchild, so the result does not
+    depend on 'workers'. All shards of all alternatives share one pool.
+    Returns a dict of name -> (iterations, years) EBITDA matrix, in the order given; with
+    'cumulative' the workers sum over the years and only (iterations,) totals are returned.
+    """
+    shards = _run_shards(alternatives, years, iterations, seed, workers, shard_size, noise_scales,
+                         'sum' if cumulative else None)
+    empty = np.empty(0) if cumulative else np.empty((0, years))
+    return {name: np.concatenate(alt_shards, axis=0) if alt_shards else empty
+            for name, alt_shards in shards.items()}
+
+def summarize_alternatives(alternatives, years=3, iterations=100000, seed=None, workers=None,
+                           shard_size=DEFAULT_SHARD_SIZE, noise_scales=None, bins=400, hist_ranges=None,
+                           compression=1000):
+    """
+    Like simulate_alternatives, but every shard is reduced to a StreamingSummary of cumulative
+    EBITDA in its worker and the summaries are merged in shard order, so memory and inter-process
+    traffic no longer grow with 'iterations'.
+
+    Shard histograms must share their bin edges: 'hist_ranges' maps a name to a (low, high) range
+    and defaults to the analytic mean +/- 8 standard deviations (projection_engine.analytic_moments).
+    Returns a dict of name -> StreamingSummary.
+    """
+    if hist_ranges is None:
+        hist_ranges = {}
+    reduce = {}
+    for name, (baseline, assumptions) in alternatives.items():
+        hist_range = hist_ranges.get(name)
+        if hist_range is None:
+            moments = analytic_moments(baseline, assumptions, noise_scales=noise_scales, years=years, quantiles=())
+            hist_range = (moments['mean'] - 8 * moments['std'], moments['mean'] + 8 * moments['std'])
+        reduce[name] = (bins, hist_range, compression)
+
+    shards = _run_shards(alternatives, years, iterations, seed, workers, shard_size, noise_scales, reduce)
+    summaries = {}
+    for name, alt_shards in shards.items():
+        stats = StreamingSummary(bins=bins, hist_range=reduce[name][1], compression=compression)
+        for shard in alt_shards:
+            stats.merge(shard)
+        summaries[name] = stats
+    return summaries
+
+def monte_carlo_simulation_parallel(baseline, base_assumptions, years=3, iterations=100000, seed=None,
+                                    workers=None, shard_size=DEFAULT_SHARD_SIZE, noise_scales=None):
+    """
+    Sharded, multi-process version of monte_carlo_simulation for a single alternative.
+    Returns an array of cumulative EBITDA values over the projection period.
+    """
+    results = simulate_alternatives({'alt': (baseline, base_assumptions)}, years=years,
+                                    iterations=iterations, seed=seed, workers=workers,
+                                    shard_size=shard_size, noise_scales=noise_scales, cumulative=True)
+    return results['alt']
@@ -0,0 +1,115 @@
+import json
+import os
+
+import numpy as np
+
+from instrumentation import phase
+from parallel_runner import shard_sizes
+from projection_engine import LINE_ITEMS, draw_noise, project_line_items_batch
+
+# -------------------------------
+# 1. Memory-Mapped Store
+# (One .npy file of shape (iterations, years, items) plus a small JSON sidecar describing the axes)
+# -------------------------------
+class PathStore:
+    """
+    Year-by-year, per-line-item simulation paths kept in a memory-mapped .npy file.
+    Opening a store is lazy: nothing is read until an item or summary is requested.
+    """
+
+    def __init__(self, path, paths, items, base_year, metadata=None):
+        self.path = path
+        self.paths = paths
+        self.items = tuple(items)
+        self.base_year = base_year
+        self.metadata = metadata or {}
+
+    @staticmethod
+    def _sidecar(path):
+        return path + '.json'
+
+    @classmethod
+    def create(cls, path, iterations, years, items=LINE_ITEMS, dtype=np.float64, base_year=2018, metadata=None,
+               overwrite=False):
+        """
+        Preallocates a store on disk for 'iterations' paths over 'years'.
+        An existing store at 'path' is only replaced with 'overwrite'.
+        """
+        if not overwrite and (os.path.exists(path) or os.path.exists(cls._sidecar(path))):
+            raise FileExistsError(f"A path store already exists at {path}; pass overwrite=True to replace it")
+        paths = np.lib.format.open_memmap(path, mode='w+', dtype=dtype, shape=(iterations, years, len(items)))
+        header = {'items': list(items), 'base_year': base_year, 'metadata': metadata or {}}
+        with open(cls._sidecar(path), 'w') as f:
+            json.dump(header, f, indent=2, default=str)
+        return cls(path, paths, items, base_year, metadata)
+
+    @classmethod
+    def open(cls, path, mode='r'):
+        """
+        Opens an existing store read-only (or 'r+' to modify it) without loading it.
+        """
+        with open(cls._sidecar(path)) as f:
+            header = json.load(f)
+        paths = np.load(path, mmap_mode=mode)
+        return cls(path, paths, header['items'], header['base_year'], header.get('metadata'))
+
+    @property
+    def iterations(self):
+        return self.paths.shape[0]
+
+    @property
+    def years(self):
+        return self.paths.shape[1]
+
+    def item(self, name):
+        """
+        Returns an (iterations, years) view of one line item; no data is copied.
+        """
+        return self.paths[:, :, self.items.index(name)]
+
+    def flush(self):
+        if isinstance(self.paths, np.memmap):
+            self.paths.flush()
+
+    def mean_by_year(self, chunk_size=100000):
+        """
+        Expected value of every line item per Year, the same table as
+        results.groupby('Year').mean(), read from the store in chunks of 'chunk_size' paths.
+        """
+        import pandas as pd
+
+        total = np.zeros(self.paths.shape[1:])
+        for start in range(0, self.iterations, chunk_size):
+            total += self.paths[start:start + chunk_size].sum(axis=0)
+        means = total / self.iterations
+
+        table = {'Year': np.arange(self.base_year + 1, self.base_year + 1 + self.years)}
+        for k, name in enumerate(self.items):
+            table[name] = means[:, k]
+        return pd.DataFrame(table)
+
+# -------------------------------
+# 2. Simulate Straight into a Store
+# -------------------------------
+def simulate_to_store(path, baseline, base_assumptions, iterations=100000, years=3, chunk_size=100000,
+                      noise_scales=None, rng=None, sampler=None, dtype=np.float64, overwrite=False):
+    """
+    Runs the year-by-year simulation chunk by chunk, writing every line item of every path
+    into a preallocated PathStore at 'path' (replacing an existing one only with 'overwrite').
+    Peak memory is set by 'chunk_size'.
+    Returns the PathStore.
+    """
+    store = PathStore.create(path, iterations, years, dtype=dtype, overwrite=overwrite, metadata={
+        'baseline': baseline, 'assumptions': base_assumptions, 'noise_scales': noise_scales
+    })
+    start = 0
+    for size in shard_sizes(iterations, chunk_size):
+        params = draw_noise(base_assumptions, size, noise_scales=noise_scales, rng=rng, sampler=sampler)
+        items = project_line_items_batch(baseline, params, years=years)
+        with phase('io', op='store_write', paths=size):
+            block = store.paths[start:start + size]
+            for k, name in enumerate(store.items):
+                block[:, :, k] = items[name]
+        start += size
+    store.flush()
+    return store
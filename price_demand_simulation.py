@@ -1,12 +1,7 @@
 import numpy as np
-import matplotlib.pyplot as plt
 
-# ------- Demand Model -------
-def predicted_demand(Q0, P0, P, elasticity):
-    """
-    Q = Q0 * (P0 / P)^elasticity
-    """
-    return Q0 * (P0 / P)**(elasticity)
+from demand import predicted_demand
+from price_optimizer import optimal_price
 
 # ------- ALTERNATIVE 1: Titaluk Premium -------
 Q0_titaluk = 7000         # baseline units
@@ -19,11 +14,10 @@ demand_titaluk = predicted_demand(Q0_titaluk, P0_titaluk, price_range_titaluk, e
 # Revenue for each price point is Price * Demand
 revenue_titaluk = price_range_titaluk * demand_titaluk
 
-# Find optimum for Alternative 1 (maximizing revenue)
-opt_idx_titaluk = np.argmax(revenue_titaluk)
-opt_price_titaluk = price_range_titaluk[opt_idx_titaluk]
-opt_revenue_titaluk = revenue_titaluk[opt_idx_titaluk]
-opt_quantity_titaluk = demand_titaluk[opt_idx_titaluk]
+# Find exact optimum for Alternative 1 (maximizing revenue, closed form clipped to the price range)
+opt_price_titaluk, opt_quantity_titaluk = optimal_price(Q0_titaluk, P0_titaluk, elasticity_titaluk,
+                                                        bounds=(price_range_titaluk[0], price_range_titaluk[-1]))
+opt_revenue_titaluk = opt_price_titaluk * opt_quantity_titaluk
 
 # ------- ALTERNATIVE 2: Walmart Rods -------
 Q0_walmart = 72000         # baseline units
@@ -36,10 +30,9 @@ demand_walmart = predicted_demand(Q0_walmart, P0_walmart, price_range_walmart, e
 revenue_walmart = price_range_walmart * demand_walmart
 
 # Find optimum for Alternative 2
-opt_idx_walmart = np.argmax(revenue_walmart)
-opt_price_walmart = price_range_walmart[opt_idx_walmart]
-opt_revenue_walmart = revenue_walmart[opt_idx_walmart]
-opt_quantity_walmart = demand_walmart[opt_idx_walmart]
+opt_price_walmart, opt_quantity_walmart = optimal_price(Q0_walmart, P0_walmart, elasticity_walmart,
+                                                        bounds=(price_range_walmart[0], price_range_walmart[-1]))
+opt_revenue_walmart = opt_price_walmart * opt_quantity_walmart
 
 # ------- ALTERNATIVE 3: Direct Expansion (Occasional) -------
 Q0_occasional = 101000 * 0.20   # about 20,000 units (baseline)
@@ -52,43 +45,50 @@ demand_occasional = predicted_demand(Q0_occasional, P0_occasional, price_range_o
 revenue_occasional = price_range_occasional * demand_occasional
 
 # Find optimum for Alternative 3
-opt_idx_occasional = np.argmax(revenue_occasional)
-opt_price_occasional = price_range_occasional[opt_idx_occasional]
-opt_revenue_occasional = revenue_occasional[opt_idx_occasional]
-opt_quantity_occasional = demand_occasional[opt_idx_occasional]
-
-# ------- CREATE SUBPLOTS -------
-fig, axs = plt.subplots(1, 3, figsize=(18, 6), sharey=False)
-
-# --- Plot Alt 1 (Titaluk) ---
-axs[0].plot(price_range_titaluk, revenue_titaluk, color='blue', label="Titaluk Revenue")
-axs[0].axvline(opt_price_titaluk, color='blue', linestyle='--',
-               label=f"Opt.Price=${opt_price_titaluk:.2f}")
-axs[0].set_title("Alt 1: Titaluk Premium")
-axs[0].set_xlabel("Price ($)")
-axs[0].set_ylabel("Revenue ($)")
-axs[0].grid(True)
-axs[0].legend()
-
-# --- Plot Alt 2 (Walmart) ---
-axs[1].plot(price_range_walmart, revenue_walmart, color='orange', label="Walmart Revenue")
-axs[1].axvline(opt_price_walmart, color='orange', linestyle='--',
-               label=f"Opt.Price=${opt_price_walmart:.2f}")
-axs[1].set_title("Alt 2: Walmart Rods")
-axs[1].set_xlabel("Price ($)")
-axs[1].grid(True)
-axs[1].legend()
-
-# --- Plot Alt 3 (Occasional) ---
-axs[2].plot(price_range_occasional, revenue_occasional, color='green', label="Direct Sales Revenue")
-axs[2].axvline(opt_price_occasional, color='green', linestyle='--',
-               label=f"Opt.Price=${opt_price_occasional:.2f}")
-axs[2].set_title("Alt 3: Direct Expansion")
-axs[2].set_xlabel("Price ($)")
-axs[2].grid(True)
-axs[2].legend()
-
-plt.tight_layout()
-plt.show()
-
-# Print optimum values along with optimal quantity and
+opt_price_occasional, opt_quantity_occasional = optimal_price(Q0_occasional, P0_occasional, elasticity_occasional,
+                                                              bounds=(price_range_occasional[0], price_range_occasional[-1]))
+opt_revenue_occasional = opt_price_occasional * opt_quantity_occasional
+
+def main(show=True):
+    """
+    Plots the revenue curve and optimal price of each alternative.
+    """
+    import matplotlib.pyplot as plt
+
+    # ------- CREATE SUBPLOTS -------
+    fig, axs = plt.subplots(1, 3, figsize=(18, 6), sharey=False)
+
+    # --- Plot Alt 1 (Titaluk) ---
+    axs[0].plot(price_range_titaluk, revenue_titaluk, color='blue', label="Titaluk Revenue")
+    axs[0].axvline(opt_price_titaluk, color='blue', linestyle='--',
+                   label=f"Opt.Price=${opt_price_titaluk:.2f}")
+    axs[0].set_title("Alt 1: Titaluk Premium")
+    axs[0].set_xlabel("Price ($)")
+    axs[0].set_ylabel("Revenue ($)")
+    axs[0].grid(True)
+    axs[0].legend()
+
+    # --- Plot Alt 2 (Walmart) ---
+    axs[1].plot(price_range_walmart, revenue_walmart, color='orange', label="Walmart Revenue")
+    axs[1].axvline(opt_price_walmart, color='orange', linestyle='--',
+                   label=f"Opt.Price=${opt_price_walmart:.2f}")
+    axs[1].set_title("Alt 2: Walmart Rods")
+    axs[1].set_xlabel("Price ($)")
+    axs[1].grid(True)
+    axs[1].legend()
+
+    # --- Plot Alt 3 (Occasional) ---
+    axs[2].plot(price_range_occasional, revenue_occasional, color='green', label="Direct Sales Revenue")
+    axs[2].axvline(opt_price_occasional, color='green', linestyle='--',
+                   label=f"Opt.Price=${opt_price_occasional:.2f}")
+    axs[2].set_title("Alt 3: Direct Expansion")
+    axs[2].set_xlabel("Price ($)")
+    axs[2].grid(True)
+    axs[2].legend()
+
+    plt.tight_layout()
+    if show:
+        plt.show()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,180 @@
+import numpy as np
+
+from calibration import ELASTICITY_FLOOR
+from instrumentation import phase
+from price_optimizer import constant_elasticity_optimum, golden_section_maximize
+from projection_engine import draw_noise, project_ebitda_batch
+
+# -------------------------------
+# 1. Per-Path Market Draws
+# ('market' describes the demand curve of one alternative:
+#    Q0, P0:           units sold at the reference price P0 (Q = Q0 * (P0 / P)^elasticity)
+#    elasticity:       mean elasticity, with 'elasticity_std' (default 0) spread across paths
+#    unit_cost:        cost per unit at P0 (default COGS_percent * P0), 'unit_cost_std' relative spread
+#    price_bounds:     (lowest, highest) price the alternative may charge)
+# -------------------------------
+def draw_market_paths(market, base_assumptions, iterations, noise_scales=None, rng=None, sampler=None,
+                      drivers=None, elasticities=None):
+    """
+    Draws the noisy assumptions of every path (see projection_engine.draw_noise) plus a demand
+    elasticity and a unit cost per path. 'elasticities' replaces the normal elasticity draws with
+    resampled samples, e.g. from calibration.posterior_elasticity. Either way elasticities are
+    clipped to calibration.ELASTICITY_FLOOR, so a few wrong-signed draws (demand rising with
+    price) cannot drag the robust price to the upper bound. The unit cost moves with the path's
+    COGS_percent noise and, with 'unit_cost_std', by an extra relative shock.
+    Returns the params dict with 'elasticity' and 'unit_cost' arrays added.
+    """
+    if rng is None:
+        rng = np.random
+    params = draw_noise(base_assumptions, iterations, noise_scales=noise_scales, rng=rng, sampler=sampler,
+                        drivers=drivers)
+
+    if elasticities is not None:
+        elasticities = np.asarray(elasticities, dtype=float)
+        params['elasticity'] = np.maximum(
+            ELASTICITY_FLOOR, elasticities[(rng.random(iterations) * elasticities.size).astype(np.int64)])
+    else:
+        params['elasticity'] = np.maximum(
+            ELASTICITY_FLOOR, market['elasticity'] + market.get('elasticity_std', 0.0) * rng.standard_normal(iterations))
+
+    base_COGS = base_assumptions['COGS_percent']
+    unit_cost = market.get('unit_cost', base_COGS * market['P0'])
+    params['unit_cost'] = unit_cost * params['COGS_percent'] / base_COGS
+    if market.get('unit_cost_std'):
+        params['unit_cost'] = params['unit_cost'] * np.maximum(
+            0.0, 1 + market['unit_cost_std'] * rng.standard_normal(iterations))
+    return params
+
+# -------------------------------
+# 2. EBITDA as a Function of Price
+# (With the price set in year 0 and both units and price growing afterwards, year t EBITDA is
+#  Q(P) * ((1 + g_units) * (1 + g_price))^t * (P * (1 - comm - G&A) - unit_cost), so cumulative
+#  EBITDA is Q(P) * (P * (1 - comm - G&A) - unit_cost) times a price-free growth factor)
+# -------------------------------
+def _growth_factor(params, years):
+    step = ((1 + np.asarray(params['unit_sales_growth'], dtype=float))
+            * (1 + np.asarray(params['price_growth'], dtype=float)))
+    return sum(step ** t for t in range(1, years + 1))
+
+def _variable_share(params):
+    return np.asarray(params['sales_comm_rate'], dtype=float) + np.asarray(params['G_A_percent'], dtype=float)
+
+def cumulative_ebitda_at_prices(market, params, prices, years=3):
+    """
+    Cumulative EBITDA of every path at every price in 'prices' (shape (n_prices,)), without
+    rolling the years forward. Returns an (iterations, n_prices) matrix.
+    """
+    prices = np.asarray(prices, dtype=float)
+    elasticity = np.asarray(params['elasticity'], dtype=float)[..., None]
+    unit_cost = np.asarray(params['unit_cost'], dtype=float)[..., None]
+    margin_share = 1 - _variable_share(params)[..., None]
+    units = market['Q0'] * (market['P0'] / prices) ** elasticity
+    return units * (prices * margin_share - unit_cost) * _growth_factor(params, years)[..., None]
+
+def project_ebitda_priced(market, params, prices, years=3):
+    """
+    Year-by-year EBITDA of every path when path i charges prices[i] in year 0 (a scalar charges
+    every path the same price). Runs project_ebitda_batch on the implied units and COGS share.
+    Returns an EBITDA matrix of shape (iterations, years).
+    """
+    prices = np.asarray(prices, dtype=float)
+    baseline = {'unit_sales': market['Q0'] * (market['P0'] / prices) ** params['elasticity'],
+                'avg_unit_price': prices}
+    priced = dict(params)
+    priced['COGS_percent'] = params['unit_cost'] / prices
+    return project_ebitda_batch(baseline, priced, years=years)
+
+# -------------------------------
+# 3. Per-Path and Robust Prices
+# -------------------------------
+DEFAULT_TILE_ELEMENTS = 2 ** 22   # ~32 MB of float64 per (paths x prices) tile
+
+def path_optimal_prices(market, params):
+    """
+    The profit-maximizing price of every path, knowing its elasticity and costs (closed-form
+    markup over unit cost, clipped to market['price_bounds']).
+    """
+    return constant_elasticity_optimum(params['elasticity'], unit_cost=params['unit_cost'],
+                                       commission=_variable_share(params), bounds=market['price_bounds'])
+
+def _objective(values, risk_aversion, alpha):
+    """
+    (1 - risk_aversion) * mean + risk_aversion * CVaR_alpha of every column of 'values'
+    (paths down the rows), where CVaR_alpha is the mean of the worst 'alpha' share of paths.
+    """
+    score = values.mean(axis=0)
+    if risk_aversion:
+        tail = max(1, int(np.ceil(alpha * values.shape[0])))
+        worst = np.partition(values, tail - 1, axis=0)[:tail]
+        score = (1 - risk_aversion) * score + risk_aversion * worst.mean(axis=0)
+    return score
+
+def robust_price(market, params, years=3, risk_aversion=0.0, alpha=0.05, grid_size=200, refine=True,
+                 tile_elements=DEFAULT_TILE_ELEMENTS):
+    """
+    The single price, set before the uncertainty resolves, that maximizes
+    (1 - risk_aversion) * E[cumulative EBITDA] + risk_aversion * CVaR_alpha[cumulative EBITDA]
+    over all paths. risk_aversion=0 is plain expected EBITDA.
+
+    The objective is evaluated on 'grid_size' prices across market['price_bounds'] in column tiles
+    of at most 'tile_elements' (paths x prices) cells; with 'refine' a golden-section search then
+    polishes the best grid price between its neighbours.
+    Returns (price, objective value, grid prices, grid objective values).
+    """
+    lower, upper = market['price_bounds']
+    grid = np.linspace(lower, upper, grid_size)
+    n = np.size(params['elasticity'])
+    columns = max(1, tile_elements // max(1, n))
+
+    with phase('optimization', paths=n, prices=grid_size):
+        scores = np.concatenate([
+            _objective(cumulative_ebitda_at_prices(market, params, grid[start:start + columns], years=years),
+                       risk_aversion, alpha)
+            for start in range(0, grid_size, columns)
+        ])
+        best = int(np.argmax(scores))
+        price, score = grid[best], scores[best]
+        if refine and grid_size > 1:
+            def objective_at(p):
+                return _objective(cumulative_ebitda_at_prices(market, params, np.atleast_1d(p), years=years),
+                                  risk_aversion, alpha).reshape(np.shape(p))
+
+            candidate = golden_section_maximize(objective_at, grid[max(best - 1, 0)],
+                                                grid[min(best + 1, grid_size - 1)], tol=1e-4)
+            candidate_score = objective_at(candidate)
+            if candidate_score > score:
+                price, score = float(candidate), float(candidate_score)
+    return float(price), float(score), grid, scores
+
+# -------------------------------
+# 4. Price Optimization Inside the Monte Carlo
+# -------------------------------
+def optimize_price_monte_carlo(market, base_assumptions, years=3, iterations=100000, risk_aversion=0.0,
+                               alpha=0.05, grid_size=200, noise_scales=None, rng=None, sampler=None,
+                               drivers=None, elasticities=None):
+    """
+    Samples elasticity, unit cost and the other assumptions per path, then prices two ways:
+
+      per path: each path charges its own optimal price (the value of knowing the market in advance)
+      robust:   every path charges the one price that maximizes expected (or CVaR-adjusted) EBITDA
+
+    Returns a dict with the per-path 'optimal_prices' and 'optimal_EBITDA' (iterations, years),
+    the 'robust_price', its 'robust_EBITDA' (iterations, years) and 'robust_objective', the
+    'grid' / 'grid_objective' the robust price was picked from, and the drawn 'params'.
+    """
+    params = draw_market_paths(market, base_assumptions, iterations, noise_scales=noise_scales, rng=rng,
+                               sampler=sampler, drivers=drivers, elasticities=elasticities)
+    with phase('optimization', paths=iterations):
+        optimal_prices = path_optimal_prices(market, params)
+    price, score, grid, scores = robust_price(market, params, years=years, risk_aversion=risk_aversion,
+                                              alpha=alpha, grid_size=grid_size)
+    return {
+        'optimal_prices': optimal_prices,
+        'optimal_EBITDA': project_ebitda_priced(market, params, optimal_prices, years=years),
+        'robust_price': price,
+        'robust_objective': score,
+        'robust_EBITDA': project_ebitda_priced(market, params, price, years=years),
+        'grid': grid,
+        'grid_objective': scores,
+        'params': params
+    }
@@ -0,0 +1,165 @@
+import numpy as np
+
+# -------------------------------
+# 1. Batched Grid Optimizer
+# (Elasticity samples run down the rows, candidate prices across the columns)
+# -------------------------------
+DEFAULT_TILE_ELEMENTS = 2 ** 22   # ~32 MB of float64 per tile
+
+def _upper_envelope(slopes, intercepts):
+    """
+    Upper envelope of the lines intercept + slope * e (convex hull trick).
+    Returns the indices of the lines on the envelope, in increasing slope, and the
+    breakpoints between consecutive envelope lines.
+    """
+    hull = []
+    for j in np.argsort(slopes, kind='stable'):
+        if not np.isfinite(intercepts[j]):
+            continue
+        if hull and slopes[hull[-1]] == slopes[j]:
+            if intercepts[j] <= intercepts[hull[-1]]:
+                continue
+            hull.pop()
+        while len(hull) >= 2:
+            l1, l2 = hull[-2], hull[-1]
+            # l2 is never on top if l1 and j cross before l1 and l2 do.
+            x12 = (intercepts[l1] - intercepts[l2]) / (slopes[l2] - slopes[l1])
+            x1j = (intercepts[l1] - intercepts[j]) / (slopes[j] - slopes[l1])
+            if x1j > x12:
+                break
+            hull.pop()
+        hull.append(j)
+
+    hull = np.array(hull, dtype=np.int64)
+    breaks = (intercepts[hull[:-1]] - intercepts[hull[1:]]) / (slopes[hull[1:]] - slopes[hull[:-1]])
+    return hull, breaks
+
+def optimal_prices_grid(Q0, P0, price_range, elasticities, unit_cost=0.0, commission=0.0,
+                        method='envelope', tile_elements=DEFAULT_TILE_ELEMENTS):
+    """
+    Finds the profit-maximizing price on 'price_range' for every elasticity sample at once.
+
+    Profit at price P is (P * (1 - commission) - unit_cost) * Q0 * (P0 / P)^elasticity; with the
+    defaults it is plain revenue. In log form this is log(margin_P) + elasticity * log(P0 / P),
+    a line in the elasticity for every grid price, so:
+
+      method='tiles':    broadcasts an (n_samples, 1) elasticity column against the (1, n_prices)
+                         grid in row tiles of at most 'tile_elements' cells and takes the argmax.
+      method='envelope': builds the upper envelope of those lines once and looks every sample up
+                         with searchsorted, O(n_samples * log(n_prices)) and no price-grid matrix.
+
+    Both return the same grid point up to floating point ties.
+    Returns (optimal_prices, optimal_quantities), each of shape (n_samples,).
+    """
+    price_range = np.asarray(price_range, dtype=float)
+    elasticities = np.asarray(elasticities, dtype=float).ravel()
+
+    margin = price_range * (1 - commission) - unit_cost
+    with np.errstate(divide='ignore'):
+        log_margin = np.where(margin > 0, np.log(np.where(margin > 0, margin, 1.0)), -np.inf)
+    log_ratio = np.log(P0 / price_range)
+
+    if method == 'envelope':
+        hull, breaks = _upper_envelope(log_ratio, log_margin)
+        if hull.size == 0:
+            # No price covers unit cost; fall back to the first grid point, as argmax would.
+            hull = np.zeros(1, dtype=np.int64)
+        # side='right' resolves an exact tie toward the higher slope (lower price), like argmax.
+        best = hull[np.searchsorted(breaks, elasticities, side='right')]
+    elif method == 'tiles':
+        best = np.empty(elasticities.size, dtype=np.int64)
+        rows = max(1, tile_elements // max(1, price_range.size))
+        tile = np.empty((min(rows, elasticities.size), price_range.size))
+        for start in range(0, elasticities.size, rows):
+            e = elasticities[start:start + rows, None]
+            out = tile[:len(e)]
+            np.multiply(e, log_ratio, out=out)
+            out += log_margin
+            best[start:start + rows] = np.argmax(out, axis=1)
+    else:
+        raise ValueError(f"Unknown method: {method!r}")
+
+    optimal_prices = price_range[best]
+    optimal_quantities = Q0 * (P0 / optimal_prices) ** elasticities
+    return optimal_prices, optimal_quantities
+
+# -------------------------------
+# 2. Continuous Optimum
+# (Exact closed form for constant-elasticity demand, golden-section search for anything else)
+# -------------------------------
+INV_PHI = (np.sqrt(5) - 1) / 2
+
+def constant_elasticity_optimum(elasticity, unit_cost=0.0, commission=0.0, bounds=(0.0, np.inf)):
+    """
+    Profit-maximizing price for Q = Q0 * (P0 / P)^elasticity with a linear unit cost.
+
+    Setting d/dP log[(P * (1 - commission) - unit_cost) * P^-elasticity] = 0 gives
+        P* = elasticity / (elasticity - 1) * unit_cost / (1 - commission),
+    the usual markup over effective unit cost. Log profit is unimodal in P, so clipping to
+    'bounds' gives the constrained optimum; for elasticity <= 1 profit rises with price and
+    the upper bound wins. Works element-wise on arrays of scenarios.
+    Raises ValueError when the optimum is unbounded: an infinite price (elasticity <= 1 with no
+    finite upper bound) or a zero price (no unit cost and a lower bound of 0).
+    """
+    elasticity = np.asarray(elasticity, dtype=float)
+    lower, upper = bounds
+    effective_cost = np.asarray(unit_cost, dtype=float) / (1 - np.asarray(commission, dtype=float))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        markup_price = elasticity / (elasticity - 1) * effective_cost
+    prices = np.where(elasticity > 1, np.clip(markup_price, lower, upper), upper)
+    if not np.all(np.isfinite(prices)):
+        raise ValueError("Unbounded optimum: profit keeps rising with price (elasticity <= 1); "
+                         "give a finite upper price bound")
+    if not np.all(prices > 0):
+        raise ValueError("Unbounded optimum: with no unit cost the best price is 0 and demand is infinite; "
+                         "give a unit cost or a positive lower price bound")
+    return prices
+
+def golden_section_maximize(profit, lower, upper, tol=1e-6, max_iter=200):
+    """
+    Maximizes a unimodal 'profit' on [lower, upper] for many scenarios at once.
+    'profit' takes an array of prices (one per scenario) and returns an array of profits;
+    'lower' and 'upper' are scalars or arrays of the same shape. Every scenario takes the same
+    number of steps, so the whole search is array operations.
+    Returns the array of maximizing prices.
+    """
+    a, b = np.broadcast_arrays(np.asarray(lower, dtype=float), np.asarray(upper, dtype=float))
+    a, b = a.copy(), b.copy()
+
+    width = np.max(b - a) if a.size else 0.0
+    steps = int(np.ceil(np.log(tol / width) / np.log(INV_PHI))) if width > tol else 0
+    steps = min(steps, max_iter)
+
+    c = b - INV_PHI * (b - a)
+    d = a + INV_PHI * (b - a)
+    fc, fd = profit(c), profit(d)
+    for _ in range(steps):
+        left = fc > fd   # maximum lies in [a, d]
+        b = np.where(left, d, b)
+        a = np.where(left, a, c)
+        # The surviving interior point is reused; only one new evaluation per step.
+        new_point = np.where(left, b - INV_PHI * (b - a), a + INV_PHI * (b - a))
+        f_new = profit(new_point)
+        c, d, fc, fd = (np.where(left, new_point, d), np.where(left, c, new_point),
+                        np.where(left, f_new, fd), np.where(left, fc, f_new))
+    return (a + b) / 2
+
+def optimal_price(Q0, P0, elasticity, unit_cost=0.0, commission=0.0, bounds=(0.0, np.inf),
+                  profit=None, tol=1e-6):
+    """
+    Exact profit-maximizing price (and quantity) per scenario.
+
+    With the default model, profit = (P * (1 - commission) - unit_cost) * Q0 * (P0 / P)^elasticity,
+    the closed form is used. Pass 'profit(P)' (vectorized over scenarios) for any other model;
+    it is then maximized by golden-section search within finite 'bounds'.
+    Raises ValueError when the optimum is unbounded (see constant_elasticity_optimum).
+    Returns (optimal_prices, optimal_quantities).
+    """
+    if profit is None:
+        prices = constant_elasticity_optimum(elasticity, unit_cost, commission, bounds)
+    else:
+        if not np.all(np.isfinite(bounds)):
+            raise ValueError("Golden-section search needs finite price bounds")
+        prices = golden_section_maximize(profit, bounds[0], bounds[1], tol=tol)
+    quantities = Q0 * (P0 / prices) ** np.asarray(elasticity, dtype=float)
+    return prices, quantities
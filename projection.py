@@ -0,0 +1,106 @@
+import numpy as np
+
+from instrumentation import phase
+from projection_engine import LINE_ITEMS
+
+# -------------------------------
+# 1. Compact Projection Result
+# (One preallocated NumPy column per line item; pandas is only touched in to_frame())
+# -------------------------------
+class ProjectedIncomeStatement:
+    """
+    Year-by-year income statement projection stored as one array per line item.
+    Index it like the old DataFrame (proj['EBITDA']) or call to_frame() for a table.
+    """
+
+    __slots__ = ('Year',) + LINE_ITEMS
+
+    def __init__(self, years):
+        self.Year = np.empty(years, dtype=np.int64)
+        for name in LINE_ITEMS:
+            setattr(self, name, np.empty(years))
+
+    def __len__(self):
+        return len(self.Year)
+
+    def __getitem__(self, name):
+        return getattr(self, name)
+
+    def to_frame(self):
+        """
+        Builds the DataFrame the projection functions used to return.
+        """
+        import pandas as pd
+        return pd.DataFrame({name: getattr(self, name) for name in self.__slots__})
+
+# -------------------------------
+# 2. Projection Function
+# -------------------------------
+def _rate(assumptions, key, last_item, last_sales):
+    """
+    Uses the assumed rate if given, otherwise carries last year's ratio to Sales forward.
+    """
+    if key in assumptions:
+        return assumptions[key]
+    if last_item is None or not last_sales:
+        return 0
+    return last_item / last_sales
+
+def project_income_statement(baseline, assumptions, years=3, base_year=2018):
+    """
+    Projects an income statement over a given number of years.
+    Grows unit_sales and avg_unit_price when the baseline has them, otherwise grows Sales
+    by 'sales_growth'. Expense ratios missing from 'assumptions' carry forward from the
+    prior year (or are zero if the baseline has no such line item).
+    Returns a ProjectedIncomeStatement.
+    """
+    proj = ProjectedIncomeStatement(years)
+
+    by_units = 'unit_sales' in baseline and 'avg_unit_price' in baseline
+    unit_sales_growth = assumptions.get('unit_sales_growth', assumptions.get('sales_growth', 0))
+    price_growth = assumptions.get('price_growth', 0)
+
+    unit_sales = baseline.get('unit_sales')
+    avg_unit_price = baseline.get('avg_unit_price')
+    sales = baseline.get('Sales')
+    COGS = baseline.get('COGS')
+    commissions = baseline.get('Sales_Commissions')
+    G_and_A = baseline.get('G_and_A')
+
+    for i in range(years):
+        if by_units:
+            unit_sales = unit_sales * (1 + unit_sales_growth)
+            avg_unit_price = avg_unit_price * (1 + price_growth)
+            new_sales = unit_sales * avg_unit_price
+        else:
+            new_sales = sales * (1 + assumptions['sales_growth'])
+
+        COGS = new_sales * _rate(assumptions, 'COGS_percent', COGS, sales)
+        commissions = new_sales * _rate(assumptions, 'sales_comm_rate', commissions, sales)
+        G_and_A = new_sales * _rate(assumptions, 'G_A_percent', G_and_A, sales)
+        sales = new_sales
+        gross_profit = sales - COGS
+
+        proj.Year[i] = base_year + i + 1
+        proj.unit_sales[i] = unit_sales if by_units else np.nan
+        proj.avg_unit_price[i] = avg_unit_price if by_units else np.nan
+        proj.Sales[i] = sales
+        proj.COGS[i] = COGS
+        proj.Gross_Profit[i] = gross_profit
+        proj.Sales_Commissions[i] = commissions
+        proj.G_and_A[i] = G_and_A
+        proj.EBITDA[i] = gross_profit - commissions - G_and_A
+
+    return proj
+
+def stack_projections(projections):
+    """
+    Stacks a list of projections into one long DataFrame with an 'Iteration' column,
+    building the frame once instead of concatenating one DataFrame per iteration.
+    """
+    import pandas as pd
+    with phase('tabulation', projections=len(projections)):
+        columns = ProjectedIncomeStatement.__slots__
+        table = {name: np.concatenate([p[name] for p in projections]) for name in columns}
+        table['Iteration'] = np.repeat(np.arange(len(projections)), [len(p) for p in projections])
+        return pd.DataFrame(table)
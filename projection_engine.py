@@ -0,0 +1,286 @@
+from math import comb
+from statistics import NormalDist
+
+import numpy as np
+
+from instrumentation import count, phase
+from samplers import get_sampler
+
+# Bump whenever a change alters the simulated paths, so cached results are not reused.
+ENGINE_VERSION = '1'
+
+# -------------------------------
+# 1. Noise Parameters
+# (Same order the Monte Carlo loops draw them in, so a seeded run lines up draw for draw)
+# -------------------------------
+NOISE_PARAMETERS = (
+    'sales_growth',
+    'unit_sales_growth',
+    'price_growth',
+    'COGS_percent',
+    'sales_comm_rate',
+    'G_A_percent'
+)
+
+DEFAULT_NOISE_SCALES = {
+    'sales_growth': 0.01,
+    'unit_sales_growth': 0.01,
+    'price_growth': 0.01,
+    'COGS_percent': 0.01,
+    'sales_comm_rate': 0.005,
+    'G_A_percent': 0.01
+}
+
+# -------------------------------
+# 2. Batch Sampling of the Noisy Assumptions
+# -------------------------------
+def noise_from_normals(base_assumptions, z, noise_scales=None):
+    """
+    Turns an (iterations, k) block of standard normals into noisy assumption parameters,
+    column k feeding NOISE_PARAMETERS[k]. Sharing 'z' across alternatives gives common random numbers.
+    Returns a dict of arrays of shape (iterations,), one per noise parameter.
+    """
+    if noise_scales is None:
+        noise_scales = DEFAULT_NOISE_SCALES
+    return {
+        name: base_assumptions[name] + noise_scales[name] * z[:, k]
+        for k, name in enumerate(NOISE_PARAMETERS)
+    }
+
+def draw_noise(base_assumptions, iterations, noise_scales=None, rng=None, sampler=None, drivers=None):
+    """
+    Draws all noisy assumption parameters for every iteration in one call.
+    Uses the global np.random state unless a Generator/RandomState is passed as 'rng'.
+    'sampler' picks how the normals are drawn ('pseudo', 'antithetic', 'lhs', 'sobol'; see samplers.py).
+    'drivers' (a drivers.DriverModel) correlates the draws and shapes their marginals.
+    Returns a dict of arrays of shape (iterations,), one per noise parameter.
+    """
+    # With the default sampler, one (iterations, k) block of standard normals, row-major, matches
+    # the order of the per-iteration scalar draws in the original loop.
+    with phase('sampling', iterations=iterations):
+        z = get_sampler(sampler)(iterations, len(NOISE_PARAMETERS), rng)
+        if drivers is not None:
+            return drivers.noise_from_normals(base_assumptions, z, noise_scales)
+        return noise_from_normals(base_assumptions, z, noise_scales)
+
+# -------------------------------
+# 3. Vectorized Projection
+# -------------------------------
+LINE_ITEMS = (
+    'unit_sales',
+    'avg_unit_price',
+    'Sales',
+    'COGS',
+    'Gross_Profit',
+    'Sales_Commissions',
+    'G_and_A',
+    'EBITDA'
+)
+
+def _batch_rates(params):
+    """
+    Reads the growth and cost rates out of 'params' as float arrays.
+    Returns the rates and the broadcast path shape.
+    """
+    rates = tuple(
+        np.asarray(params.get(name, 0), dtype=float)
+        for name in ('unit_sales_growth', 'price_growth', 'COGS_percent', 'sales_comm_rate', 'G_A_percent')
+    )
+    return rates, np.broadcast(*rates).shape
+
+def project_ebitda_batch(baseline, params, years=3):
+    """
+    Rolls unit_sales and avg_unit_price forward for every path at once.
+    'params' holds scalars or arrays of shape (iterations,) for each assumption.
+    Returns an EBITDA matrix of shape (iterations, years).
+    """
+    (unit_sales_growth, price_growth, COGS_percent, sales_comm_rate, G_A_percent), shape = _batch_rates(params)
+    EBITDA = np.empty(shape + (years,))
+
+    with phase('projection', years=years):
+        unit_sales = baseline['unit_sales']
+        avg_unit_price = baseline['avg_unit_price']
+        for i in range(years):
+            # Same operation order as project_income_statement, so results agree to the last bit.
+            unit_sales = unit_sales * (1 + unit_sales_growth)
+            avg_unit_price = avg_unit_price * (1 + price_growth)
+            sales = unit_sales * avg_unit_price
+            gross_profit = sales - sales * COGS_percent
+            EBITDA[..., i] = gross_profit - sales * sales_comm_rate - sales * G_A_percent
+
+    return EBITDA
+
+def project_line_items_batch(baseline, params, years=3):
+    """
+    Like project_ebitda_batch, but keeps every income statement line item.
+    Returns a dict of LINE_ITEMS -> array of shape (iterations, years).
+    """
+    (unit_sales_growth, price_growth, COGS_percent, sales_comm_rate, G_A_percent), shape = _batch_rates(params)
+    items = {name: np.empty(shape + (years,)) for name in LINE_ITEMS}
+
+    with phase('projection', years=years):
+        unit_sales = baseline['unit_sales']
+        avg_unit_price = baseline['avg_unit_price']
+        for i in range(years):
+            unit_sales = unit_sales * (1 + unit_sales_growth)
+            avg_unit_price = avg_unit_price * (1 + price_growth)
+            sales = unit_sales * avg_unit_price
+            COGS = sales * COGS_percent
+            gross_profit = sales - COGS
+            commissions = sales * sales_comm_rate
+            G_and_A = sales * G_A_percent
+
+            items['unit_sales'][..., i] = unit_sales
+            items['avg_unit_price'][..., i] = avg_unit_price
+            items['Sales'][..., i] = sales
+            items['COGS'][..., i] = COGS
+            items['Gross_Profit'][..., i] = gross_profit
+            items['Sales_Commissions'][..., i] = commissions
+            items['G_and_A'][..., i] = G_and_A
+            items['EBITDA'][..., i] = gross_profit - commissions - G_and_A
+
+    return items
+
+# -------------------------------
+# 4. Batch Monte Carlo
+# -------------------------------
+def monte_carlo_ebitda_paths(baseline, base_assumptions, years=3, iterations=100000,
+                             noise_scales=None, rng=None, sampler=None, drivers=None):
+    """
+    Runs the Monte Carlo simulation in one vectorized pass.
+    Returns the (iterations, years) matrix of simulated EBITDA.
+    """
+    count('paths', iterations)
+    params = draw_noise(base_assumptions, iterations, noise_scales=noise_scales, rng=rng, sampler=sampler,
+                        drivers=drivers)
+    return project_ebitda_batch(baseline, params, years=years)
+
+# -------------------------------
+# 5. Closed-Form Moments of Cumulative EBITDA
+# (EBITDA_t = U0 * P0 * ((1 + g_u)(1 + g_p))^t * (1 - COGS - comm - G&A) with independent normal
+#  parameters. Central moments are expanded in the parameters' deviations from their means, so
+#  nothing of the order of the mean is ever subtracted and small noise keeps full precision)
+# -------------------------------
+def _normal_raw_moments(mean, std, n):
+    """
+    Returns E[X^0..X^n] for X ~ N(mean, std^2), via E[X^k] = mean*E[X^(k-1)] + (k-1)*std^2*E[X^(k-2)].
+    """
+    moments = np.empty(n + 1)
+    moments[0] = 1.0
+    if n >= 1:
+        moments[1] = mean
+    for k in range(2, n + 1):
+        moments[k] = mean * moments[k - 1] + (k - 1) * std ** 2 * moments[k - 2]
+    return moments
+
+def _polymul2d(first, second):
+    """
+    Product of two polynomials in (x, y) given as coefficient matrices (entry [i, j] multiplies x^i y^j).
+    """
+    product = np.zeros((first.shape[0] + second.shape[0] - 1, first.shape[1] + second.shape[1] - 1))
+    for i, j in np.argwhere(first != 0):
+        product[i:i + second.shape[0], j:j + second.shape[1]] += first[i, j] * second
+    return product
+
+def _expectation2d(poly, x_moments, y_moments):
+    return float(x_moments[:poly.shape[0]] @ poly @ y_moments[:poly.shape[1]])
+
+def _growth_sum_moments(a, a_std, b, b_std, years):
+    """
+    E[S] and the central moments E[(S - E[S])^0..4] of S = sum_{t=1..years} (A B)^t, A ~ N(a, a_std^2)
+    and B ~ N(b, b_std^2) independent. S is written as a polynomial in x = A - a and y = B - b, and
+    its deviation from the mean keeps only the terms that carry noise.
+    """
+    S = np.zeros((years + 1, years + 1))
+    for t in range(1, years + 1):
+        S[:t + 1, :t + 1] += np.outer(np.polynomial.polynomial.polypow([a, 1.0], t),
+                                      np.polynomial.polynomial.polypow([b, 1.0], t))
+    x = _normal_raw_moments(0.0, a_std, 4 * years)
+    y = _normal_raw_moments(0.0, b_std, 4 * years)
+
+    deviation = S.copy()
+    deviation[0, 0] = 0.0
+    noise_mean = _expectation2d(deviation, x, y)
+    deviation[0, 0] = -noise_mean
+
+    central = np.zeros(5)
+    central[0] = 1.0
+    power = deviation
+    for k in range(2, 5):
+        power = _polymul2d(power, deviation)
+        central[k] = _expectation2d(power, x, y)
+    return S[0, 0] + noise_mean, central
+
+def analytic_moments(baseline, assumptions, noise_scales=None, years=3, quantiles=(0.05, 0.25, 0.5, 0.75, 0.95)):
+    """
+    Exact mean, std, skewness and excess kurtosis of cumulative EBITDA under the
+    Monte Carlo noise model, without sampling. Quantiles are Cornish-Fisher approximations,
+    made non-decreasing in q (the expansion itself can fold over when skew or kurtosis is large).
+    Returns a dict keyed like StreamingSummary.summary() ('mean', 'std', 'P5', ...).
+    """
+    if noise_scales is None:
+        noise_scales = DEFAULT_NOISE_SCALES
+    scale = lambda name: noise_scales.get(name, 0)
+
+    # Cumulative EBITDA = U0 * P0 * M * S. With M = m + d and S = E[S] + D independent,
+    # X - E[X] = U0 * P0 * (d * (E[S] + D) + m * D), expanded binomially below.
+    S_mean, D = _growth_sum_moments(1 + assumptions.get('unit_sales_growth', 0), scale('unit_sales_growth'),
+                                    1 + assumptions.get('price_growth', 0), scale('price_growth'), years)
+    margin_mean = 1 - sum(assumptions.get(name, 0) for name in ('COGS_percent', 'sales_comm_rate', 'G_A_percent'))
+    margin_std = np.sqrt(sum(scale(name) ** 2 for name in ('COGS_percent', 'sales_comm_rate', 'G_A_percent')))
+    d = _normal_raw_moments(0.0, margin_std, 4)
+    base = baseline['unit_sales'] * baseline['avg_unit_price']
+
+    central = np.zeros(5)
+    for k in range(2, 5):
+        for j in range(0, k + 1, 2):   # odd moments of d vanish
+            mixed = sum(comb(j, l) * S_mean ** (j - l) * D[l + k - j] for l in range(j + 1))
+            central[k] += comb(k, j) * d[j] * margin_mean ** (k - j) * mixed
+        central[k] *= base ** k
+
+    mean = base * margin_mean * S_mean
+    var = central[2]
+    std = np.sqrt(var)
+    skew = central[3] / std ** 3 if std > 0 else 0.0
+    kurtosis = (central[4] - 3 * var ** 2) / var ** 2 if std > 0 else 0.0
+
+    stats = {'mean': mean, 'std': std, 'skew': skew, 'kurtosis': kurtosis}
+    previous = -np.inf
+    for q in sorted(quantiles):
+        z = NormalDist().inv_cdf(q)
+        w = (z
+             + (z ** 2 - 1) * skew / 6
+             + (z ** 3 - 3 * z) * kurtosis / 24
+             - (2 * z ** 3 - 5 * z) * skew ** 2 / 36)
+        previous = max(previous, mean + std * w)
+        stats[f'P{100 * q:g}'] = previous
+    return stats
+
+def check_analytic_moments(baseline, assumptions, noise_scales=None, years=3, iterations=100000, seed=None,
+                           quantiles=(0.05, 0.25, 0.5, 0.75, 0.95)):
+    """
+    Compares analytic_moments against a sampled run of the same model.
+    Returns a DataFrame with the analytic and sampled value of each statistic, their relative
+    difference and, for the mean, the difference in standard errors ('z').
+    """
+    import pandas as pd
+
+    analytic = analytic_moments(baseline, assumptions, noise_scales=noise_scales, years=years, quantiles=quantiles)
+    rng = np.random.default_rng(seed)
+    cumulative = monte_carlo_ebitda_paths(baseline, assumptions, years=years, iterations=iterations,
+                                          noise_scales=noise_scales, rng=rng).sum(axis=1)
+    centered = cumulative - cumulative.mean()
+    sampled = {
+        'mean': cumulative.mean(),
+        'std': cumulative.std(),
+        'skew': (centered ** 3).mean() / cumulative.std() ** 3,
+        'kurtosis': (centered ** 4).mean() / cumulative.var() ** 2 - 3
+    }
+    for q, value in zip(quantiles, np.quantile(cumulative, quantiles)):
+        sampled[f'P{100 * q:g}'] = value
+
+    table = pd.DataFrame({'analytic': analytic, 'sampled': sampled})
+    table['rel_diff'] = (table['sampled'] - table['analytic']) / table['analytic'].abs()
+    table['z'] = np.nan
+    table.loc['mean', 'z'] = (sampled['mean'] - analytic['mean']) / (analytic['std'] / np.sqrt(iterations))
+    return table
@@ -0,0 +1,174 @@
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import zipfile
+
+import numpy as np
+
+from instrumentation import phase
+from projection_engine import ENGINE_VERSION, monte_carlo_ebitda_paths
+
+# -------------------------------
+# 1. Cache Keys
+# (Content-addressed: anything that changes the simulated paths must be part of the key)
+# -------------------------------
+DEFAULT_CACHE_DIR = os.environ.get(
+    'HUNLEY_CACHE_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), '.mc_cache'))
+DEFAULT_MAX_BYTES = 2 * 1024 ** 3   # 2 GB
+
+def _importable(func):
+    """
+    True if 'func' can be found again by its module and qualname (so the name identifies it).
+    Lambdas and functions defined inside other functions cannot.
+    """
+    target = sys.modules.get(getattr(func, '__module__', None))
+    for part in getattr(func, '__qualname__', '<locals>').split('.'):
+        target = getattr(target, part, None)
+    return target is func
+
+def _canonical(value):
+    """
+    Converts a key part to plain JSON types; callables (custom samplers) are named by module and
+    qualname, which must lead back to them.
+    """
+    if callable(value):
+        if not _importable(value):
+            raise ValueError(f"{value!r} cannot be part of a cache key: only module-level functions "
+                             "are identified by their name")
+        return f'{value.__module__}.{value.__qualname__}'
+    if isinstance(value, dict):
+        return {str(k): _canonical(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(v) for v in value]
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+def cache_key(**parts):
+    """
+    Hashes the given parts (baseline, assumptions, noise scales, years, iterations, seed, ...)
+    together with ENGINE_VERSION into a hex digest. Key order does not matter.
+    """
+    parts['engine_version'] = ENGINE_VERSION
+    payload = json.dumps(_canonical(parts), sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+# -------------------------------
+# 2. On-Disk Store with LRU Eviction
+# -------------------------------
+class ResultCache:
+    """
+    Directory of .npz files named by cache key. A hit refreshes the file's mtime, and after each
+    write the least recently used files are evicted until the directory is under 'max_bytes'.
+    """
+
+    def __init__(self, directory=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + '.npz')
+
+    def get(self, key):
+        """
+        Returns the dict of arrays stored under 'key', or None on a miss. A corrupt or truncated
+        entry is deleted and counts as a miss.
+        """
+        path = self._path(key)
+        try:
+            with phase('io', op='cache_read'), np.load(path) as stored:
+                arrays = {name: stored[name] for name in stored.files}
+        except FileNotFoundError:
+            return None
+        except (zipfile.BadZipFile, EOFError, OSError, ValueError):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            return None
+        os.utime(path)
+        return arrays
+
+    def put(self, key, arrays):
+        """
+        Stores a dict of arrays under 'key' (atomically, via a temporary file) and evicts old entries.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with phase('io', op='cache_write'), os.fdopen(fd, 'wb') as f:
+                np.savez(f, **arrays)
+            os.replace(tmp, self._path(key))
+        except BaseException:
+            os.unlink(tmp)
+            raise
+        self.evict()
+
+    def evict(self):
+        """
+        Deletes least recently used entries until the cache fits in 'max_bytes'.
+        """
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith('.npz'):
+                stat = os.stat(os.path.join(self.directory, name))
+                entries.append((stat.st_mtime, stat.st_size, name))
+        total = sum(size for _, size, _ in entries)
+        for _, size, name in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            os.remove(os.path.join(self.directory, name))
+            total -= size
+
+    def clear(self):
+        if os.path.isdir(self.directory):
+            for name in os.listdir(self.directory):
+                if name.endswith('.npz'):
+                    os.remove(os.path.join(self.directory, name))
+
+_default_cache = None
+
+def default_cache():
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = ResultCache()
+    return _default_cache
+
+# -------------------------------
+# 3. Cached Simulation
+# -------------------------------
+def cached_ebitda_paths(baseline, base_assumptions, years=3, iterations=100000, seed=0,
+                        noise_scales=None, sampler=None, cache=None, drivers=None):
+    """
+    monte_carlo_ebitda_paths with a seeded Generator, reusing the stored (iterations, years)
+    EBITDA matrix when the exact same run was done before. An unseeded run is not
+    reproducible, so 'seed' is required. A sampler that is a lambda or a local function has no
+    stable name, so such runs are simulated without the cache.
+    """
+    if seed is None:
+        raise ValueError("cached runs need a seed")
+    if callable(sampler) and not _importable(sampler):
+        return monte_carlo_ebitda_paths(baseline, base_assumptions, years=years, iterations=iterations,
+                                        noise_scales=noise_scales, rng=np.random.default_rng(seed),
+                                        sampler=sampler, drivers=drivers)
+    if cache is None:
+        cache = default_cache()
+
+    parts = dict(kind='ebitda_paths', baseline=baseline, assumptions=base_assumptions,
+                 noise_scales=noise_scales, years=years, iterations=iterations, seed=seed,
+                 sampler=sampler)
+    if drivers is not None:
+        # Only added when used, so keys of existing independent-noise runs stay valid.
+        parts['drivers'] = drivers.spec()
+    key = cache_key(**parts)
+    stored = cache.get(key)
+    if stored is not None:
+        return stored['EBITDA']
+
+    EBITDA = monte_carlo_ebitda_paths(baseline, base_assumptions, years=years, iterations=iterations,
+                                      noise_scales=noise_scales, rng=np.random.default_rng(seed),
+                                      sampler=sampler, drivers=drivers)
+    cache.put(key, {'EBITDA': EBITDA})
+    return EBITDA
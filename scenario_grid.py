@@ -0,0 +1,152 @@
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from projection_engine import NOISE_PARAMETERS, noise_from_normals, project_ebitda_batch
+from samplers import get_sampler
+
+# -------------------------------
+# 1. Scenario Keys
+# (A scenario overrides any assumption or baseline value, the projection length and the
+#  upfront investment, e.g. {'unit_sales_growth': 0.12, 'years': 4, 'investment': 500000}.
+#  sales_growth is carried in the assumption dicts but does not enter the projection, so it is
+#  not a scenario key: sweeping it would return identical rows)
+# -------------------------------
+ASSUMPTION_KEYS = tuple(name for name in NOISE_PARAMETERS if name != 'sales_growth')
+BASELINE_KEYS = ('unit_sales', 'avg_unit_price')
+RUN_KEYS = ('years', 'investment')
+SCENARIO_KEYS = ASSUMPTION_KEYS + BASELINE_KEYS + RUN_KEYS
+
+DEFAULT_TILE_ELEMENTS = 2000000   # scenarios x paths evaluated per vectorized tile
+
+def _check_keys(keys):
+    if 'sales_growth' in keys:
+        raise ValueError("sales_growth does not enter the projection; sweep unit_sales_growth and/or "
+                         "price_growth instead")
+    unknown = [key for key in keys if key not in SCENARIO_KEYS]
+    if unknown:
+        raise ValueError(f"Unknown scenario keys: {', '.join(unknown)} (choose from {', '.join(SCENARIO_KEYS)})")
+
+# -------------------------------
+# 2. Scenario Designs
+# -------------------------------
+def cartesian_scenarios(axes):
+    """
+    Every combination of the values in 'axes', e.g. {'unit_sales_growth': [0.10, 0.15], 'years': [3, 4]}.
+    Returns a list of scenario dicts.
+    """
+    _check_keys(axes)
+    names = list(axes)
+    return [dict(zip(names, values)) for values in itertools.product(*axes.values())]
+
+def latin_hypercube_scenarios(bounds, n, rng=None):
+    """
+    'n' scenarios spread over the box 'bounds' ({key: (low, high)}) by Latin hypercube sampling:
+    each key's range is cut into n equal strata and every stratum is used exactly once.
+    'years' is rounded to whole years. Returns a list of scenario dicts.
+    """
+    _check_keys(bounds)
+    if rng is None:
+        rng = np.random
+    k = len(bounds)
+    strata = np.argsort(rng.random((n, k)), axis=0)
+    u = (strata + rng.random((n, k))) / n
+
+    scenarios = [{} for _ in range(n)]
+    for j, (name, (low, high)) in enumerate(bounds.items()):
+        values = low + (high - low) * u[:, j]
+        if name == 'years':
+            values = np.rint(values).astype(int)
+        for scenario, value in zip(scenarios, values.tolist()):
+            scenario[name] = value
+    return scenarios
+
+# -------------------------------
+# 3. Tile Worker
+# (All scenarios see the same draws, so differences between scenarios are not sampling noise)
+# -------------------------------
+def _run_tile(args):
+    """
+    Simulates one tile of scenarios on the shared draws and summarizes each one.
+    Module-level so the process pool can pickle it.
+    """
+    baseline, assumptions, scenarios, years, iterations, seed, sampler, noise_scales, quantiles = args
+    z = get_sampler(sampler)(iterations, len(NOISE_PARAMETERS), np.random.default_rng(seed))
+
+    # One (scenarios, 1) column per key, broadcast against the (iterations,) draws.
+    column = lambda key, default: np.array([s.get(key, default) for s in scenarios], dtype=float)[:, None]
+    base = {key: column(key, assumptions.get(key, 0)) for key in NOISE_PARAMETERS}
+    tile_baseline = {key: column(key, baseline[key]) for key in BASELINE_KEYS}
+    horizon = np.array([s.get('years', years) for s in scenarios])
+    investment = column('investment', 0.0)
+
+    # Project to the longest horizon once and zero out the years beyond each scenario's own.
+    params = noise_from_normals(base, z, noise_scales)
+    EBITDA = project_ebitda_batch(tile_baseline, params, years=int(horizon.max()))
+    EBITDA *= np.arange(EBITDA.shape[-1]) < horizon[:, None, None]
+    totals = EBITDA.sum(axis=-1) - investment
+
+    summary = {
+        'mean': totals.mean(axis=1),
+        'std': totals.std(axis=1),
+        'prob_loss': (totals < 0).mean(axis=1)
+    }
+    for q, values in zip(quantiles, np.quantile(totals, quantiles, axis=1)):
+        summary[f'P{100 * q:g}'] = values
+    return summary
+
+# -------------------------------
+# 4. Sweep
+# -------------------------------
+def run_scenarios(baseline, assumptions, scenarios, years=3, iterations=10000, seed=0, workers=None,
+                  tile_elements=DEFAULT_TILE_ELEMENTS, noise_scales=None, sampler=None,
+                  quantiles=(0.05, 0.5, 0.95)):
+    """
+    Evaluates every scenario (a dict of overrides on 'baseline' and 'assumptions', see
+    SCENARIO_KEYS) on 'iterations' paths of cumulative EBITDA net of its upfront investment.
+    Scenarios are evaluated in vectorized tiles of about 'tile_elements' scenario-paths,
+    spread over 'workers' processes. Every scenario uses the same draws from 'seed'.
+    Returns a DataFrame with one row per scenario: its settings followed by the mean, std,
+    probability of a loss and the requested quantiles.
+    """
+    import pandas as pd
+
+    scenarios = list(scenarios)
+    for scenario in scenarios:
+        _check_keys(scenario)
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    per_tile = max(1, tile_elements // max(iterations, 1))
+    tasks = [
+        (baseline, assumptions, scenarios[start:start + per_tile], years, iterations, seed, sampler,
+         noise_scales, quantiles)
+        for start in range(0, len(scenarios), per_tile)
+    ]
+    if workers == 1 or len(tasks) <= 1:
+        tiles = [_run_tile(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            tiles = list(pool.map(_run_tile, tasks))
+
+    table = pd.DataFrame(scenarios)
+    if not tiles:
+        return table
+    for name in tiles[0]:
+        table[name] = np.concatenate([tile[name] for tile in tiles])
+    return table
+
+def sweep(baseline, assumptions, axes=None, bounds=None, n=None, rng=None, **options):
+    """
+    Builds a Cartesian grid from 'axes' or a Latin hypercube of 'n' scenarios within 'bounds'
+    and runs it with run_scenarios (keyword 'options' are passed through).
+    """
+    if (axes is None) == (bounds is None):
+        raise ValueError("give either 'axes' (Cartesian grid) or 'bounds' and 'n' (Latin hypercube)")
+    if axes is not None:
+        scenarios = cartesian_scenarios(axes)
+    else:
+        scenarios = latin_hypercube_scenarios(bounds, n, rng=rng)
+    return run_scenarios(baseline, assumptions, scenarios, **options)
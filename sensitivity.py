@@ -0,0 +1,127 @@
+import numpy as np
+
+from projection_engine import DEFAULT_NOISE_SCALES, project_ebitda_batch
+from samplers import get_sampler
+
+# -------------------------------
+# 1. Parameters Under Study
+# (sales_growth is carried in the assumption dicts but does not enter the projection)
+# -------------------------------
+SENSITIVITY_PARAMETERS = (
+    'COGS_percent',
+    'G_A_percent',
+    'unit_sales_growth',
+    'price_growth',
+    'sales_comm_rate'
+)
+
+def _evaluate(baseline, assumptions, columns, years):
+    """
+    Cumulative EBITDA for a batch of parameter settings. 'columns' maps a parameter name to an
+    array of values, one per evaluation; every other assumption stays at its base value.
+    """
+    params = dict(assumptions)
+    params.update(columns)
+    return project_ebitda_batch(baseline, params, years=years).sum(axis=-1)
+
+# -------------------------------
+# 2. One-at-a-Time Tornado
+# -------------------------------
+def tornado(baseline, assumptions, parameters=SENSITIVITY_PARAMETERS, swings=None, years=3, noise_scales=None):
+    """
+    Moves each parameter down and up by its swing while holding the others at their base values.
+    'swings' maps a parameter to its +/- step and defaults to two noise standard deviations.
+    All 2k + 1 projections run in one batched call.
+    Returns a DataFrame sorted by the size of the EBITDA range, widest bar first.
+    """
+    import pandas as pd
+
+    if noise_scales is None:
+        noise_scales = DEFAULT_NOISE_SCALES
+    if swings is None:
+        swings = {name: 2 * noise_scales.get(name, 0) for name in parameters}
+    k = len(parameters)
+
+    # Row 0 is the base case, rows 1..k the low settings and rows k+1..2k the high settings.
+    columns = {}
+    for i, name in enumerate(parameters):
+        values = np.full(2 * k + 1, float(assumptions.get(name, 0)))
+        values[1 + i] -= swings[name]
+        values[1 + k + i] += swings[name]
+        columns[name] = values
+    EBITDA = _evaluate(baseline, assumptions, columns, years)
+
+    rows = []
+    for i, name in enumerate(parameters):
+        low, high = EBITDA[1 + i], EBITDA[1 + k + i]
+        rows.append({
+            'parameter': name,
+            'low_value': columns[name][1 + i],
+            'high_value': columns[name][1 + k + i],
+            'low_EBITDA': low,
+            'high_EBITDA': high,
+            'base_EBITDA': EBITDA[0],
+            'range': abs(high - low)
+        })
+    return pd.DataFrame(rows).sort_values('range', ascending=False, ignore_index=True)
+
+# -------------------------------
+# 3. Variance-Based (Sobol) Indices
+# (Saltelli sampling: matrices A and B plus k hybrids AB_i, i.e. N * (k + 2) model evaluations)
+# -------------------------------
+def sobol_indices(baseline, assumptions, parameters=SENSITIVITY_PARAMETERS, n=20000, years=3,
+                  noise_scales=None, rng=None, sampler=None):
+    """
+    First-order (S1) and total (ST) Sobol indices of cumulative EBITDA with respect to each
+    parameter, under the Monte Carlo noise model (parameter ~ N(base, noise scale^2)).
+    S1 uses the Saltelli (2010) estimator and ST the Jansen estimator. The N * (k + 2)
+    evaluations are stacked and projected in one vectorized call.
+    Returns a DataFrame with one row per parameter, sorted by ST.
+    """
+    import pandas as pd
+
+    if noise_scales is None:
+        noise_scales = DEFAULT_NOISE_SCALES
+    k = len(parameters)
+    z = get_sampler(sampler)(n, 2 * k, rng)
+    A, B = z[:, :k], z[:, k:]
+
+    # Block 0 is A, block 1 is B and block 2 + i is A with column i taken from B.
+    stacked = np.empty((k + 2, n, k))
+    stacked[0] = A
+    stacked[1] = B
+    for i in range(k):
+        stacked[2 + i] = A
+        stacked[2 + i, :, i] = B[:, i]
+
+    columns = {
+        name: assumptions.get(name, 0) + noise_scales.get(name, 0) * stacked[:, :, j].ravel()
+        for j, name in enumerate(parameters)
+    }
+    f = _evaluate(baseline, assumptions, columns, years).reshape(k + 2, n)
+    # Centering leaves the estimators unbiased but removes the large-mean noise from S1.
+    f -= f[:2].mean()
+    f_A, f_B, f_AB = f[0], f[1], f[2:]
+
+    variance = np.concatenate([f_A, f_B]).var()
+    first_order = (f_B * (f_AB - f_A)).mean(axis=1) / variance
+    total = 0.5 * ((f_A - f_AB) ** 2).mean(axis=1) / variance
+
+    table = pd.DataFrame({'parameter': list(parameters), 'S1': first_order, 'ST': total})
+    return table.sort_values('ST', ascending=False, ignore_index=True)
+
+def sensitivity_report(alternatives, parameters=SENSITIVITY_PARAMETERS, n=20000, years=3,
+                       noise_scales=None, rng=None, sampler=None):
+    """
+    Sobol indices for every alternative. 'alternatives' maps a name to a (baseline, assumptions) pair.
+    Returns one tidy DataFrame with an 'alternative' column.
+    """
+    import pandas as pd
+
+    tables = []
+    for name, (baseline, assumptions) in alternatives.items():
+        table = sobol_indices(baseline, assumptions, parameters=parameters, n=n, years=years,
+                              noise_scales=noise_scales, rng=rng, sampler=sampler)
+        table.insert(0, 'alternative', name)
+        tables.append(table)
+    return pd.concat(tables, ignore_index=True)
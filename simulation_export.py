@@ -0,0 +1,149 @@
+import json
+import uuid
+
+import numpy as np
+
+from instrumentation import phase
+from parallel_runner import shard_sizes
+from projection_engine import LINE_ITEMS, draw_noise, project_line_items_batch
+
+# -------------------------------
+# 1. Schema
+# (Long format, one row per run / alternative / iteration / year; pyarrow is only needed here)
+# -------------------------------
+METADATA_KEY = b'hunley_simulation'
+
+def _require_pyarrow():
+    try:
+        import pyarrow
+    except ImportError as exc:
+        raise ImportError("Exporting simulation runs requires pyarrow (pip install pyarrow).") from exc
+    return pyarrow
+
+def simulation_schema(float32=True, metadata=None):
+    """
+    Arrow schema for exported paths: dictionary-encoded run_id and alternative, int32 iteration,
+    int16 year and one column per line item (float32 unless 'float32' is False).
+    'metadata' (assumptions, seed, ...) is stored as JSON in the schema, i.e. the file footer.
+    """
+    pa = _require_pyarrow()
+    value_type = pa.float32() if float32 else pa.float64()
+    fields = [
+        pa.field('run_id', pa.dictionary(pa.int8(), pa.string())),
+        pa.field('alternative', pa.dictionary(pa.int8(), pa.string())),
+        pa.field('iteration', pa.int32()),
+        pa.field('year', pa.int16())
+    ] + [pa.field(name, value_type) for name in LINE_ITEMS]
+    footer = {METADATA_KEY: json.dumps(metadata or {}, default=str).encode('utf-8')}
+    return pa.schema(fields, metadata=footer)
+
+# -------------------------------
+# 2. Chunked Writer
+# -------------------------------
+class SimulationExporter:
+    """
+    Streams simulated paths to a Parquet file (one row group per chunk) or an Arrow IPC file
+    (one record batch per chunk). Use as a context manager, or call close() when done.
+    """
+
+    def __init__(self, path, alternatives, file_format='parquet', run_id=None, metadata=None,
+                 float32=True, base_year=2018, compression='zstd'):
+        pa = _require_pyarrow()
+        self.pa = pa
+        self.alternatives = list(alternatives)
+        self.run_id = run_id or uuid.uuid4().hex
+        self.base_year = base_year
+        self.rows = 0
+        self.schema = simulation_schema(float32=float32, metadata=dict(metadata or {}, run_id=self.run_id))
+        self._run_dictionary = pa.array([self.run_id])
+        self._alternative_dictionary = pa.array(self.alternatives)
+
+        if file_format == 'parquet':
+            import pyarrow.parquet as pq
+            self._writer = pq.ParquetWriter(path, self.schema, compression=compression)
+        elif file_format == 'arrow':
+            import pyarrow.ipc as ipc
+            self._writer = ipc.new_file(path, self.schema, options=ipc.IpcWriteOptions(compression=compression))
+        else:
+            raise ValueError(f"Unknown file format: {file_format!r} (choose 'parquet' or 'arrow')")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def write_paths(self, alternative, items, iteration_offset=0):
+        """
+        Writes one chunk: 'items' maps line items to (n, years) arrays, as returned by
+        project_line_items_batch. Iterations are numbered from 'iteration_offset'.
+        """
+        pa = self.pa
+        n, years = items['EBITDA'].shape
+        rows = n * years
+
+        code = self.alternatives.index(alternative)
+        columns = [
+            pa.DictionaryArray.from_arrays(pa.array(np.zeros(rows, dtype=np.int8)), self._run_dictionary),
+            pa.DictionaryArray.from_arrays(pa.array(np.full(rows, code, dtype=np.int8)),
+                                           self._alternative_dictionary),
+            pa.array(np.repeat(np.arange(iteration_offset, iteration_offset + n, dtype=np.int32), years)),
+            pa.array(np.tile(np.arange(self.base_year + 1, self.base_year + 1 + years, dtype=np.int16), n))
+        ]
+        for name in LINE_ITEMS:
+            field_type = self.schema.field(name).type
+            columns.append(pa.array(np.ascontiguousarray(items[name]).ravel().astype(field_type.to_pandas_dtype())))
+
+        with phase('io', op='export_write', rows=rows):
+            self._writer.write_batch(pa.RecordBatch.from_arrays(columns, schema=self.schema))
+        self.rows += rows
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+def read_metadata(path):
+    """
+    Returns the run metadata (assumptions, seed, ...) stored in an exported Parquet or Arrow file.
+    """
+    pa = _require_pyarrow()
+    if path.endswith('.parquet'):
+        import pyarrow.parquet as pq
+        schema = pq.read_schema(path)
+    else:
+        with pa.memory_map(path) as source:
+            schema = pa.ipc.open_file(source).schema
+    return json.loads(schema.metadata[METADATA_KEY])
+
+# -------------------------------
+# 3. Simulate and Export
+# -------------------------------
+def export_simulation(path, alternatives, years=3, iterations=100000, chunk_size=100000, seed=None,
+                      noise_scales=None, sampler=None, file_format='parquet', run_id=None, float32=True):
+    """
+    Simulates every alternative chunk by chunk and streams the path-level results to 'path'.
+    'alternatives' maps a name to a (baseline, assumptions) pair. The assumptions, noise scales,
+    seed and run sizes are written to the file footer.
+    Returns the run_id.
+    """
+    metadata = {
+        'alternatives': {name: {'baseline': baseline, 'assumptions': assumptions}
+                         for name, (baseline, assumptions) in alternatives.items()},
+        'noise_scales': noise_scales,
+        'years': years,
+        'iterations': iterations,
+        'seed': seed,
+        'sampler': sampler if sampler is None or isinstance(sampler, str) else repr(sampler)
+    }
+    rng = np.random.default_rng(seed)
+    with SimulationExporter(path, alternatives, file_format=file_format, run_id=run_id,
+                            metadata=metadata, float32=float32) as exporter:
+        for name, (baseline, assumptions) in alternatives.items():
+            offset = 0
+            for size in shard_sizes(iterations, chunk_size):
+                params = draw_noise(assumptions, size, noise_scales=noise_scales, rng=rng, sampler=sampler)
+                exporter.write_paths(name, project_line_items_batch(baseline, params, years=years),
+                                     iteration_offset=offset)
+                offset += size
+        return exporter.run_id
@@ -0,0 +1,114 @@
+import numpy as np
+
+from parallel_runner import shard_sizes
+from projection_engine import NOISE_PARAMETERS, noise_from_normals
+from samplers import get_sampler
+from streaming_stats import StreamingSummary
+
+# -------------------------------
+# 1. Per-Year Shocks
+# (Each parameter follows a stationary AR(1) in its standardized noise:
+#  u_t = phi * u_(t-1) + sqrt(1 - phi^2) * z_t, so every year keeps the N(base, scale^2) marginal.
+#  phi = 0 draws each year independently; phi = 1 holds the first draw, like the one-draw-per-path model.
+#  Year 0 is drawn first as one (iterations, k) block, the layout projection_engine.draw_noise uses, so
+#  phi = 1 on every parameter reproduces monte_carlo_ebitda_paths for the same seed when the run fits
+#  in one chunk.)
+# -------------------------------
+def draw_yearly_normals(iterations, years, rng=None, sampler=None):
+    """
+    Draws an (iterations, years, k) tensor of independent standard normals, k = len(NOISE_PARAMETERS):
+    year 0 as one (iterations, k) block, then the remaining years.
+    """
+    k = len(NOISE_PARAMETERS)
+    draw = get_sampler(sampler)
+    z = np.empty((iterations, years, k))
+    z[:, 0] = draw(iterations, k, rng)
+    if years > 1:
+        z[:, 1:] = draw(iterations, (years - 1) * k, rng).reshape(iterations, years - 1, k)
+    return z
+
+def autocorrelate(z, persistence=None):
+    """
+    Runs the AR(1) recursion along the year axis of an (iterations, years, k) tensor.
+    'persistence' maps a parameter to phi in (-1, 1]; unlisted parameters use 0.
+    """
+    if not persistence:
+        return z
+    unknown = [name for name in persistence if name not in NOISE_PARAMETERS]
+    if unknown:
+        raise ValueError(f"Unknown persistence parameters: {', '.join(unknown)}")
+    phi = np.array([persistence.get(name, 0.0) for name in NOISE_PARAMETERS], dtype=float)
+    if not np.all((phi > -1) & (phi <= 1)):
+        raise ValueError(f"Persistence must lie in (-1, 1], got {persistence}")
+    innovation = np.sqrt(1 - phi ** 2)
+    u = np.empty_like(z)
+    u[:, 0] = z[:, 0]
+    for t in range(1, z.shape[1]):
+        u[:, t] = phi * u[:, t - 1] + innovation * z[:, t]
+    return u
+
+def yearly_parameters(base_assumptions, u, noise_scales=None, drivers=None):
+    """
+    Turns an (iterations, years, k) tensor of standardized noise into per-year assumption
+    parameters, a dict of (iterations, years) arrays. 'drivers' (drivers.DriverModel) applies
+    its correlation and marginals year by year.
+    """
+    iterations, years, k = u.shape
+    flat = u.reshape(iterations * years, k)
+    if drivers is not None:
+        params = drivers.noise_from_normals(base_assumptions, flat, noise_scales)
+    else:
+        params = noise_from_normals(base_assumptions, flat, noise_scales)
+    return {name: values.reshape(iterations, years) for name, values in params.items()}
+
+# -------------------------------
+# 2. Projection with Time-Varying Parameters
+# -------------------------------
+def project_ebitda_yearly(baseline, params):
+    """
+    EBITDA for per-year parameters ((iterations, years) arrays). Unit sales and price compound
+    with a cumulative product along the year axis. Returns an (iterations, years) matrix.
+    """
+    unit_sales_growth = params['unit_sales_growth']
+    iterations, years = unit_sales_growth.shape
+
+    # Seeding the product with the baseline keeps the multiplication order of project_ebitda_batch.
+    factors = np.empty((iterations, years + 1))
+    factors[:, 0] = baseline['unit_sales']
+    np.add(1, unit_sales_growth, out=factors[:, 1:])
+    unit_sales = np.cumprod(factors, axis=1)[:, 1:]
+    factors[:, 0] = baseline['avg_unit_price']
+    np.add(1, params['price_growth'], out=factors[:, 1:])
+    avg_unit_price = np.cumprod(factors, axis=1)[:, 1:]
+
+    sales = unit_sales * avg_unit_price
+    gross_profit = sales - sales * params['COGS_percent']
+    return gross_profit - sales * params['sales_comm_rate'] - sales * params['G_A_percent']
+
+# -------------------------------
+# 3. Chunked Monte Carlo
+# -------------------------------
+def monte_carlo_yearly_shocks(baseline, base_assumptions, years=10, iterations=100000, persistence=None,
+                              chunk_size=100000, noise_scales=None, rng=None, sampler=None, drivers=None,
+                              stream=False):
+    """
+    Monte Carlo with fresh (optionally autocorrelated) shocks every year, built chunk by chunk
+    so the (chunk_size, years, k) shock tensor bounds the working memory.
+    Returns the (iterations, years) EBITDA matrix, or with 'stream' a StreamingSummary of
+    cumulative EBITDA, so memory no longer grows with 'iterations'.
+    """
+    stats = StreamingSummary() if stream else None
+    EBITDA = None if stream else np.empty((iterations, years))
+
+    start = 0
+    for size in shard_sizes(iterations, chunk_size):
+        u = autocorrelate(draw_yearly_normals(size, years, rng=rng, sampler=sampler), persistence)
+        params = yearly_parameters(base_assumptions, u, noise_scales=noise_scales, drivers=drivers)
+        chunk = project_ebitda_yearly(baseline, params)
+        if stream:
+            stats.update(chunk.sum(axis=1))
+        else:
+            EBITDA[start:start + size] = chunk
+        start += size
+
+    return stats if stream else EBITDA
@@ -0,0 +1,218 @@
+import numpy as np
+
+from instrumentation import phase
+
+# -------------------------------
+# 1. Running Mean / Variance (Welford, merged chunk by chunk with Chan's update)
+# -------------------------------
+class RunningMoments:
+    """
+    Running count, mean and variance over chunks of observations.
+    Each chunk is an array whose first axis is the path axis; any trailing axes (e.g. years)
+    are tracked element-wise.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.M2 = 0.0
+
+    def update(self, values):
+        values = np.asarray(values, dtype=float)
+        n_b = values.shape[0]
+        if n_b == 0:
+            return
+        mean_b = values.mean(axis=0)
+        M2_b = ((values - mean_b) ** 2).sum(axis=0)
+        self._combine(n_b, mean_b, M2_b)
+
+    def merge(self, other):
+        """
+        Folds in the moments of another RunningMoments (e.g. from another process).
+        """
+        if other.count:
+            self._combine(other.count, other.mean, other.M2)
+
+    def _combine(self, n_b, mean_b, M2_b):
+        n_a = self.count
+        n = n_a + n_b
+        delta = mean_b - self.mean
+        self.mean = self.mean + delta * (n_b / n)
+        self.M2 = self.M2 + M2_b + delta ** 2 * (n_a * n_b / n)
+        self.count = n
+
+    def variance(self, ddof=0):
+        return self.M2 / (self.count - ddof)
+
+    def std(self, ddof=0):
+        return np.sqrt(self.variance(ddof))
+
+# -------------------------------
+# 2. Streaming Quantiles (merging t-digest, compressed with array operations per chunk)
+# -------------------------------
+class TDigest:
+    """
+    Merging t-digest with the arcsine scale function.
+    Each chunk is sorted together with the current centroids and regrouped so that every
+    centroid spans at most one unit of the scale function; tails keep single-path resolution.
+    """
+
+    def __init__(self, compression=1000):
+        self.compression = compression
+        self.means = np.empty(0)
+        self.weights = np.empty(0)
+        self.count = 0
+        self.min = np.inf
+        self.max = -np.inf
+
+    def update(self, values):
+        values = np.asarray(values, dtype=float).ravel()
+        if values.size == 0:
+            return
+        self._add(values, np.ones(values.size), values.size, values.min(), values.max())
+
+    def merge(self, other):
+        """
+        Folds in the centroids of another TDigest (e.g. from another process).
+        """
+        if other.count:
+            self._add(other.means, other.weights, other.count, other.min, other.max)
+
+    def _add(self, new_means, new_weights, count, low, high):
+        self.min = min(self.min, low)
+        self.max = max(self.max, high)
+        self.count += count
+
+        means = np.concatenate([self.means, new_means])
+        weights = np.concatenate([self.weights, new_weights])
+        order = np.argsort(means, kind='stable')
+        means = means[order]
+        weights = weights[order]
+
+        # Cluster by the scale function evaluated at each point's cumulative-weight midpoint.
+        q_mid = (np.cumsum(weights) - weights / 2) / weights.sum()
+        k = self.compression / (2 * np.pi) * np.arcsin(2 * q_mid - 1)
+        cluster = np.floor(k - k[0]).astype(np.int64)
+
+        w = np.bincount(cluster, weights=weights)
+        s = np.bincount(cluster, weights=weights * means)
+        keep = w > 0
+        self.weights = w[keep]
+        self.means = s[keep] / self.weights
+
+    def quantile(self, q):
+        """
+        Estimates the quantile(s) 'q' by interpolating between centroid midpoints.
+        """
+        if self.count == 0:
+            return np.full(np.shape(q), np.nan)
+        cum = np.cumsum(self.weights)
+        mids = cum - self.weights / 2
+        x = np.concatenate([[0.0], mids, [cum[-1]]])
+        y = np.concatenate([[self.min], self.means, [self.max]])
+        return np.interp(np.asarray(q) * cum[-1], x, y)
+
+# -------------------------------
+# 3. Fixed-Bin Histogram
+# -------------------------------
+class FixedHistogram:
+    """
+    Histogram with fixed bin edges accumulated chunk by chunk.
+    If no range is given, it is fixed from the first chunk's spread padded on both sides;
+    later values outside the range are counted in 'underflow' / 'overflow'.
+    """
+
+    def __init__(self, bins=400, hist_range=None, padding=0.5):
+        self.bins = bins
+        self.padding = padding
+        self.edges = None if hist_range is None else np.linspace(hist_range[0], hist_range[1], bins + 1)
+        self.counts = np.zeros(bins, dtype=np.int64)
+        self.underflow = 0
+        self.overflow = 0
+
+    def update(self, values):
+        values = np.asarray(values, dtype=float).ravel()
+        if values.size == 0:
+            return
+        if self.edges is None:
+            lo, hi = values.min(), values.max()
+            pad = (hi - lo) * self.padding or abs(lo) * 0.01 or 1.0
+            self.edges = np.linspace(lo - pad, hi + pad, self.bins + 1)
+        self.counts += np.histogram(values, bins=self.edges)[0]
+        self.underflow += int((values < self.edges[0]).sum())
+        self.overflow += int((values > self.edges[-1]).sum())
+
+    def merge(self, other):
+        """
+        Adds the counts of another FixedHistogram; both must have the same bin edges
+        (give both the same 'hist_range').
+        """
+        if other.edges is None:
+            return
+        if self.edges is None:
+            self.edges = other.edges.copy()
+        elif self.edges.shape != other.edges.shape or not np.array_equal(self.edges, other.edges):
+            raise ValueError("Histograms with different bin edges cannot be merged; give them the same hist_range")
+        self.counts += other.counts
+        self.underflow += other.underflow
+        self.overflow += other.overflow
+
+# -------------------------------
+# 4. Combined Summary
+# -------------------------------
+class StreamingSummary:
+    """
+    Running mean/std, quantiles and histogram of a stream of simulated values.
+    Memory is set by the compression and bin count, not by how many values are seen.
+    """
+
+    def __init__(self, bins=400, hist_range=None, compression=1000):
+        self.moments = RunningMoments()
+        self.digest = TDigest(compression=compression)
+        self.histogram = FixedHistogram(bins=bins, hist_range=hist_range)
+
+    def update(self, values):
+        with phase('reduction', values=np.size(values)):
+            values = np.asarray(values, dtype=float).ravel()
+            self.moments.update(values)
+            self.digest.update(values)
+            self.histogram.update(values)
+
+    def merge(self, other):
+        """
+        Folds in another StreamingSummary, so shards summarized in separate processes combine
+        into one summary without shipping their paths.
+        """
+        with phase('reduction', values=other.count):
+            self.moments.merge(other.moments)
+            self.digest.merge(other.digest)
+            self.histogram.merge(other.histogram)
+
+    @property
+    def count(self):
+        return self.moments.count
+
+    def mean(self):
+        return self.moments.mean
+
+    def std(self, ddof=0):
+        return self.moments.std(ddof)
+
+    def quantile(self, q):
+        return self.digest.quantile(q)
+
+    def summary(self, quantiles=(0.05, 0.25, 0.5, 0.75, 0.95)):
+        """
+        Returns a dict of count, mean, std (population, like ndarray.std), min, max and
+        the requested quantiles keyed as 'P5', 'P50', ...
+        """
+        stats = {
+            'count': self.count,
+            'mean': self.mean(),
+            'std': self.std(),
+            'min': self.digest.min,
+            'max': self.digest.max
+        }
+        for q, value in zip(quantiles, self.quantile(quantiles)):
+            stats[f'P{100 * q:g}'] = value
+        return stats
@@ -1,6 +1,14 @@
+import os
+import sys
+
 import pandas as pd
 import numpy as np
 
+# Shared models live at the repository root.
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from projection import project_income_statement
+from samplers import get_sampler
+
 # -------------------------------
 # 1. Define Alternative-Specific Baselines
 # (Using optimal price points and corresponding quantities)
@@ -43,58 +51,42 @@ assumptions_alt3 = {
 }
 
 # -------------------------------
-# 3. Projection Function for Income Statements (Sales only)
+# 3. Projection Function for Income Statements
+# (project_income_statement is shared by all models and lives in projection.py)
 # -------------------------------
-def project_income_statement(baseline, assumptions, years=3):
-    """
-    Projects an income statement over a given number of years.
-    Uses the baseline unit_sales and avg_unit_price as the starting points.
-    Returns a DataFrame with yearly projections for:
-      - Year
-      - unit_sales
-      - avg_unit_price
-      - Sales (unit_sales * avg_unit_price)
-    """
-    projections = []
-    last_year = baseline.copy()
-    
-    for i in range(1, years + 1):
-        projection = {}
-        projection['Year'] = 2018 + i
-        
-        # Update unit_sales and average unit price using the specified growth rates.
-        projection['unit_sales'] = last_year['unit_sales'] * (1 + assumptions['unit_sales_growth'])
-        projection['avg_unit_price'] = last_year['avg_unit_price'] * (1 + assumptions['price_growth'])
-        projection['Sales'] = projection['unit_sales'] * projection['avg_unit_price']
-        
-        projections.append(projection)
-        last_year = projection.copy()  # Use current year's projection as baseline for next year.
-    
-    return pd.DataFrame(projections)
 
 # -------------------------------
 # 4. Monte Carlo Simulation Function (For Sales Projections)
 # -------------------------------
-def monte_carlo_simulation_sales(baseline, base_assumptions, years=3, iterations=10000):
+def monte_carlo_simulation_sales(baseline, base_assumptions, years=3, iterations=10000, sampler=None):
     """
     Runs a Monte Carlo simulation to project year-by-year Sales over 'years'.
     Applies random noise (using a normal distribution) to unit_sales_growth and price_growth assumptions.
+    'sampler' selects a variance reduction scheme ('antithetic', 'lhs', 'sobol'; see samplers.py).
     Returns a DataFrame with the average (mean) unit_sales, avg_unit_price, and Sales for each Year.
     """
+    # Standard normals for the two noisy parameters, drawn for all iterations up front
+    z = get_sampler(sampler)(iterations, 2)
+    unit_sales_growth = base_assumptions['unit_sales_growth'] + 0.005 * z[:, 0]
+    price_growth = base_assumptions['price_growth'] + 0.005 * z[:, 1]
+    
     results = []
     for j in range(iterations):
         # Apply random noise to the key parameters
         noise = {
-            'unit_sales_growth': np.random.normal(loc=base_assumptions['unit_sales_growth'], scale=0.005),
-            'price_growth': np.random.normal(loc=base_assumptions['price_growth'], scale=0.005)
+            'unit_sales_growth': unit_sales_growth[j],
+            'price_growth': price_growth[j]
         }
         proj = project_income_statement(baseline, noise, years=years)
         results.append(proj)
     
-    # Combine all iterations into one DataFrame
-    combined = pd.concat(results)
-    # Group by Year and compute the mean for each metric.
-    summary = combined.groupby('Year')[['unit_sales', 'avg_unit_price', 'Sales']].mean().reset_index()
+    # Average each metric across iterations; every projection covers the same Years.
+    summary = pd.DataFrame({
+        'Year': results[0]['Year'],
+        'unit_sales': np.mean([p['unit_sales'] for p in results], axis=0),
+        'avg_unit_price': np.mean([p['avg_unit_price'] for p in results], axis=0),
+        'Sales': np.mean([p['Sales'] for p in results], axis=0)
+    })
     return summary
 
 # -------------------------------
@@ -1,35 +1,19 @@
+import os
+import sys
+
 import numpy as np
 import matplotlib.pyplot as plt
 
-# --- Demand Model Function ---
-def predicted_demand(Q0, P0, P, elasticity):
-    """
-    Compute predicted demand using: Q = Q0 * (P0 / P)^elasticity
-    """
-    return Q0 * (P0 / P)**(elasticity)
-
-# --- Function to Adjust Baseline Using Market Analysis Data ---
-def adjust_baseline(current_demand, current_share, target_share, capture_rate):
-    """
-    Adjust the baseline demand given market data.
-    
-    Parameters:
-      current_demand: current units sold for a segment.
-      current_share: current % share of that segment in total purchases (decimal).
-      target_share: potential/target % share of that segment in the market (decimal).
-      capture_rate: assumed fraction of the untapped potential that can be captured (decimal).
-      
-    Returns:
-      Adjusted demand value.
-    """
-    f = target_share / current_share  # the full factor by which demand could increase.
-    adjusted_demand = current_demand * (1 + capture_rate * (f - 1))
-    return adjusted_demand
+# Shared models live at the repository root.
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from case_data import load_case_data
+from demand import adjust_baseline, predicted_demand
 
 # --- Define Baseline Values for Each Alternative ---
 # For Alternatives 1 and 2, use the optimal values from your elasticity sim.
-current_share1 = 0.80
-target_share1 = 0.435
+# Segment shares (% of current sales, % of market) come from Data/casefacts.csv.
+case = load_case_data()
+current_share1, target_share1 = case.segment_share('Avid', 'Competitive')   # 0.80, 0.435
 capture_rate1 = 0.30  # assumed 20% capture of untapped potential
 
 # Original baseline (from elasticity sim) for Alt3:
@@ -41,8 +25,7 @@ baseline_opt1 = {
     'avg_unit_price': 755.56     # Titaluk optimal retail price
 }
 
-current_share2 = 0.20
-target_share2 = 0.565
+current_share2, target_share2 = case.segment_share('Beginners', 'Occasional')   # 0.20, 0.565
 capture_rate2 = 0.30  # assumed 20% capture of untapped potential
 
 # Original baseline (from elasticity sim) for Alt3:
@@ -58,8 +41,7 @@ baseline_opt2 = {
 # Let's say the previous optimal quantity was 12112 units.
 # However, market analysis suggests that occasional buyers have only 18% of current purchases,
 # but they represent 52.5% of the potential market.
-current_share = 0.18
-target_share = 0.525
+current_share, target_share = case.segment_share('Occasional')   # 0.18, 0.525
 capture_rate = 0.30  # assumed 60% capture of untapped potential
 
 # Original baseline (from elasticity sim) for Alt3:
@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+
+from adaptive_monte_carlo import monte_carlo_simulation_adaptive
+
+BASELINE = {'unit_sales': 12112, 'avg_unit_price': 365.66}
+ASSUMPTIONS = {'sales_growth': 0.13, 'unit_sales_growth': 0.10, 'price_growth': 0.03,
+               'COGS_percent': 0.45, 'sales_comm_rate': 0.00, 'G_A_percent': 0.22}
+
+def _run(seed=0, **kwargs):
+    return monte_carlo_simulation_adaptive(BASELINE, ASSUMPTIONS, rng=np.random.default_rng(seed), **kwargs)
+
+def test_stops_at_the_first_batch_within_tolerance():
+    tol, batch = 1000.0, 5000
+    result = _run(tol=tol, batch_size=batch, min_iterations=batch)
+    assert result['converged'] and result['se'] <= tol
+    assert result['iterations'] % batch == 0
+    # The paths needed grow as (std / tol)^2.
+    std = result['stats'].std(ddof=1)
+    assert abs(result['iterations'] - (std / tol) ** 2) <= batch
+    # One batch fewer (same seed, same draws) is not yet precise enough.
+    shorter = _run(tol=tol, batch_size=batch, min_iterations=batch, max_iterations=result['iterations'] - batch)
+    assert not shorter['converged'] and shorter['se'] > tol
+
+def test_relative_tolerance_on_a_quantile():
+    result = _run(rel_tol=2e-3, quantile=0.05, batch_size=10000)
+    assert result['converged'] and result['se'] <= 2e-3 * abs(result['estimate'])
+
+def test_honours_the_iteration_cap():
+    result = _run(tol=1e-6, batch_size=7000, max_iterations=25000)
+    assert result['iterations'] == 25000
+    assert not result['converged'] and result['se'] > 1e-6
+
+def test_honours_the_minimum_and_the_time_budget():
+    assert _run(tol=1e12, batch_size=5000, min_iterations=20000)['iterations'] == 20000
+    result = _run(tol=1e-6, batch_size=5000, time_budget=0.0)
+    assert result['iterations'] == 5000 and not result['converged']
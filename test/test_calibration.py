@@ -0,0 +1,104 @@
+import time
+import warnings
+
+import numpy as np
+import pytest
+
+from calibration import (ELASTICITY_FLOOR, WEAK_ESS_SHARE, bootstrap_elasticity, calibration_summary,
+                         effective_sample_size, loglog_elasticities, posterior_elasticity, price_volume_history)
+
+# The three-year case history is weakly identified by design; tests that check the warning use pytest.warns.
+pytestmark = pytest.mark.filterwarnings('ignore:Elasticity calibration:UserWarning')
+
+def test_history_comes_from_casefacts():
+    years, prices, units = price_volume_history()
+    assert list(years) == [2016, 2017, 2018]
+    np.testing.assert_array_equal(prices, [285, 269, 260])
+    np.testing.assert_array_equal(units, [96000, 91000, 101000])
+
+def test_loglog_fit_recovers_a_power_law():
+    prices = np.array([200.0, 250.0, 300.0, 400.0])
+    units = 5e6 * prices ** -1.7
+    elasticity, intercept = loglog_elasticities(np.log(prices), np.log(units))
+    assert elasticity[0] == pytest.approx(1.7, rel=1e-12)
+    assert intercept[0] == pytest.approx(np.log(5e6), rel=1e-12)
+    rows, _ = loglog_elasticities(np.log(prices), np.log(units), np.ones((3, 4)))
+    np.testing.assert_allclose(rows, 1.7, rtol=1e-12)
+
+def test_loglog_fit_matches_polyfit_on_the_history():
+    _, prices, units = price_volume_history()
+    elasticity, _ = loglog_elasticities(np.log(prices), np.log(units))
+    assert elasticity[0] == pytest.approx(-np.polyfit(np.log(prices), np.log(units), 1)[0], rel=1e-10)
+
+@pytest.mark.parametrize('method', ['bayesian', 'pairs'])
+def test_noiseless_bootstrap_is_exact(method):
+    prices = np.array([200.0, 250.0, 300.0, 400.0])
+    draws = bootstrap_elasticity(prices, 5e6 * prices ** -1.7, resamples=2000, method=method,
+                                 rng=np.random.default_rng(0))
+    assert np.isfinite(draws).all()
+    np.testing.assert_allclose(draws, 1.7, rtol=1e-9)
+    if method == 'pairs':
+        assert draws.size < 2000   # resamples that drew a single price are dropped
+
+def test_bootstrap_is_fast():
+    _, prices, units = price_volume_history()
+    start = time.perf_counter()
+    draws = bootstrap_elasticity(prices, units, resamples=100000, rng=np.random.default_rng(1))
+    assert time.perf_counter() - start < 1.0
+    assert draws.size == 100000
+
+def test_ess_describes_the_resampled_draws():
+    _, prices, units = price_volume_history()
+    samples, info = posterior_elasticity(prices, units, samples=50000, prior_mean=1.5, prior_std=0.2,
+                                         rng=np.random.default_rng(2), diagnostics=True)
+    weights = info['weights']
+    assert info['ess'] == pytest.approx(effective_sample_size(info['draws'], 1.5, 0.2), rel=1e-12)
+    assert 1 <= info['ess'] <= info['draws'].size
+    # The resampled posterior mean is the importance-weighted mean of the same draws.
+    assert samples.mean() == pytest.approx(np.average(info['draws'], weights=weights), abs=0.01)
+
+def test_flat_prior_keeps_every_draw():
+    _, prices, units = price_volume_history()
+    _, info = posterior_elasticity(prices, units, samples=20000, prior_mean=0.0, prior_std=1e6,
+                                   rng=np.random.default_rng(3), diagnostics=True)
+    assert info['ess'] == pytest.approx(info['draws'].size, rel=1e-6)
+
+def test_floor_clips_the_samples():
+    _, prices, units = price_volume_history()
+    samples = posterior_elasticity(prices, units, samples=20000, floor=0.1, rng=np.random.default_rng(4))
+    assert samples.min() >= 0.1
+
+def test_floor_defaults_to_the_elasticity_floor():
+    _, prices, units = price_volume_history()
+    with pytest.warns(UserWarning):
+        samples = posterior_elasticity(prices, units, samples=20000, rng=np.random.default_rng(5))
+    assert samples.min() == ELASTICITY_FLOOR
+    with pytest.warns(UserWarning):
+        raw = posterior_elasticity(prices, units, samples=20000, floor=None, rng=np.random.default_rng(5))
+    assert raw.min() < 0
+
+def test_weakly_identified_history_warns():
+    _, prices, units = price_volume_history()
+    with pytest.warns(UserWarning, match='barely identifies the elasticity, give a prior'):
+        _, info = posterior_elasticity(prices, units, samples=20000, rng=np.random.default_rng(6), diagnostics=True)
+    assert len(info['warnings']) == 1
+    with pytest.warns(UserWarning, match='the prior, not the history, sets the answer'):
+        _, info = posterior_elasticity(prices, units, samples=20000, prior_mean=1.5, prior_std=0.2,
+                                       rng=np.random.default_rng(6), diagnostics=True)
+    assert info['ess'] < WEAK_ESS_SHARE * info['draws'].size
+
+def test_well_identified_history_is_quiet():
+    prices = np.array([200.0, 250.0, 300.0, 400.0])
+    units = 5e6 * prices ** -1.7 * np.exp(np.random.default_rng(7).normal(0, 0.02, 4))
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        _, info = posterior_elasticity(prices, units, samples=20000, prior_mean=1.6, prior_std=0.5,
+                                       rng=np.random.default_rng(7), diagnostics=True)
+    assert info['warnings'] == []
+
+def test_summary_reports_the_bootstrap_shares():
+    draws = np.array([-0.5, 0.0, 0.6, 1.0, 1.5, 2.0, 2.5, 3.0])
+    summary = calibration_summary(np.maximum(ELASTICITY_FLOOR, draws), draws=draws)
+    assert summary['draws_prob_inelastic'] == 0.5 and summary['draws_prob_negative'] == 0.25
+    assert summary['prob_inelastic'] == 0.5
+    assert 'draws_prob_inelastic' not in calibration_summary(draws)
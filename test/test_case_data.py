@@ -0,0 +1,56 @@
+import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+import case_data
+from case_data import DATA_DIR, load_case_data
+
+def _load_baseline(cache_dir):
+    return load_case_data(data_dir=os.path.join(cache_dir, 'data'), cache_dir=cache_dir).baseline(2018)
+
+@pytest.fixture
+def private_data(tmp_path):
+    shutil.copytree(DATA_DIR, tmp_path / 'data')
+    return str(tmp_path)
+
+def test_snapshot_round_trip(private_data):
+    first = _load_baseline(private_data)
+    snapshots = [name for name in os.listdir(private_data) if name.endswith('.json')]
+    assert len(snapshots) == 1
+    assert _load_baseline(private_data) == first
+    assert first['unit_sales'] == 101000 and first['avg_unit_price'] == 260
+
+def test_concurrent_refreshes_leave_a_valid_snapshot(private_data):
+    with ProcessPoolExecutor(max_workers=4) as pool:
+        baselines = list(pool.map(_load_baseline, [private_data] * 16))
+    assert all(b == baselines[0] for b in baselines)
+    assert not [name for name in os.listdir(private_data) if name.endswith('.tmp')]
+    assert _load_baseline(private_data) == baselines[0]
+
+def test_temp_file_is_removed_when_the_write_fails(tmp_path, monkeypatch):
+    def fail(*args, **kwargs):
+        raise RuntimeError('disk full')
+
+    monkeypatch.setattr(case_data.json, 'dump', fail)
+    with pytest.raises(RuntimeError):
+        case_data._write_snapshot(str(tmp_path / 'snapshot.json'), {}, {})
+    assert os.listdir(tmp_path) == []
+
+def test_process_cache_is_keyed_by_cache_dir(private_data, tmp_path_factory):
+    data_dir = os.path.join(private_data, 'data')
+    first = load_case_data(data_dir=data_dir, cache_dir=private_data)
+    other_dir = str(tmp_path_factory.mktemp('other_cache'))
+    second = load_case_data(data_dir=data_dir, cache_dir=other_dir)
+    assert second is not first and second.facts == first.facts
+    assert [name for name in os.listdir(other_dir) if name.endswith('.json')]
+    assert load_case_data(data_dir=data_dir, cache_dir=private_data) is first
+
+def test_snapshot_round_trips_every_fact(private_data):
+    data_dir = os.path.join(private_data, 'data')
+    parsed, notes = case_data.parse_casefacts(os.path.join(data_dir, 'casefacts.csv'))
+    load_case_data(data_dir=data_dir, cache_dir=private_data)
+    case_data._case_data.clear()
+    reloaded = load_case_data(data_dir=data_dir, cache_dir=private_data)
+    assert reloaded.facts == parsed and reloaded.notes == notes
@@ -0,0 +1,95 @@
+import numpy as np
+import pytest
+
+from cash_flows import dcf_simulation, free_cash_flows, investment_schedule, irr, npv, payback_period
+from projection_engine import draw_noise, project_line_items_batch
+
+BASELINE = {'unit_sales': 12112, 'avg_unit_price': 365.66}
+ASSUMPTIONS = {'sales_growth': 0.13, 'unit_sales_growth': 0.10, 'price_growth': 0.03,
+               'COGS_percent': 0.45, 'sales_comm_rate': 0.00, 'G_A_percent': 0.22}
+
+def _conventional_flows(n=200, years=6, seed=0):
+    rng = np.random.default_rng(seed)
+    flows = rng.uniform(50.0, 400.0, (n, years + 1))
+    flows[:, 0] = -rng.uniform(200.0, 1500.0, n)
+    return flows
+
+def test_npv_matches_a_plain_loop():
+    flows = _conventional_flows(5)
+    expected = [sum(cf / 1.08 ** t for t, cf in enumerate(row)) for row in flows]
+    np.testing.assert_allclose(npv(flows, 0.08), expected, rtol=1e-12)
+    rates = np.array([0.0, 0.05, 0.1, 0.2, -0.1])
+    np.testing.assert_allclose(npv(flows, rates), [npv(row, r) for row, r in zip(flows, rates)], rtol=1e-12)
+
+def test_irr_zeroes_the_npv():
+    flows = _conventional_flows()
+    rates = irr(flows)
+    assert np.isfinite(rates).all()
+    np.testing.assert_allclose(npv(flows, rates), 0.0, atol=1e-6)
+
+def test_irr_matches_a_bracketing_root_finder():
+    optimize = pytest.importorskip('scipy.optimize')
+    flows = _conventional_flows(50)
+    expected = [optimize.brentq(lambda r: npv(row, r), -0.99, 100.0, xtol=1e-14) for row in flows]
+    np.testing.assert_allclose(irr(flows), expected, rtol=1e-8)
+
+def test_irr_matches_numpy_financial():
+    npf = pytest.importorskip('numpy_financial')
+    flows = _conventional_flows(50)
+    np.testing.assert_allclose(irr(flows), [npf.irr(row) for row in flows], rtol=1e-8)
+
+def test_irr_is_nan_without_a_sign_change():
+    flows = np.array([[100.0, 50.0, 50.0], [-100.0, -50.0, -50.0], [0.0, 0.0, 0.0], [-100.0, 60.0, 60.0]])
+    rates = irr(flows)
+    assert np.isnan(rates[:3]).all() and np.isfinite(rates[3])
+
+def test_payback_interpolates_within_the_year():
+    flows = np.array([[-100.0, 40.0, 40.0, 40.0], [-100.0, 10.0, 10.0, 10.0], [0.0, 10.0, 10.0, 10.0]])
+    payback = payback_period(flows)
+    assert payback[0] == pytest.approx(2.5)
+    assert np.isnan(payback[1])
+    assert payback[2] == 0.0
+
+def test_free_cash_flows_taxes_and_capex():
+    EBITDA = np.array([[100.0, 200.0, -50.0]])
+    flows = free_cash_flows(EBITDA, investment={0: 300.0, 2: 20.0}, tax_rate=0.25, depreciation=40.0)
+    np.testing.assert_allclose(flows, [[-300.0, 100.0 - 15.0, 200.0 - 40.0 - 20.0, -50.0]])
+
+def test_investment_outside_the_horizon_raises():
+    with pytest.raises(ValueError, match='year 5 .*0..3'):
+        investment_schedule({0: 100.0, 5: 50.0}, 3)
+    with pytest.raises(ValueError, match='year -1'):
+        investment_schedule({-1: 100.0}, 3)
+    with pytest.raises(ValueError, match='horizon'):
+        investment_schedule([1.0] * 5, 3)
+    np.testing.assert_array_equal(investment_schedule({0: 100.0, 3: 50.0}, 3), [100.0, 0.0, 0.0, 50.0])
+
+def test_dcf_simulation():
+    kwargs = dict(years=4, iterations=2000, investment={0: 2.5e6, 1: 2e5}, discount_rate=0.10, tax_rate=0.25,
+                  working_capital_rate=0.1, depreciation=1e5)
+    result = dcf_simulation(BASELINE, ASSUMPTIONS, rng=np.random.default_rng(0), **kwargs)
+    flows = result['cash_flows']
+    assert flows.shape == (2000, 5)
+    np.testing.assert_array_equal(flows[:, 0], -2.5e6)
+
+    # The cash flows are those of the engine's own paths, run through free_cash_flows.
+    params = draw_noise(ASSUMPTIONS, 2000, rng=np.random.default_rng(0))
+    items = project_line_items_batch(BASELINE, params, years=4)
+    expected = free_cash_flows(items['EBITDA'], investment=kwargs['investment'], tax_rate=0.25, depreciation=1e5,
+                               sales=items['Sales'], initial_sales=BASELINE['unit_sales'] * BASELINE['avg_unit_price'],
+                               working_capital_rate=0.1)
+    np.testing.assert_array_equal(flows, expected)
+    np.testing.assert_allclose(result['NPV'], npv(flows, 0.10))
+    np.testing.assert_allclose(npv(flows, result['IRR']), 0.0, atol=1e-4)
+    np.testing.assert_array_equal(result['payback'], payback_period(flows))
+
+    again = dcf_simulation(BASELINE, ASSUMPTIONS, rng=np.random.default_rng(0), **kwargs)
+    np.testing.assert_array_equal(again['NPV'], result['NPV'])
+
+def test_dcf_simulation_with_uncertain_discount_rate():
+    fixed = dcf_simulation(BASELINE, ASSUMPTIONS, iterations=5000, investment=2.5e6, rng=np.random.default_rng(1))
+    spread = dcf_simulation(BASELINE, ASSUMPTIONS, iterations=5000, investment=2.5e6, discount_rate_std=0.03,
+                            rng=np.random.default_rng(1))
+    np.testing.assert_array_equal(spread['cash_flows'], fixed['cash_flows'])
+    np.testing.assert_array_equal(spread['IRR'], fixed['IRR'])
+    assert spread['NPV'].std() > fixed['NPV'].std()
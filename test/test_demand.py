@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+from demand import adjust_baseline, monte_carlo_capped, project_ebitda_capped
+from projection_engine import draw_noise, monte_carlo_ebitda_paths, project_ebitda_batch
+
+BASELINE = {'unit_sales': 12112, 'avg_unit_price': 365.66}
+ASSUMPTIONS = {'sales_growth': 0.13, 'unit_sales_growth': 0.10, 'price_growth': 0.03,
+               'COGS_percent': 0.45, 'sales_comm_rate': 0.00, 'G_A_percent': 0.22}
+
+def _params(n=2000, seed=0):
+    return draw_noise(ASSUMPTIONS, n, rng=np.random.default_rng(seed))
+
+def test_infinite_capacity_is_the_uncapped_engine():
+    params = _params()
+    EBITDA, _ = project_ebitda_capped(BASELINE, params, np.inf, years=10)
+    np.testing.assert_array_equal(EBITDA, project_ebitda_batch(BASELINE, params, years=10))
+
+@pytest.mark.parametrize('mode', ['cap', 'logistic'])
+def test_units_never_exceed_capacity(mode):
+    capacity = 20000.0
+    _, units = project_ebitda_capped(BASELINE, _params(), capacity, years=30, mode=mode)
+    assert units.max() <= capacity * (1 + 1e-12)
+    if mode == 'cap':
+        assert np.isclose(units[:, -1], capacity).all()
+
+def test_capacity_below_baseline_caps_year_one():
+    _, units = project_ebitda_capped(BASELINE, _params(), 5000.0, years=3)
+    assert (units == 5000.0).all()
+
+def test_zero_capture_rate_leaves_the_baseline():
+    plain = monte_carlo_capped(BASELINE, ASSUMPTIONS, np.inf, years=4, iterations=1000,
+                               rng=np.random.default_rng(1))
+    captured = monte_carlo_capped(BASELINE, ASSUMPTIONS, np.inf, years=4, iterations=1000, capture_rate=0.0,
+                                  current_share=0.18, target_share=0.525, rng=np.random.default_rng(1))
+    np.testing.assert_array_equal(plain, captured)
+    np.testing.assert_array_equal(plain, monte_carlo_ebitda_paths(BASELINE, ASSUMPTIONS, years=4, iterations=1000,
+                                                                  rng=np.random.default_rng(1)))
+
+def test_share_capture_scales_the_baseline():
+    EBITDA = monte_carlo_capped(BASELINE, ASSUMPTIONS, np.inf, years=4, iterations=1000, capture_rate=0.3,
+                                current_share=0.18, target_share=0.525, rng=np.random.default_rng(1))
+    plain = monte_carlo_capped(BASELINE, ASSUMPTIONS, np.inf, years=4, iterations=1000,
+                               rng=np.random.default_rng(1))
+    factor = adjust_baseline(1.0, 0.18, 0.525, 0.3)
+    np.testing.assert_allclose(EBITDA, plain * factor, rtol=1e-12)
+
+def test_per_path_capture_rates_stay_in_range():
+    rng = np.random.default_rng(2)
+    EBITDA = monte_carlo_capped(BASELINE, ASSUMPTIONS, np.inf, years=1, iterations=5000, capture_rate=0.3,
+                                capture_std=0.5, current_share=0.18, target_share=0.525, rng=rng)
+    plain = monte_carlo_capped(BASELINE, ASSUMPTIONS, np.inf, years=1, iterations=5000,
+                               rng=np.random.default_rng(2))
+    ratio = EBITDA / plain
+    assert ratio.min() >= 1 - 1e-12 and ratio.max() <= adjust_baseline(1.0, 0.18, 0.525, 1.0) + 1e-12
+    assert np.ptp(ratio) > 0
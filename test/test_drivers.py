@@ -0,0 +1,69 @@
+from math import erf, exp, pi, sqrt
+
+import numpy as np
+import pytest
+
+from drivers import PERCENT_MARGINALS, DriverModel, correlation_matrix
+from projection_engine import DEFAULT_NOISE_SCALES, NOISE_PARAMETERS, noise_from_normals
+
+ASSUMPTIONS = {'sales_growth': 0.13, 'unit_sales_growth': 0.10, 'price_growth': 0.03,
+               'COGS_percent': 0.45, 'sales_comm_rate': 0.00, 'G_A_percent': 0.22}
+
+def _normals(n=400000, seed=0):
+    return np.random.default_rng(seed).standard_normal((n, len(NOISE_PARAMETERS)))
+
+def _truncated_moments(base, scale, low, high):
+    pdf = lambda x: exp(-x * x / 2) / sqrt(2 * pi)
+    cdf = lambda x: 0.5 * (1 + erf(x / sqrt(2)))
+    a, b = (low - base) / scale, (high - base) / scale
+    mass = cdf(b) - cdf(a)
+    shift = (pdf(a) - pdf(b)) / mass
+    variance = 1 + (a * pdf(a) - b * pdf(b)) / mass - shift ** 2
+    return base + scale * shift, scale * sqrt(variance)
+
+def test_default_model_is_the_plain_engine():
+    z = _normals(1000)
+    plain = noise_from_normals(ASSUMPTIONS, z)
+    modelled = DriverModel().noise_from_normals(ASSUMPTIONS, z)
+    for name in NOISE_PARAMETERS:
+        np.testing.assert_array_equal(plain[name], modelled[name])
+
+def test_truncated_draws_stay_inside_the_bounds():
+    scales = dict(DEFAULT_NOISE_SCALES, COGS_percent=0.5, sales_comm_rate=0.5, G_A_percent=0.5)
+    params = DriverModel(marginals=PERCENT_MARGINALS).noise_from_normals(ASSUMPTIONS, _normals(), scales)
+    for name in PERCENT_MARGINALS:
+        assert params[name].min() >= 0.0 and params[name].max() <= 1.0
+
+@pytest.mark.parametrize('name', ['COGS_percent', 'sales_comm_rate', 'G_A_percent'])
+def test_truncated_moments_match_the_truncated_normal(name):
+    scales = dict(DEFAULT_NOISE_SCALES, COGS_percent=0.4, G_A_percent=0.3)
+    params = DriverModel(marginals=PERCENT_MARGINALS).noise_from_normals(ASSUMPTIONS, _normals(), scales)
+    mean, std = _truncated_moments(ASSUMPTIONS[name], scales[name], 0.0, 1.0)
+    standard_error = std / sqrt(params[name].size)
+    assert abs(params[name].mean() - mean) < 5 * standard_error
+    assert params[name].std() == pytest.approx(std, rel=0.01)
+
+def test_truncation_at_the_base_shifts_the_mean():
+    params = DriverModel(marginals=PERCENT_MARGINALS).noise_from_normals(ASSUMPTIONS, _normals())
+    scale = DEFAULT_NOISE_SCALES['sales_comm_rate']
+    assert params['sales_comm_rate'].mean() == pytest.approx(scale * sqrt(2 / pi), rel=0.01)
+
+def test_lognormal_keeps_mean_and_std():
+    model = DriverModel(marginals={'G_A_percent': 'lognormal'})
+    scales = dict(DEFAULT_NOISE_SCALES, G_A_percent=0.1)
+    draws = model.noise_from_normals(ASSUMPTIONS, _normals(), scales)['G_A_percent']
+    assert draws.min() > 0
+    assert draws.mean() == pytest.approx(0.22, rel=0.005)
+    assert draws.std() == pytest.approx(0.1, rel=0.01)
+
+def test_correlation_is_applied():
+    rho = -0.6
+    model = DriverModel(correlation_matrix({('unit_sales_growth', 'price_growth'): rho}))
+    params = model.noise_from_normals(ASSUMPTIONS, _normals())
+    assert np.corrcoef(params['unit_sales_growth'], params['price_growth'])[0, 1] == pytest.approx(rho, abs=0.01)
+
+def test_rejects_bad_models():
+    with pytest.raises(ValueError):
+        DriverModel(correlation_matrix({('unit_sales_growth', 'price_growth'): 1.5}))
+    with pytest.raises(ValueError):
+        DriverModel(marginals={'COGS_percent': 'uniform'})
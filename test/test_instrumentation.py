@@ -0,0 +1,94 @@
+import json
+
+import numpy as np
+
+import instrumentation
+from instrumentation import count, instrument, phase
+
+def _workload():
+    with phase('outer', size=3):
+        count('paths', 100)
+        for _ in range(3):
+            with phase('inner'):
+                count('paths', 10)
+                with phase('leaf'):
+                    pass
+
+def test_no_op_without_an_active_instrument():
+    assert instrumentation.active() is None
+    assert phase('projection') is instrumentation._NULL_PHASE
+    count('paths', 5)
+    _workload()
+
+def test_phases_nest_and_aggregate():
+    with instrument() as inst:
+        _workload()
+    assert instrumentation.active() is None
+    assert inst.counters == {'paths': 130}
+    assert {name: calls for name, (calls, _, _) in inst.totals.items()} == {'outer': 1, 'inner': 3, 'leaf': 3}
+    depths = {event['name']: event['depth'] for event in inst.events}
+    assert depths == {'outer': 0, 'inner': 1, 'leaf': 2}
+    # Events are recorded when a phase closes, so children come before their parent.
+    assert [event['name'] for event in inst.events][-1] == 'outer'
+    outer = inst.totals['outer'][1]
+    assert inst.totals['inner'][1] <= outer and inst.totals['leaf'][1] <= inst.totals['inner'][1]
+    assert inst.events[-1]['args'] == {'size': 3}
+
+    table = inst.report()
+    assert list(table['phase']) == ['outer', 'inner', 'leaf']
+    assert (table['share'] <= 1).all() and table.attrs['paths_per_second'] > 0
+
+def test_nested_instruments_restore_the_outer_one():
+    with instrument() as outer:
+        with phase('before'):
+            pass
+        with instrument() as inner:
+            _workload()
+        assert instrumentation.active() is outer
+        count('paths')
+    assert 'outer' not in outer.totals and outer.counters == {'paths': 1}
+    assert inner.counters == {'paths': 130}
+
+def test_callback_and_event_cap():
+    seen = []
+    with instrument(callback=seen.append, max_events=2) as inst:
+        _workload()
+    assert len(seen) == 7 and len(inst.events) == 2
+    assert sum(calls for calls, _, _ in inst.totals.values()) == 7
+
+def test_allocation_peaks_fold_into_the_parent():
+    with instrument(track_allocations=True) as inst:
+        with phase('outer'):
+            with phase('inner'):
+                block = np.ones(4 * 1024 ** 2 // 8)
+                del block
+    events = {event['name']: event for event in inst.events}
+    assert events['inner']['alloc_peak_bytes'] >= 4 * 1024 ** 2
+    assert events['outer']['alloc_peak_bytes'] >= events['inner']['alloc_peak_bytes']
+    assert abs(events['inner']['alloc_net_bytes']) < 1024 ** 2
+
+def test_chrome_trace_is_valid_and_balanced(tmp_path):
+    with instrument(track_allocations=True) as inst:
+        _workload()
+    path = tmp_path / 'trace.json'
+    inst.export_chrome_trace(str(path))
+    with open(path) as f:
+        trace = json.load(f)
+
+    phases = [event for event in trace['traceEvents'] if event['ph'] == 'X']
+    counters = [event for event in trace['traceEvents'] if event['ph'] == 'C']
+    assert len(phases) == 7 and counters == [dict(counters[0], name='paths', args={'paths': 130})]
+    assert all(event['dur'] >= 0 and 'alloc_peak_bytes' in event['args'] for event in phases)
+
+    # A complete ('X') event is a B/E pair; expanded, every E must close the most recent open B.
+    # At equal timestamps ends come before begins, except for an empty phase closing itself.
+    edges = sorted([(event['ts'], 1, -event['dur'], 'B', event['name']) for event in phases]
+                   + [(event['ts'] + event['dur'], 0 if event['dur'] else 2, event['dur'], 'E', event['name'])
+                      for event in phases])
+    stack = []
+    for _, _, _, kind, name in edges:
+        if kind == 'B':
+            stack.append(name)
+        else:
+            assert stack.pop() == name
+    assert stack == []
@@ -0,0 +1,12 @@
+import pytest
+
+import klamath_projections
+
+def test_baseline_klamath_is_still_importable():
+    from klamath_projections import baseline_klamath
+    assert baseline_klamath == {'unit_sales': 101000, 'avg_unit_price': 260}
+    assert baseline_klamath == klamath_projections.klamath_baseline()
+
+def test_unknown_attributes_still_raise():
+    with pytest.raises(AttributeError, match='no_such_name'):
+        klamath_projections.no_such_name
@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+from parallel_runner import monte_carlo_simulation_parallel, simulate_alternatives, summarize_alternatives
+
+ALTERNATIVES = {
+    'direct': ({'unit_sales': 12112, 'avg_unit_price': 365.66},
+               {'sales_growth': 0.13, 'unit_sales_growth': 0.10, 'price_growth': 0.03,
+                'COGS_percent': 0.45, 'sales_comm_rate': 0.00, 'G_A_percent': 0.22}),
+    'titaluk': ({'unit_sales': 13403, 'avg_unit_price': 400},
+                {'sales_growth': 0.04, 'unit_sales_growth': 0.02, 'price_growth': 0.00,
+                 'COGS_percent': 0.46, 'sales_comm_rate': 0.05, 'G_A_percent': 0.23})
+}
+
+def test_results_do_not_depend_on_the_worker_count():
+    serial = simulate_alternatives(ALTERNATIVES, years=4, iterations=5000, seed=1, workers=1, shard_size=1000)
+    pooled = simulate_alternatives(ALTERNATIVES, years=4, iterations=5000, seed=1, workers=2, shard_size=1000)
+    for name in ALTERNATIVES:
+        np.testing.assert_array_equal(serial[name], pooled[name])
+
+def test_cumulative_shards_are_summed_in_the_worker():
+    paths = simulate_alternatives(ALTERNATIVES, years=4, iterations=3000, seed=2, workers=1, shard_size=1000)
+    totals = simulate_alternatives(ALTERNATIVES, years=4, iterations=3000, seed=2, workers=1, shard_size=1000,
+                                   cumulative=True)
+    for name in ALTERNATIVES:
+        assert totals[name].shape == (3000,)
+        np.testing.assert_allclose(totals[name], paths[name].sum(axis=1), rtol=1e-15)
+    single = monte_carlo_simulation_parallel(*ALTERNATIVES['direct'], years=4, iterations=3000, seed=2,
+                                             workers=1, shard_size=1000)
+    assert single.shape == (3000,)
+
+def test_merged_shard_summaries_match_the_paths():
+    totals = simulate_alternatives(ALTERNATIVES, years=4, iterations=20000, seed=3, workers=1, shard_size=3000,
+                                   cumulative=True)
+    summaries = summarize_alternatives(ALTERNATIVES, years=4, iterations=20000, seed=3, workers=2, shard_size=3000)
+    for name, stats in summaries.items():
+        values = totals[name]
+        assert stats.count == values.size
+        assert stats.mean() == pytest.approx(values.mean(), rel=1e-12)
+        assert stats.std() == pytest.approx(values.std(), rel=1e-9)
+        assert stats.histogram.counts.sum() + stats.histogram.underflow + stats.histogram.overflow == values.size
+        np.testing.assert_allclose(stats.quantile([0.05, 0.5, 0.95]), np.quantile(values, [0.05, 0.5, 0.95]),
+                                   rtol=2e-3)
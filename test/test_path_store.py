@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from monte_carlo_template import (NOISE_SCALES, assumptions_alt1, baseline_alt1, monte_carlo_simulation_by_year,
+                                  monte_carlo_simulation_by_year_streaming)
+from path_store import PathStore, simulate_to_store
+from projection_engine import LINE_ITEMS, draw_noise
+from projection import project_income_statement
+
+def test_mean_by_year_matches_groupby_mean(tmp_path):
+    store = simulate_to_store(str(tmp_path / 'paths.npy'), baseline_alt1, assumptions_alt1, iterations=5000,
+                              years=4, chunk_size=1500, noise_scales=NOISE_SCALES, rng=np.random.default_rng(0))
+    expected = monte_carlo_simulation_by_year_streaming(baseline_alt1, assumptions_alt1, iterations=5000, years=4,
+                                                        chunk_size=1500, rng=np.random.default_rng(0))
+    pd.testing.assert_frame_equal(store.mean_by_year(chunk_size=999), expected, check_dtype=False, rtol=1e-12)
+
+def test_long_table_groupby_matches_the_store(tmp_path):
+    np.random.seed(1)
+    results = monte_carlo_simulation_by_year(baseline_alt1, assumptions_alt1, iterations=3000, years=3)
+    np.random.seed(1)
+    store = simulate_to_store(str(tmp_path / 'paths.npy'), baseline_alt1, assumptions_alt1, iterations=3000,
+                              years=3, chunk_size=3000, noise_scales=NOISE_SCALES)
+    expected = results.groupby('Year').mean().reset_index()[['Year'] + list(LINE_ITEMS)]
+    pd.testing.assert_frame_equal(store.mean_by_year(), expected, check_dtype=False, rtol=1e-12)
+
+def test_long_table_matches_the_scalar_projection():
+    np.random.seed(2)
+    results = monte_carlo_simulation_by_year(baseline_alt1, assumptions_alt1, iterations=20, years=3)
+    np.random.seed(2)
+    noise = draw_noise(assumptions_alt1, 20, noise_scales=NOISE_SCALES)
+    row = results[results['Iteration'] == 7].reset_index(drop=True)
+    scalar = project_income_statement(baseline_alt1, {name: values[7] for name, values in noise.items()}, years=3)
+    pd.testing.assert_frame_equal(row.drop(columns='Iteration'), scalar.to_frame(), rtol=1e-12)
+
+def test_reopen_round_trip(tmp_path):
+    path = str(tmp_path / 'paths.npy')
+    store = simulate_to_store(path, baseline_alt1, assumptions_alt1, iterations=1000, years=3,
+                              noise_scales=NOISE_SCALES, rng=np.random.default_rng(3))
+    reopened = PathStore.open(path)
+    assert (reopened.iterations, reopened.years, reopened.items) == (1000, 3, LINE_ITEMS)
+    assert reopened.base_year == 2018 and reopened.metadata['assumptions'] == assumptions_alt1
+    np.testing.assert_array_equal(reopened.item('EBITDA'), store.item('EBITDA'))
+    pd.testing.assert_frame_equal(reopened.mean_by_year(), store.mean_by_year())
+
+def test_create_refuses_to_overwrite(tmp_path):
+    path = str(tmp_path / 'paths.npy')
+    PathStore.create(path, 10, 2).paths[:] = 1.0
+    with pytest.raises(FileExistsError, match='overwrite=True'):
+        PathStore.create(path, 20, 3)
+    assert PathStore.open(path).iterations == 10
+    replaced = PathStore.create(path, 20, 3, overwrite=True)
+    assert replaced.iterations == 20 and PathStore.open(path).years == 3
@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+
+from calibration import ELASTICITY_FLOOR
+from price_monte_carlo import (cumulative_ebitda_at_prices, draw_market_paths, optimize_price_monte_carlo,
+                               path_optimal_prices, project_ebitda_priced, robust_price)
+
+ASSUMPTIONS = {'sales_growth': 0.13, 'unit_sales_growth': 0.10, 'price_growth': 0.03,
+               'COGS_percent': 0.45, 'sales_comm_rate': 0.00, 'G_A_percent': 0.22}
+MARKET = {'Q0': 8000, 'P0': 450.0, 'elasticity': 2.0, 'elasticity_std': 0.4, 'unit_cost_std': 0.05,
+          'price_bounds': (250.0, 900.0)}
+
+def _params(n=4000, seed=0, market=MARKET):
+    return draw_market_paths(market, ASSUMPTIONS, n, rng=np.random.default_rng(seed))
+
+def test_closed_form_ebitda_matches_the_engine():
+    params = _params(500)
+    prices = np.array([250.0, 400.0, 637.5, 900.0])
+    surface = cumulative_ebitda_at_prices(MARKET, params, prices, years=4)
+    for j, price in enumerate(prices):
+        np.testing.assert_allclose(surface[:, j], project_ebitda_priced(MARKET, params, price, years=4).sum(axis=1),
+                                   rtol=1e-10)
+
+def test_per_path_optimum_dominates_the_grid():
+    params = _params()
+    optimal = path_optimal_prices(MARKET, params)
+    lower, upper = MARKET['price_bounds']
+    assert ((optimal >= lower) & (optimal <= upper)).all()
+    best = cumulative_ebitda_at_prices(MARKET, params, np.linspace(lower, upper, 301)).max(axis=1)
+    at_optimum = project_ebitda_priced(MARKET, params, optimal).sum(axis=1)
+    assert (at_optimum >= best - 1e-9 * np.abs(best)).all()
+
+def test_robust_objective_is_the_mean_ebitda_at_that_price():
+    params = _params()
+    price, objective, grid, scores = robust_price(MARKET, params, tile_elements=10000)
+    assert objective == pytest.approx(project_ebitda_priced(MARKET, params, price).sum(axis=1).mean(), rel=1e-10)
+    assert objective >= scores.max()
+    assert grid[0] <= price <= grid[-1]
+
+def test_cvar_objective_and_price_shift():
+    params = _params(n=4000, market=dict(MARKET, elasticity_std=0.8))
+    neutral, _, _, _ = robust_price(MARKET, params)
+    averse, objective, _, _ = robust_price(MARKET, params, risk_aversion=1.0, alpha=0.05)
+    cumulative = np.sort(project_ebitda_priced(MARKET, params, averse).sum(axis=1))
+    assert objective == pytest.approx(cumulative[:200].mean(), rel=1e-10)
+    assert averse < neutral - 10.0   # guarding the worst paths (the most elastic) pulls the price down
+
+def test_optimize_price_monte_carlo_is_seeded():
+    first = optimize_price_monte_carlo(MARKET, ASSUMPTIONS, iterations=2000, rng=np.random.default_rng(3))
+    second = optimize_price_monte_carlo(MARKET, ASSUMPTIONS, iterations=2000, rng=np.random.default_rng(3))
+    np.testing.assert_array_equal(first['optimal_EBITDA'], second['optimal_EBITDA'])
+    assert first['robust_price'] == second['robust_price']
+    assert first['optimal_EBITDA'].sum(axis=1).mean() >= first['robust_EBITDA'].sum(axis=1).mean()
+
+def test_resampled_elasticities_are_floored():
+    params = draw_market_paths(MARKET, ASSUMPTIONS, 4000, rng=np.random.default_rng(2),
+                               elasticities=[-0.5, 0.05, 0.6, 2.0])
+    assert params['elasticity'].min() == ELASTICITY_FLOOR
+    assert set(np.unique(params['elasticity'])) == {ELASTICITY_FLOOR, 0.6, 2.0}
+
+def test_negative_elasticity_draws_do_not_pin_the_robust_price():
+    # Unfloored, 5% of paths at -2 (demand rising with price) would dominate the mean EBITDA and
+    # push the robust price onto the 900 upper bound.
+    elasticities = np.r_[np.full(5, -2.0), np.full(95, 2.5)]
+    result = optimize_price_monte_carlo(MARKET, ASSUMPTIONS, iterations=4000, rng=np.random.default_rng(3),
+                                        elasticities=elasticities)
+    assert result['params']['elasticity'].min() == ELASTICITY_FLOOR
+    assert result['robust_price'] < 500.0
@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+
+from price_optimizer import constant_elasticity_optimum, golden_section_maximize, optimal_price, optimal_prices_grid
+
+Q0, P0 = 20200, 260
+
+def test_closed_form_matches_golden_section():
+    elasticities = np.array([1.2, 1.5, 2.0, 3.0, 0.8])
+    unit_cost, commission, bounds = 122.2, 0.05, (150.0, 900.0)
+    exact, _ = optimal_price(Q0, P0, elasticities, unit_cost=unit_cost, commission=commission, bounds=bounds)
+
+    def profit(P):
+        return (P * (1 - commission) - unit_cost) * Q0 * (P0 / P) ** elasticities
+
+    searched, _ = optimal_price(Q0, P0, elasticities, bounds=bounds, profit=profit, tol=1e-8)
+    np.testing.assert_allclose(searched, exact, rtol=1e-6)
+    assert exact[-1] == bounds[1]   # inelastic demand: the upper bound wins
+
+def test_golden_section_finds_a_parabola_vertex():
+    vertices = np.array([1.0, 2.5, 7.0])
+    found = golden_section_maximize(lambda x: -(x - vertices) ** 2, 0.0, 10.0, tol=1e-9)
+    np.testing.assert_allclose(found, vertices, atol=1e-7)
+
+def test_markup_formula():
+    price = constant_elasticity_optimum(1.5, unit_cost=100.0, commission=0.2)
+    assert price == pytest.approx(1.5 / 0.5 * 100.0 / 0.8)
+
+def test_inelastic_demand_without_upper_bound_raises():
+    with pytest.raises(ValueError, match='upper price bound'):
+        optimal_price(Q0, P0, 0.9, unit_cost=100.0)
+
+def test_zero_cost_without_lower_bound_raises():
+    with pytest.raises(ValueError, match='unit cost'):
+        optimal_price(Q0, P0, 1.5)
+
+def test_zero_cost_with_bounds_is_the_lower_bound():
+    price, quantity = optimal_price(Q0, P0, 1.5, bounds=(200.0, 600.0))
+    assert price == 200.0 and np.isfinite(quantity)
+
+def test_golden_section_needs_finite_bounds():
+    with pytest.raises(ValueError, match='finite'):
+        optimal_price(Q0, P0, 1.5, profit=lambda P: -P)
+
+@pytest.mark.parametrize('unit_cost, commission', [(0.0, 0.0), (122.2, 0.05), (400.0, 0.0)])
+def test_envelope_and_tiles_match_a_plain_argmax(unit_cost, commission):
+    prices = np.linspace(150.0, 900.0, 301)
+    elasticities = np.random.default_rng(0).normal(1.5, 0.6, 5000)
+    # An elasticity of exactly 1 is left out: with zero cost revenue is flat and every price ties.
+    elasticities = np.concatenate([elasticities, [0.0, 0.5, 10.0]])
+    profit = ((prices * (1 - commission) - unit_cost)
+              * Q0 * (P0 / prices) ** elasticities[:, None])
+    expected = prices[np.argmax(profit, axis=1)]
+
+    for method in ('envelope', 'tiles'):
+        found, quantities = optimal_prices_grid(Q0, P0, prices, elasticities, unit_cost=unit_cost,
+                                                commission=commission, method=method, tile_elements=10000)
+        np.testing.assert_array_equal(found, expected)
+        np.testing.assert_allclose(quantities, Q0 * (P0 / found) ** elasticities)
+
+def test_grid_without_a_profitable_price_picks_the_first_point():
+    prices = np.linspace(100.0, 200.0, 11)
+    for method in ('envelope', 'tiles'):
+        found, _ = optimal_prices_grid(Q0, P0, prices, [1.2, 2.0], unit_cost=500.0, method=method)
+        np.testing.assert_array_equal(found, [100.0, 100.0])
@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+from projection_engine import DEFAULT_NOISE_SCALES, analytic_moments, check_analytic_moments, project_ebitda_batch
+
+BASELINE = {'unit_sales': 12112, 'avg_unit_price': 365.66}
+ASSUMPTIONS = {'sales_growth': 0.13, 'unit_sales_growth': 0.10, 'price_growth': 0.03,
+               'COGS_percent': 0.45, 'sales_comm_rate': 0.00, 'G_A_percent': 0.22}
+WIDE_SCALES = {'sales_growth': 0.01, 'unit_sales_growth': 0.1, 'price_growth': 0.05, 'COGS_percent': 0.05,
+               'sales_comm_rate': 0.02, 'G_A_percent': 0.05}
+
+def test_zero_noise_moments_are_the_deterministic_projection():
+    moments = analytic_moments(BASELINE, ASSUMPTIONS, noise_scales=dict.fromkeys(DEFAULT_NOISE_SCALES, 0.0),
+                               years=5)
+    expected = project_ebitda_batch(BASELINE, ASSUMPTIONS, years=5).sum()
+    assert moments['mean'] == pytest.approx(expected, rel=1e-12)
+    assert moments['std'] == pytest.approx(0.0, abs=1e-6 * expected)
+
+@pytest.mark.parametrize('years', [1, 3, 5])
+@pytest.mark.parametrize('noise_scales', [None, WIDE_SCALES])
+def test_analytic_moments_match_sampled_moments(years, noise_scales):
+    table = check_analytic_moments(BASELINE, ASSUMPTIONS, noise_scales=noise_scales, years=years,
+                                   iterations=400000, seed=0)
+    assert abs(table.loc['mean', 'z']) < 4
+    assert abs(table.loc['std', 'rel_diff']) < 0.01
+    assert abs(table.loc['skew', 'sampled'] - table.loc['skew', 'analytic']) < 0.05
+    assert abs(table.loc['kurtosis', 'sampled'] - table.loc['kurtosis', 'analytic']) < 0.15
+
+@pytest.mark.parametrize('years', [1, 3, 10])
+def test_cornish_fisher_quantiles_at_the_default_noise(years):
+    # Cornish-Fisher is only an expansion; it drifts once the skew nears 1 (e.g. WIDE_SCALES over 5 years).
+    table = check_analytic_moments(BASELINE, ASSUMPTIONS, years=years, iterations=400000, seed=0)
+    for name in ('P5', 'P25', 'P50', 'P75', 'P95'):
+        assert abs(table.loc[name, 'rel_diff']) < 0.005
+
+@pytest.mark.parametrize('noise', [1e-5, 1e-4])
+def test_small_noise_moments_do_not_cancel(noise):
+    small = analytic_moments(BASELINE, ASSUMPTIONS, noise_scales=dict.fromkeys(DEFAULT_NOISE_SCALES, noise), years=4)
+    tenth = analytic_moments(BASELINE, ASSUMPTIONS, noise_scales=dict.fromkeys(DEFAULT_NOISE_SCALES, noise / 10),
+                             years=4)
+    assert abs(small['skew']) < 100 * noise and abs(small['kurtosis']) < 100 * noise
+    # Skewness grows like the noise scale, excess kurtosis like its square.
+    assert small['skew'] / tenth['skew'] == pytest.approx(10, rel=1e-3)
+    assert small['kurtosis'] / tenth['kurtosis'] == pytest.approx(100, rel=1e-2)
+    quantiles = [small[name] for name in ('P5', 'P25', 'P50', 'P75', 'P95')]
+    assert quantiles == sorted(quantiles)
+
+def test_quantiles_stay_sorted_under_heavy_skew():
+    scales = dict(WIDE_SCALES, unit_sales_growth=0.4, price_growth=0.3)
+    moments = analytic_moments(BASELINE, ASSUMPTIONS, noise_scales=scales, years=10,
+                               quantiles=(0.95, 0.01, 0.5, 0.05, 0.99))
+    quantiles = [moments[name] for name in ('P1', 'P5', 'P50', 'P95', 'P99')]
+    assert quantiles == sorted(quantiles)
@@ -0,0 +1,78 @@
+import os
+
+import numpy as np
+import pytest
+
+from result_cache import ResultCache, cache_key, cached_ebitda_paths
+from samplers import antithetic_normals
+
+BASELINE = {'unit_sales': 12112, 'avg_unit_price': 365.66}
+ASSUMPTIONS = {'sales_growth': 0.13, 'unit_sales_growth': 0.10, 'price_growth': 0.03,
+               'COGS_percent': 0.45, 'sales_comm_rate': 0.00, 'G_A_percent': 0.22}
+
+def _entry(kilobytes):
+    return {'values': np.zeros(kilobytes * 128)}   # 1 KB of float64 per 128 values
+
+def test_hit_and_miss(tmp_path):
+    cache = ResultCache(str(tmp_path))
+    assert cache.get('missing') is None
+    cache.put('key', {'EBITDA': np.arange(6.0).reshape(2, 3)})
+    np.testing.assert_array_equal(cache.get('key')['EBITDA'], np.arange(6.0).reshape(2, 3))
+
+def test_cached_run_is_reused(tmp_path):
+    cache = ResultCache(str(tmp_path))
+    first = cached_ebitda_paths(BASELINE, ASSUMPTIONS, iterations=500, seed=4, cache=cache)
+    assert len(os.listdir(tmp_path)) == 1
+    second = cached_ebitda_paths(BASELINE, ASSUMPTIONS, iterations=500, seed=4, cache=cache)
+    np.testing.assert_array_equal(first, second)
+    cached_ebitda_paths(BASELINE, ASSUMPTIONS, iterations=500, seed=5, cache=cache)
+    assert len(os.listdir(tmp_path)) == 2
+
+def test_evicts_least_recently_used_first(tmp_path):
+    cache = ResultCache(str(tmp_path), max_bytes=10 ** 9)
+    for age, key in enumerate(['old', 'middle', 'new']):
+        cache.put(key, _entry(40))
+        os.utime(cache._path(key), (1000 + age, 1000 + age))
+    cache.get('old')   # a hit makes 'old' the most recently used
+    cache.max_bytes = 2 * os.path.getsize(cache._path('new'))
+    cache.evict()
+    assert cache.get('middle') is None
+    assert cache.get('old') is not None and cache.get('new') is not None
+    total = sum(os.path.getsize(tmp_path / name) for name in os.listdir(tmp_path))
+    assert total <= cache.max_bytes
+
+def test_size_limit_after_put(tmp_path):
+    cache = ResultCache(str(tmp_path), max_bytes=100 * 1024)
+    for k in range(5):
+        cache.put(f'entry{k}', _entry(40))
+    total = sum(os.path.getsize(tmp_path / name) for name in os.listdir(tmp_path))
+    assert 0 < total <= cache.max_bytes
+    assert cache.get('entry4') is not None
+
+def test_corrupt_entry_is_a_miss_and_deleted(tmp_path):
+    cache = ResultCache(str(tmp_path))
+    cache.put('key', _entry(4))
+    path = cache._path('key')
+    with open(path, 'r+b') as f:
+        f.truncate(os.path.getsize(path) // 2)
+    assert cache.get('key') is None
+    assert not os.path.exists(path)
+
+def test_key_stability():
+    key = cache_key(baseline={'a': 1, 'b': 2.5}, years=3, seed=np.int64(7))
+    assert key == cache_key(years=3, seed=7, baseline={'b': 2.5, 'a': 1})
+    assert key != cache_key(baseline={'a': 1, 'b': 2.5}, years=4, seed=7)
+    assert cache_key(sampler=antithetic_normals) == cache_key(sampler=antithetic_normals)
+    assert cache_key(sampler=antithetic_normals) != cache_key(sampler='antithetic')
+
+def test_lambdas_do_not_share_a_cache_entry(tmp_path):
+    with pytest.raises(ValueError, match='cache key'):
+        cache_key(sampler=lambda n, k, rng: rng.standard_normal((n, k)))
+
+    cache = ResultCache(str(tmp_path))
+    plain = lambda n, k, rng: rng.standard_normal((n, k))
+    doubled = lambda n, k, rng: 2 * rng.standard_normal((n, k))
+    first = cached_ebitda_paths(BASELINE, ASSUMPTIONS, iterations=500, seed=1, sampler=plain, cache=cache)
+    second = cached_ebitda_paths(BASELINE, ASSUMPTIONS, iterations=500, seed=1, sampler=doubled, cache=cache)
+    assert not np.array_equal(first, second)
+    assert not os.listdir(tmp_path)
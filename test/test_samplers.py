@@ -0,0 +1,45 @@
+from statistics import NormalDist
+
+import numpy as np
+import pytest
+
+from samplers import SAMPLERS, antithetic_normals, get_sampler, latin_hypercube_normals, norm_cdf, norm_ppf
+
+def test_norm_ppf_and_cdf_accuracy():
+    u = np.linspace(1e-10, 1 - 1e-10, 20001)
+    exact = np.array([NormalDist().inv_cdf(p) for p in u])
+    np.testing.assert_allclose(norm_ppf(u), exact, rtol=1.2e-9, atol=1e-12)
+    x = np.linspace(-8.0, 8.0, 20001)
+    np.testing.assert_allclose(norm_cdf(x), [NormalDist().cdf(v) for v in x], rtol=1.2e-7, atol=1e-12)
+
+@pytest.mark.parametrize('name', sorted(SAMPLERS))
+def test_marginals_are_standard_normal(name):
+    if name == 'sobol':
+        pytest.importorskip('scipy')
+    n, k = 2 ** 16, 6
+    z = get_sampler(name)(n, k, np.random.default_rng(0))
+    assert z.shape == (n, k) and np.isfinite(z).all()
+    np.testing.assert_allclose(z.mean(axis=0), 0.0, atol=5 / np.sqrt(n))
+    np.testing.assert_allclose(z.std(axis=0), 1.0, atol=0.02)
+    q = np.array([0.01, 0.1, 0.5, 0.9, 0.99])
+    expected = [NormalDist().inv_cdf(p) for p in q]
+    for column in z.T:
+        np.testing.assert_allclose(np.quantile(column, q), expected, atol=0.05)
+
+def test_antithetic_pairs_mirror():
+    z = antithetic_normals(7, 3, np.random.default_rng(0))
+    np.testing.assert_array_equal(z[4:], -z[:3])
+    assert z.shape == (7, 3)
+
+def test_latin_hypercube_puts_one_point_in_every_stratum():
+    n = 1000
+    u = norm_cdf(latin_hypercube_normals(n, 4, np.random.default_rng(0)))
+    strata = np.floor(u * n).astype(int)
+    for column in strata.T:
+        np.testing.assert_array_equal(np.sort(column), np.arange(n))
+
+def test_get_sampler():
+    assert get_sampler(None) is SAMPLERS['pseudo']
+    assert get_sampler(antithetic_normals) is antithetic_normals
+    with pytest.raises(ValueError, match='Unknown sampler'):
+        get_sampler('halton')
@@ -0,0 +1,25 @@
+import numpy as np
+import pytest
+
+from projection_engine import monte_carlo_ebitda_paths
+from scenario_grid import cartesian_scenarios, run_scenarios, sweep
+
+BASELINE = {'unit_sales': 12112, 'avg_unit_price': 365.66}
+ASSUMPTIONS = {'sales_growth': 0.13, 'unit_sales_growth': 0.10, 'price_growth': 0.03,
+               'COGS_percent': 0.45, 'sales_comm_rate': 0.00, 'G_A_percent': 0.22}
+
+def test_sales_growth_is_rejected():
+    with pytest.raises(ValueError, match='sales_growth'):
+        cartesian_scenarios({'sales_growth': [0.16, 0.21]})
+    with pytest.raises(ValueError, match='Unknown scenario keys'):
+        cartesian_scenarios({'growth': [0.1]})
+
+def test_swept_key_changes_the_result():
+    table = sweep(BASELINE, ASSUMPTIONS, axes={'unit_sales_growth': [0.05, 0.15]}, iterations=2000, workers=1)
+    assert table['mean'].iloc[1] > table['mean'].iloc[0]
+
+def test_scenario_matches_direct_run():
+    table = run_scenarios(BASELINE, ASSUMPTIONS, [{'years': 4}], iterations=5000, seed=7, workers=1)
+    direct = monte_carlo_ebitda_paths(BASELINE, ASSUMPTIONS, years=4, iterations=5000,
+                                      rng=np.random.default_rng(7)).sum(axis=1)
+    assert table['mean'].iloc[0] == pytest.approx(direct.mean(), rel=1e-12)
@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+from projection_engine import project_ebitda_batch
+from sensitivity import sobol_indices, tornado
+
+BASELINE = {'unit_sales': 12112, 'avg_unit_price': 365.66}
+ASSUMPTIONS = {'sales_growth': 0.13, 'unit_sales_growth': 0.10, 'price_growth': 0.03,
+               'COGS_percent': 0.45, 'sales_comm_rate': 0.00, 'G_A_percent': 0.22}
+COSTS = ('COGS_percent', 'sales_comm_rate', 'G_A_percent')
+
+def test_linear_model_indices_are_variance_shares():
+    # With only the cost shares varying, one-year EBITDA is linear in them: S1 = ST = sigma_i^2 / sum sigma^2.
+    scales = {'COGS_percent': 0.03, 'sales_comm_rate': 0.01, 'G_A_percent': 0.02}
+    table = sobol_indices(BASELINE, ASSUMPTIONS, parameters=COSTS, n=200000, years=1, noise_scales=scales,
+                          rng=np.random.default_rng(0)).set_index('parameter')
+    shares = {name: scale ** 2 / sum(s ** 2 for s in scales.values()) for name, scale in scales.items()}
+    for name, share in shares.items():
+        assert table.loc[name, 'S1'] == pytest.approx(share, abs=0.01)
+        assert table.loc[name, 'ST'] == pytest.approx(share, abs=0.01)
+    assert list(table.index) == ['COGS_percent', 'G_A_percent', 'sales_comm_rate']
+
+def test_product_model_indices():
+    # One-year EBITDA = K * X * Y with X = 1 + unit_sales_growth and Y = 1 - COGS - comm - G&A, so
+    # Var = mx^2 sy^2 + my^2 sx^2 + sx^2 sy^2 and the sx^2 sy^2 interaction adds to both totals.
+    sx, sy = 0.3, 0.3
+    mx, my = 1.10, 1 - 0.45 - 0.22
+    variance = mx ** 2 * sy ** 2 + my ** 2 * sx ** 2 + sx ** 2 * sy ** 2
+    expected = {'unit_sales_growth': (my ** 2 * sx ** 2 / variance, (my ** 2 + sy ** 2) * sx ** 2 / variance),
+                'COGS_percent': (mx ** 2 * sy ** 2 / variance, (mx ** 2 + sx ** 2) * sy ** 2 / variance)}
+    table = sobol_indices(BASELINE, ASSUMPTIONS, parameters=tuple(expected), n=400000, years=1,
+                          noise_scales={'unit_sales_growth': sx, 'COGS_percent': sy},
+                          rng=np.random.default_rng(1)).set_index('parameter')
+    for name, (first_order, total) in expected.items():
+        assert table.loc[name, 'S1'] == pytest.approx(first_order, abs=0.02)
+        assert table.loc[name, 'ST'] == pytest.approx(total, abs=0.02)
+    assert table['S1'].sum() < 1 < table['ST'].sum()
+
+def test_tornado_ranks_by_known_ranges():
+    swings = {'COGS_percent': 0.01, 'sales_comm_rate': 0.03, 'G_A_percent': 0.02}
+    table = tornado(BASELINE, ASSUMPTIONS, parameters=COSTS, swings=swings, years=1)
+    assert list(table['parameter']) == ['sales_comm_rate', 'G_A_percent', 'COGS_percent']
+
+    sales = BASELINE['unit_sales'] * BASELINE['avg_unit_price'] * 1.10 * 1.03
+    np.testing.assert_allclose(table['range'], [2 * 0.03 * sales, 2 * 0.02 * sales, 2 * 0.01 * sales], rtol=1e-12)
+    assert (table['low_EBITDA'] > table['high_EBITDA']).all()   # a lower cost share means more EBITDA
+    assert table['base_EBITDA'].iloc[0] == pytest.approx(project_ebitda_batch(BASELINE, ASSUMPTIONS, years=1).sum())
+
+def test_tornado_default_swings_are_two_noise_deviations():
+    table = tornado(BASELINE, ASSUMPTIONS, years=3).set_index('parameter')
+    assert table.loc['COGS_percent', 'high_value'] == pytest.approx(0.45 + 0.02)
+    assert table.loc['sales_comm_rate', 'low_value'] == pytest.approx(0.0 - 0.01)
+    assert table['range'].is_monotonic_decreasing
@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+
+pa = pytest.importorskip('pyarrow')
+
+from projection_engine import LINE_ITEMS, draw_noise, project_line_items_batch
+from simulation_export import SimulationExporter, export_simulation, read_metadata
+
+BASELINE = {'unit_sales': 12112, 'avg_unit_price': 365.66}
+ASSUMPTIONS = {'sales_growth': 0.13, 'unit_sales_growth': 0.10, 'price_growth': 0.03,
+               'COGS_percent': 0.45, 'sales_comm_rate': 0.00, 'G_A_percent': 0.22}
+ALTERNATIVES = {'Alt A': (BASELINE, ASSUMPTIONS), 'Alt B': (dict(BASELINE, unit_sales=9000), ASSUMPTIONS)}
+
+def _read(path, file_format):
+    if file_format == 'parquet':
+        import pyarrow.parquet as pq
+        return pq.read_table(path)
+    with pa.memory_map(path) as source:
+        return pa.ipc.open_file(source).read_all()
+
+@pytest.mark.parametrize('file_format, suffix', [('parquet', '.parquet'), ('arrow', '.arrow')])
+@pytest.mark.parametrize('float32', [True, False])
+def test_round_trip(tmp_path, file_format, suffix, float32):
+    path = str(tmp_path / ('paths' + suffix))
+    run_id = export_simulation(path, ALTERNATIVES, years=3, iterations=2500, chunk_size=1000, seed=5,
+                               file_format=file_format, float32=float32)
+    table = _read(path, file_format)
+
+    assert table.column_names == ['run_id', 'alternative', 'iteration', 'year'] + list(LINE_ITEMS)
+    assert table.num_rows == 2 * 2500 * 3
+    assert table.schema.field('iteration').type == pa.int32()
+    assert table.schema.field('year').type == pa.int16()
+    assert pa.types.is_dictionary(table.schema.field('alternative').type)
+    value_type = pa.float32() if float32 else pa.float64()
+    assert all(table.schema.field(name).type == value_type for name in LINE_ITEMS)
+
+    frame = table.to_pandas()
+    assert set(frame['run_id']) == {run_id}
+    assert frame.groupby('alternative', observed=True).size().to_dict() == {'Alt A': 7500, 'Alt B': 7500}
+    first = frame[frame['alternative'] == 'Alt A']
+    np.testing.assert_array_equal(first['iteration'], np.repeat(np.arange(2500), 3))
+    np.testing.assert_array_equal(first['year'], np.tile([2019, 2020, 2021], 2500))
+
+    # Same seed, same draw order: the first alternative's first chunk is reproducible.
+    params = draw_noise(ASSUMPTIONS, 1000, rng=np.random.default_rng(5))
+    EBITDA = project_line_items_batch(BASELINE, params, years=3)['EBITDA'].ravel()
+    np.testing.assert_allclose(first['EBITDA'].to_numpy()[:3000], EBITDA, rtol=1e-6 if float32 else 0)
+
+    metadata = read_metadata(path)
+    assert metadata['run_id'] == run_id and metadata['seed'] == 5 and metadata['iterations'] == 2500
+    assert metadata['alternatives']['Alt A']['assumptions'] == ASSUMPTIONS
+
+def test_unknown_format(tmp_path):
+    with pytest.raises(ValueError, match='Unknown file format'):
+        SimulationExporter(str(tmp_path / 'paths.csv'), ['Alt A'], file_format='csv')
@@ -0,0 +1,36 @@
+import numpy as np
+import pytest
+
+from projection_engine import NOISE_PARAMETERS, monte_carlo_ebitda_paths
+from stochastic_paths import autocorrelate, draw_yearly_normals, monte_carlo_yearly_shocks
+
+BASELINE = {'unit_sales': 12112, 'avg_unit_price': 365.66}
+ASSUMPTIONS = {'sales_growth': 0.13, 'unit_sales_growth': 0.10, 'price_growth': 0.03,
+               'COGS_percent': 0.45, 'sales_comm_rate': 0.00, 'G_A_percent': 0.22}
+
+@pytest.mark.parametrize('phi', [1.2, -1.0, float('nan')])
+def test_persistence_outside_the_unit_interval_is_rejected(phi):
+    with pytest.raises(ValueError, match='Persistence'):
+        monte_carlo_yearly_shocks(BASELINE, ASSUMPTIONS, years=3, iterations=10,
+                                  persistence={'COGS_percent': phi}, rng=np.random.default_rng(0))
+
+def test_unknown_persistence_key_is_rejected():
+    with pytest.raises(ValueError, match='Unknown persistence'):
+        autocorrelate(np.zeros((1, 2, len(NOISE_PARAMETERS))), {'growth': 0.5})
+
+def test_full_persistence_matches_the_constant_draw_engine_for_the_same_seed():
+    persistence = {name: 1.0 for name in NOISE_PARAMETERS}
+    yearly = monte_carlo_yearly_shocks(BASELINE, ASSUMPTIONS, years=5, iterations=1000, persistence=persistence,
+                                       rng=np.random.default_rng(3))
+    constant = monte_carlo_ebitda_paths(BASELINE, ASSUMPTIONS, years=5, iterations=1000,
+                                        rng=np.random.default_rng(3))
+    np.testing.assert_array_equal(yearly, constant)
+
+@pytest.mark.parametrize('phi', [0.0, 0.6, -0.5, 0.95])
+def test_ar1_keeps_a_unit_marginal_variance(phi):
+    z = draw_yearly_normals(200000, 8, rng=np.random.default_rng(4))
+    u = autocorrelate(z, {'COGS_percent': phi})
+    k = NOISE_PARAMETERS.index('COGS_percent')
+    np.testing.assert_allclose(u[:, :, k].var(axis=0), 1.0, atol=0.015)
+    lag1 = np.mean(u[:, 1:, k] * u[:, :-1, k])
+    assert lag1 == pytest.approx(phi, abs=0.01)
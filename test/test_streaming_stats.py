@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+
+from streaming_stats import FixedHistogram, RunningMoments, StreamingSummary, TDigest
+
+QUANTILES = np.array([0.001, 0.01, 0.05, 0.25, 0.5, 0.75, 0.95, 0.99, 0.999])
+
+def _values(n=200000, seed=0):
+    return np.random.default_rng(seed).lognormal(0.0, 1.0, n)
+
+@pytest.mark.parametrize('compression', [100, 1000])
+def test_tdigest_rank_error_within_half_a_centroid(compression):
+    values = _values()
+    digest = TDigest(compression)
+    for chunk in np.array_split(values, 37):
+        digest.update(chunk)
+    ranks = np.searchsorted(np.sort(values), digest.quantile(QUANTILES)) / values.size
+    # An arcsine-scale centroid at q spans at most 2 * pi * sqrt(q * (1 - q)) / compression of the mass.
+    bound = np.pi * np.sqrt(QUANTILES * (1 - QUANTILES)) / compression + 1 / values.size
+    assert (np.abs(ranks - QUANTILES) <= bound).all()
+    assert digest.weights.size <= compression
+    assert digest.min == values.min() and digest.max == values.max()
+
+def test_running_moments_match_numpy_elementwise():
+    values = np.random.default_rng(1).normal(5.0, 2.0, (10000, 3))
+    moments = RunningMoments()
+    for chunk in np.array_split(values, 7):
+        moments.update(chunk)
+    np.testing.assert_allclose(moments.mean, values.mean(axis=0), rtol=1e-12)
+    np.testing.assert_allclose(moments.std(), values.std(axis=0), rtol=1e-10)
+    np.testing.assert_allclose(moments.std(ddof=1), values.std(axis=0, ddof=1), rtol=1e-10)
+
+def test_histogram_counts_match_numpy():
+    values = _values(50000)
+    histogram = FixedHistogram(bins=50, hist_range=(0.0, 10.0))
+    for chunk in np.array_split(values, 5):
+        histogram.update(chunk)
+    np.testing.assert_array_equal(histogram.counts, np.histogram(values, bins=50, range=(0.0, 10.0))[0])
+    assert histogram.overflow == (values > 10.0).sum() and histogram.underflow == 0
+
+def test_merged_summaries_match_one_pass():
+    values = _values()
+    whole = StreamingSummary(bins=100, hist_range=(0.0, 20.0))
+    whole.update(values)
+    merged = StreamingSummary(bins=100, hist_range=(0.0, 20.0))
+    for chunk in np.array_split(values, 4):
+        shard = StreamingSummary(bins=100, hist_range=(0.0, 20.0))
+        shard.update(chunk)
+        merged.merge(shard)
+    assert merged.count == values.size
+    assert merged.mean() == pytest.approx(values.mean(), rel=1e-12)
+    assert merged.std() == pytest.approx(values.std(), rel=1e-10)
+    np.testing.assert_array_equal(merged.histogram.counts, whole.histogram.counts)
+    np.testing.assert_allclose(merged.quantile(QUANTILES), np.quantile(values, QUANTILES), rtol=0.02)
+
+def test_histograms_with_different_edges_do_not_merge():
+    first, second = FixedHistogram(10, (0.0, 1.0)), FixedHistogram(10, (0.0, 2.0))
+    first.update([0.5])
+    second.update([0.5])
+    with pytest.raises(ValueError):
+        first.merge(second)